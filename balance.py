@@ -0,0 +1,324 @@
+"""Batch balance runs: thousands of headless games per parameter set.
+
+Each parameter set overrides ``Simulation`` class attributes (difficulty
+speeds, fire periods, the level speed formula, ...) and picks a difficulty
+and a player policy. Games run in a process pool, one worker per core. A
+task is a chunk of seeds for one set, and each worker sends back only
+compact totals, so throughput scales with the number of cores. Results
+are win rate, time to clear and death causes (``Simulation.end_reason``)
+per set, printed as a table and optionally written as CSV or JSON.
+
+Usage:
+  python balance.py                                   # Easy/Normal/Hard, random player
+  python balance.py --games 5000 --policy sweep --policy tracker
+  python balance.py --vary LEVEL_SPEED_STEP=24,36,48 --vary difficulty=Normal,Hard
+  python balance.py --params sets.json --csv balance.csv --json balance.json
+
+``--params`` takes a JSON list of objects such as
+``{"name": "fast boss", "difficulty": "Hard", "BOSS_FIRE_PERIOD": 0.3}``.
+Dict attributes merge into the default, e.g. ``{"DIFFICULTY_SPEED": {"Hard": 1.5}}``.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from profiler import percentile
+from sim import IN_FIRE, IN_LEFT, IN_RIGHT, Simulation
+
+DIFFICULTIES = tuple(Simulation.DIFFICULTY_SPEED)
+# Keys of a parameter set that aren't Simulation attributes
+SET_KEYS = ("name", "difficulty", "policy")
+
+
+# ---------------------- Player policies ----------------------
+def random_policy(sim: Simulation, rng: random.Random) -> int:
+    bits = IN_FIRE if rng.random() < 0.8 else 0
+    r = rng.random()
+    if r < 0.35:
+        bits |= IN_LEFT
+    elif r < 0.7:
+        bits |= IN_RIGHT
+    return bits
+
+
+def sweep_policy(sim: Simulation, rng: random.Random) -> int:
+    # Hold fire while sweeping across the screen
+    return IN_FIRE | (IN_LEFT if (sim.tick // 90) % 2 else IN_RIGHT)
+
+
+def tracker_policy(sim: Simulation, rng: random.Random) -> int:
+    # Hold fire and move under the nearest firing column, or the nearest
+    # boss, stepping aside from enemy bullets about to land
+    player = sim.player
+    pool = sim.enemy_bullets
+    for eb in pool:
+        x = pool.xs[eb]
+        if abs(x - player.x) < 24 and pool.ys[eb] - player.y < 160:
+            return IN_FIRE | (IN_LEFT if x >= player.x else IN_RIGHT)
+    if sim.bosses:
+        target = min((b.x for b in sim.bosses), key=lambda x: abs(x - player.x))
+    else:
+        fleet = sim.fleet
+        columns = fleet.firing_columns()
+        if not columns:
+            return IN_FIRE
+        target = min((fleet.bottom_enemy(c).x for c in columns), key=lambda x: abs(x - player.x))
+    if target < player.x - 8:
+        return IN_FIRE | IN_LEFT
+    if target > player.x + 8:
+        return IN_FIRE | IN_RIGHT
+    return IN_FIRE
+
+
+POLICIES: Dict[str, Callable[[Simulation, random.Random], int]] = {
+    "random": random_policy,
+    "sweep": sweep_policy,
+    "tracker": tracker_policy,
+}
+
+
+# ---------------------- Parameter sets ----------------------
+def set_name(params: Dict) -> str:
+    if "name" in params:
+        return params["name"]
+    return " ".join(f"{k}={v}" for k, v in params.items())
+
+
+def simulation_class(params: Dict) -> type:
+    """Simulation subclass with a parameter set's attribute overrides."""
+    overrides = {}
+    for key, value in params.items():
+        if key in SET_KEYS:
+            continue
+        if not hasattr(Simulation, key):
+            raise ValueError(f"Simulation has no attribute {key!r}")
+        default = getattr(Simulation, key)
+        if isinstance(default, dict) and isinstance(value, dict):
+            value = {**default, **value}
+        overrides[key] = value
+    if not overrides:
+        return Simulation
+    return type("BalanceSimulation", (Simulation,), overrides)
+
+
+def validate(params: Dict):
+    simulation_class(params)
+    if params.get("difficulty", "Normal") not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty {params['difficulty']!r}")
+    if params.get("policy", "random") not in POLICIES:
+        raise ValueError(f"Unknown policy {params['policy']!r}")
+
+
+def _value(text: str):
+    # Numbers and JSON literals as such, anything else as a string
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def grid(vary: List[str], policies: List[str]) -> List[Dict]:
+    # Cartesian product of NAME=v1,v2,... options
+    axes = []
+    for option in vary:
+        key, sep, values = option.partition("=")
+        if not sep or not values:
+            raise ValueError(f"expected NAME=v1,v2,..., got {option!r}")
+        axes.append([(key, _value(v)) for v in values.split(",")])
+    if not any(axis[0][0] == "difficulty" for axis in axes):
+        axes.insert(0, [("difficulty", d) for d in DIFFICULTIES])
+    axes.append([("policy", p) for p in policies])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+# ---------------------- Games ----------------------
+def play_game(sim_class: type, difficulty: str, policy: Callable, seed: int, max_ticks: int) -> Dict:
+    """Play one headless game from the menu to victory, game over or ``max_ticks``."""
+    sim = sim_class(seed=seed)
+    rng = random.Random(seed ^ 0x5EED)
+    sim.start_game(difficulty)
+    while sim.state in ("playing", "boss") and sim.tick < max_ticks:
+        sim.apply_input(policy(sim, rng))
+        sim.step()
+    if sim.state == "victory":
+        outcome = "victory"
+    elif sim.state == "gameover":
+        outcome = sim.end_reason
+    else:
+        outcome = "timeout"
+    stage = "boss" if sim.bosses else f"level {sim.level}"
+    return {"outcome": outcome, "time": sim.time, "ticks": sim.tick, "stage": stage}
+
+
+# One Simulation subclass per parameter set and worker process
+_CLASSES: Dict[str, type] = {}
+
+
+def run_chunk(params: Dict, seeds: range, max_ticks: int) -> Dict:
+    # Worker task: play one game per seed and total them up
+    key = json.dumps(params, sort_keys=True)
+    sim_class = _CLASSES.get(key)
+    if sim_class is None:
+        sim_class = _CLASSES[key] = simulation_class(params)
+    policy = POLICIES[params.get("policy", "random")]
+    difficulty = params.get("difficulty", "Normal")
+    outcomes: Counter = Counter()
+    stages: Counter = Counter()
+    clear_times: List[float] = []
+    ticks = 0
+    for seed in seeds:
+        game = play_game(sim_class, difficulty, policy, seed, max_ticks)
+        outcomes[game["outcome"]] += 1
+        ticks += game["ticks"]
+        if game["outcome"] == "victory":
+            clear_times.append(game["time"])
+        else:
+            stages[game["stage"]] += 1
+    return {"outcomes": outcomes, "stages": stages, "clear_times": clear_times, "ticks": ticks}
+
+
+def summarize(params: Dict, chunks: List[Dict]) -> Dict:
+    outcomes: Counter = Counter()
+    stages: Counter = Counter()
+    clear_times: List[float] = []
+    ticks = 0
+    for chunk in chunks:
+        outcomes.update(chunk["outcomes"])
+        stages.update(chunk["stages"])
+        clear_times.extend(chunk["clear_times"])
+        ticks += chunk["ticks"]
+    games = sum(outcomes.values())
+    wins = outcomes.pop("victory", 0)
+    clear_times.sort()
+    return {
+        "name": set_name(params),
+        "params": params,
+        "games": games,
+        "wins": wins,
+        "win_rate": wins / games if games else 0.0,
+        "clear_time_s": {
+            "mean": sum(clear_times) / len(clear_times),
+            "p50": percentile(clear_times, 50),
+            "p95": percentile(clear_times, 95),
+        } if clear_times else None,
+        "deaths": dict(outcomes.most_common()),
+        "died_at": dict(stages.most_common()),
+        "ticks": ticks,
+    }
+
+
+def run_batch(param_sets: List[Dict], games: int, seed: int = 1, workers: Optional[int] = None,
+              max_ticks: int = 36000, chunk: Optional[int] = None) -> Dict:
+    """Play ``games`` games per parameter set across a process pool.
+
+    Every set plays the same seeds (``seed`` .. ``seed + games - 1``), so
+    differences between sets come from the parameters, not the draw.
+    """
+    for params in param_sets:
+        validate(params)
+    workers = workers or os.cpu_count() or 1
+    # A few chunks per worker keeps every core busy to the end
+    chunk = chunk or max(1, min(100, games // (workers * 4) or 1))
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            [pool.submit(run_chunk, params, range(start, min(start + chunk, seed + games)), max_ticks)
+             for start in range(seed, seed + games, chunk)]
+            for params in param_sets
+        ]
+        results = [summarize(params, [f.result() for f in fs]) for params, fs in zip(param_sets, futures)]
+    elapsed = time.perf_counter() - started
+    total_games = games * len(param_sets)
+    total_ticks = sum(r["ticks"] for r in results)
+    return {
+        "meta": {
+            "games_per_set": games, "seed": seed, "max_ticks": max_ticks,
+            "workers": workers, "chunk": chunk, "elapsed_s": elapsed,
+            "games_per_s": total_games / elapsed if elapsed else 0.0,
+            "ticks_per_s": total_ticks / elapsed if elapsed else 0.0,
+        },
+        "results": results,
+    }
+
+
+# ---------------------- Reporting ----------------------
+def print_report(report: Dict):
+    results = report["results"]
+    width = max([len(r["name"]) for r in results] + [10])
+    print(f"{'set':<{width}} {'games':>6} {'win %':>6} {'clear p50':>9} {'clear p95':>9}  top death")
+    for r in results:
+        clear = r["clear_time_s"]
+        p50, p95 = (f"{clear['p50']:8.1f}s", f"{clear['p95']:8.1f}s") if clear else ("-", "-")
+        death = next(iter(r["deaths"].items()), None)
+        death = f"{death[0]} ({death[1] / r['games']:.0%})" if death else "-"
+        print(f"{r['name']:<{width}} {r['games']:>6} {r['win_rate'] * 100:6.1f} {p50:>9} {p95:>9}  {death}")
+    meta = report["meta"]
+    print(f"\n{sum(r['games'] for r in results)} games in {meta['elapsed_s']:.1f} s on {meta['workers']} workers: "
+          f"{meta['games_per_s']:.0f} games/s, {meta['ticks_per_s']:.0f} ticks/s")
+
+
+def write_csv(path: str, report: Dict):
+    results = report["results"]
+    param_keys = sorted({k for r in results for k in r["params"]})
+    causes = sorted({c for r in results for c in r["deaths"]})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["set"] + param_keys + ["games", "wins", "win_rate", "clear_mean_s", "clear_p50_s",
+                                               "clear_p95_s"] + [f"death: {c}" for c in causes])
+        for r in results:
+            clear = r["clear_time_s"] or {}
+            writer.writerow(
+                [r["name"]]
+                + [json.dumps(r["params"][k]) if isinstance(r["params"].get(k), dict) else r["params"].get(k, "")
+                   for k in param_keys]
+                + [r["games"], r["wins"], round(r["win_rate"], 4)]
+                + [round(clear[k], 3) if k in clear else "" for k in ("mean", "p50", "p95")]
+                + [r["deaths"].get(c, 0) for c in causes]
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Batch headless games for difficulty balancing")
+    parser.add_argument("--games", type=int, default=1000, help="games per parameter set (default 1000)")
+    parser.add_argument("--policy", action="append", choices=sorted(POLICIES),
+                        help="player policy (repeatable; default: random)")
+    parser.add_argument("--vary", action="append", default=[], metavar="NAME=V1,V2",
+                        help="Simulation attribute or 'difficulty' to sweep (repeatable; sets are the product)")
+    parser.add_argument("--params", metavar="PATH", help="JSON list of parameter sets (replaces --vary)")
+    parser.add_argument("--seed", type=int, default=1, help="first game seed; every set plays the same seeds")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--max-ticks", type=int, default=36000,
+                        help="ticks before a game counts as a timeout (default 36000 = 10 min)")
+    parser.add_argument("--csv", metavar="PATH", help="write one row per parameter set as CSV")
+    parser.add_argument("--json", metavar="PATH", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.params:
+            with open(args.params) as f:
+                param_sets = json.load(f)
+        else:
+            param_sets = grid(args.vary, args.policy or ["random"])
+        report = run_batch(param_sets, args.games, args.seed, args.workers, args.max_ticks)
+    except (OSError, ValueError, TypeError) as exc:
+        parser.error(str(exc))
+    print_report(report)
+
+    if args.csv:
+        write_csv(args.csv, report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
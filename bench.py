@@ -0,0 +1,610 @@
+"""Scenario benchmarks for simulation and render cost per tick.
+
+Each scenario drives the game with a scripted input policy for a fixed
+number of ticks and reports per-tick timings (p50/p95/p99/mean), memory
+(tracemalloc peak, max RSS) and, when rendering, turtle/canvas item counts.
+Every (engine, scenario, mode) run happens in a fresh subprocess so runs
+don't share a Tk screen or allocator state.
+
+Usage:
+  python bench.py                            # all scenarios, simulation only
+  python bench.py --render                   # also render-included (needs a display)
+  python bench.py --engine legacy --render   # original space_invaders.SpaceInvaders
+  python bench.py --engine game --engine canvas --render  # turtle vs canvas renderer
+  python bench.py --json results.json        # machine-readable output
+  python bench.py --baseline results.json    # compare; exit 1 on regression
+  python bench.py --max-fleet [--render]     # largest stress fleet that holds 60 FPS
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from endless import StressSimulation
+from profiler import StartupReport, percentile
+from sim import CMD_NORMAL, CMD_RESTART, CMD_SHIFT, IN_FIRE, IN_LEFT, IN_RIGHT, Simulation
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+# ---------------------- Scenario simulations ----------------------
+class StormSimulation(Simulation):
+    # Room for a screen full of player bullets
+    MAX_PLAYER_BULLETS = 128
+
+
+class BossRushSimulation(Simulation):
+    # Room for bosses firing every tick
+    MAX_ENEMY_BULLETS = 256
+
+
+class Scenario:
+    """A scripted benchmark: how to set a simulation up and drive it.
+
+    ``setup(sim)`` puts a fresh or finished simulation into the measured
+    state; it is called again whenever the game leaves ``keep_state``
+    (the player died or cleared the stage), and each call counts as a
+    restart. ``policy(sim, tick, rng)`` returns the input byte per tick.
+    """
+
+    def __init__(self, name: str, description: str, setup: Callable[[Simulation], None],
+                 policy: Callable[[Simulation, int, random.Random], int],
+                 ticks: int = 1200, keep_state: Optional[str] = None,
+                 sim_class: type = Simulation, legacy: bool = True):
+        self.name = name
+        self.description = description
+        self.setup = setup
+        self.policy = policy
+        self.ticks = ticks
+        self.keep_state = keep_state
+        self.sim_class = sim_class
+        self.legacy = legacy  # whether space_invaders.py can run it
+
+
+def _start(sim: Simulation, difficulty: str = "Normal"):
+    if sim.state != "menu":
+        sim.cleanup_all()
+        sim.state = "menu"
+    sim.start_game(difficulty)
+
+
+def _setup_level(level: int) -> Callable[[Simulation], None]:
+    def setup(sim: Simulation):
+        _start(sim)
+        sim.level = level
+        sim.spawn_level_enemies(level)
+    return setup
+
+
+def _idle(sim: Simulation, tick: int, rng: random.Random) -> int:
+    return 0
+
+
+def _setup_storm(sim: Simulation):
+    _setup_level(max(sim.LEVEL_CONFIG))(sim)
+    sim.player.fire_cooldown = 0.0
+
+
+def _sweep_fire(sim: Simulation, tick: int, rng: random.Random) -> int:
+    # Hold fire while sweeping across the screen
+    return IN_FIRE | (IN_LEFT if (tick // 90) % 2 else IN_RIGHT)
+
+
+def _setup_boss_rush(sim: Simulation):
+    _start(sim, "Hard")
+    sim.state = "boss"
+    sim.spawn_boss()
+    sim.boss_fire_period = sim.DT  # both bosses fire every tick
+
+
+def _hold_fire(sim: Simulation, tick: int, rng: random.Random) -> int:
+    return IN_FIRE
+
+
+def max_level(sim: Simulation) -> int:
+    # First generated level at the preset's full MAX_ROWS x MAX_COLS fleet
+    level = 1
+    while sim.level_layout(level)[:2] != (sim.MAX_ROWS, sim.MAX_COLS):
+        level += 1
+    return level
+
+
+def _setup_stress_level(level: Optional[int] = None) -> Callable[[Simulation], None]:
+    def setup(sim: Simulation):
+        _start(sim)
+        sim.level = level or max_level(sim)
+        sim.spawn_level_enemies(sim.level)
+    return setup
+
+
+def _setup_session(sim: Simulation):
+    pass
+
+
+def _random_player(sim: Simulation, tick: int, rng: random.Random) -> int:
+    # Random play that starts a game from the menu and restarts when it ends
+    if sim.state == "menu":
+        return CMD_NORMAL << CMD_SHIFT
+    if sim.state in ("gameover", "victory"):
+        return CMD_RESTART << CMD_SHIFT
+    bits = IN_FIRE if rng.random() < 0.8 else 0
+    r = rng.random()
+    if r < 0.35:
+        bits |= IN_LEFT
+    elif r < 0.7:
+        bits |= IN_RIGHT
+    return bits
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+for _level in sorted(Simulation.LEVEL_CONFIG):
+    _cfg = Simulation.LEVEL_CONFIG[_level]
+    SCENARIOS[f"level_{_level}"] = Scenario(
+        f"level_{_level}", f"level {_level} full {_cfg['rows']}x{_cfg['cols']} fleet, no firing",
+        _setup_level(_level), _idle, keep_state="playing",
+    )
+SCENARIOS["bullet_storm"] = Scenario(
+    "bullet_storm", "max fleet, held fire with no cooldown",
+    _setup_storm, _sweep_fire, keep_state="playing", sim_class=StormSimulation,
+)
+SCENARIOS["boss_rush"] = Scenario(
+    "boss_rush", "dual-boss phase, bosses firing every tick",
+    _setup_boss_rush, _hold_fire, keep_state="boss", sim_class=BossRushSimulation,
+)
+SCENARIOS["stress_max"] = Scenario(
+    "stress_max", f"stress preset at its full {StressSimulation.MAX_ROWS}x{StressSimulation.MAX_COLS} fleet, "
+    "sweeping fire", _setup_stress_level(), _sweep_fire, ticks=600, keep_state="playing",
+    sim_class=StressSimulation, legacy=False,
+)
+SCENARIOS["multi_restart"] = Scenario(
+    "multi_restart", "long random-play session with restarts",
+    _setup_session, _random_player, ticks=12000,
+)
+
+
+# ---------------------- Measurement ----------------------
+def summarize(samples: List[float]) -> Dict[str, float]:
+    values = sorted(samples)
+    if not values:
+        return {}
+    return {
+        "p50": percentile(values, 50) * 1000,
+        "p95": percentile(values, 95) * 1000,
+        "p99": percentile(values, 99) * 1000,
+        "mean": sum(values) / len(values) * 1000,
+    }
+
+
+def _maxrss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class GameDriver:
+    """Runs a scenario against the current Simulation (optionally rendered)."""
+
+    RENDERER = "turtle"
+
+    def __init__(self, scenario: Scenario, seed: int, render: bool):
+        self.scenario = scenario
+        self.render = render
+        self.game = None
+        self.startup = None
+        if render:
+            # Imported lazily: simulation-only runs never load turtle/tkinter
+            from game import Game
+
+            class BenchGame(Game):
+                SIMULATION_CLASS = scenario.sim_class
+                QUALITY = "high"  # measure full-quality frames
+
+                def schedule_next_frame(self):
+                    pass  # the benchmark drives frames itself
+
+            self.startup = StartupReport()
+            self.game = BenchGame(seed=seed, renderer=self.RENDERER, startup=self.startup)
+            self.game.finish_startup()  # normally deferred to the Tk event loop
+            self.sim = self.game.sim
+        else:
+            self.sim = scenario.sim_class(seed=seed)
+        self.rng = random.Random(seed)
+        self.restarts = 0
+        scenario.setup(self.sim)
+
+    def tick(self, tick: int):
+        # Returns (sim seconds, render seconds)
+        sim = self.sim
+        keep = self.scenario.keep_state
+        if keep and sim.state != keep:
+            self.scenario.setup(sim)
+            self.restarts += 1
+        t0 = time.perf_counter()
+        sim.apply_input(self.scenario.policy(sim, tick, self.rng))
+        sim.step()
+        t1 = time.perf_counter()
+        if self.game is not None:
+            self.game.render()
+            return t1 - t0, time.perf_counter() - t1
+        return t1 - t0, 0.0
+
+    def counts(self) -> Dict[str, int]:
+        out = {
+            "bullets": len(self.sim.bullets),
+            "enemy_bullets": len(self.sim.enemy_bullets),
+            "enemies": self.sim.fleet.alive_count,
+        }
+        if self.game is not None:
+            out["turtles"] = len(self.game.screen.turtles())
+            out["canvas_items"] = len(self.game.screen.getcanvas().find_all())
+        return out
+
+
+class CanvasDriver(GameDriver):
+    """GameDriver drawing through the tagged-canvas renderer."""
+
+    RENDERER = "canvas"
+
+
+class LegacyDriver:
+    """Runs a scenario against space_invaders.SpaceInvaders (always rendered).
+
+    The legacy engine keeps its state in turtles, so simulation and render
+    cost can't be separated: "sim" is the update calls and "render" is the
+    HUD plus ``screen.update()``. It has one bullet and no enemy fire.
+    """
+
+    def __init__(self, scenario: Scenario, seed: int, render: bool):
+        from space_invaders import SpaceInvaders
+
+        class BenchSpaceInvaders(SpaceInvaders):
+            def schedule_next_frame(self):
+                pass
+
+        random.seed(seed)
+        self.scenario = scenario
+        self.render = render
+        self.game = BenchSpaceInvaders()
+        self.rng = random.Random(seed)
+        self.restarts = 0
+        self._setup()
+
+    def _setup(self):
+        g = self.game
+        name = self.scenario.name
+        if name == "multi_restart":
+            return
+        if g.state != "menu":
+            g.cleanup_all()
+            g.state = "menu"
+        g.start_game("Hard" if name == "boss_rush" else "Normal")
+        if name == "boss_rush":
+            g.state = "boss"
+            g.spawn_boss()
+        else:
+            level = int(name.split("_")[1]) if name.startswith("level_") else max(g.LEVEL_CONFIG)
+            g.level = level
+            g.spawn_level_enemies(level)
+
+    def tick(self, tick: int):
+        g = self.game
+        keep = self.scenario.keep_state
+        if keep and g.state != keep:
+            self._setup()
+            self.restarts += 1
+        if self.scenario.name == "multi_restart":
+            if g.state == "menu":
+                g.start_game("Normal")
+            elif g.state in ("gameover", "victory"):
+                g.restart_to_menu()
+        # Policies only look at .state, which the legacy game also has
+        bits = self.scenario.policy(g, tick, self.rng)
+        g.left_pressed = bool(bits & IN_LEFT)
+        g.right_pressed = bool(bits & IN_RIGHT)
+        t0 = time.perf_counter()
+        if bits & IN_FIRE:
+            g.fire_bullet()
+        if g.state == "playing":
+            g.update_player()
+            g.update_bullet()
+            g.update_enemies()
+            g.check_level_progression()
+        elif g.state == "boss":
+            g.update_player()
+            g.update_bullet()
+            g.update_boss()
+        t1 = time.perf_counter()
+        if self.render:
+            g.update_hud()
+            if g.state == "boss":
+                g.draw_boss_health()
+            g.screen.update()
+        return t1 - t0, time.perf_counter() - t1
+
+    def counts(self) -> Dict[str, int]:
+        g = self.game
+        return {
+            "enemies": sum(1 for e in g.enemies if e.isvisible()),
+            "turtles": len(g.screen.turtles()),
+            "canvas_items": len(g.screen.getcanvas().find_all()),
+        }
+
+
+DRIVERS = {"game": GameDriver, "canvas": CanvasDriver, "legacy": LegacyDriver}
+
+
+def run_one(engine: str, scenario_name: str, render: bool, ticks: Optional[int], seed: int,
+            memory: bool = True) -> Dict:
+    scenario = SCENARIOS[scenario_name]
+    ticks = ticks or scenario.ticks
+    driver = DRIVERS[engine](scenario, seed, render)
+    sim_samples: List[float] = []
+    render_samples: List[float] = []
+    total_samples: List[float] = []
+    start = time.perf_counter()
+    for tick in range(ticks):
+        sim_s, render_s = driver.tick(tick)
+        sim_samples.append(sim_s)
+        render_samples.append(render_s)
+        total_samples.append(sim_s + render_s)
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "engine": engine,
+        "scenario": scenario_name,
+        "mode": "render" if render else "sim",
+        "ticks": ticks,
+        "tick_ms": summarize(total_samples),
+        "sim_ms": summarize(sim_samples),
+        "ticks_per_s": ticks / elapsed if elapsed else 0.0,
+        "restarts": driver.restarts,
+        "counts": driver.counts(),
+    }
+    if render:
+        result["render_ms"] = summarize(render_samples)
+    startup = getattr(driver, "startup", None)
+    if startup is not None:
+        result["startup_ms"] = {phase: seconds * 1000 for phase, seconds in startup.marks}
+    if memory:
+        # Separate, shorter pass: tracemalloc slows everything it traces
+        tracemalloc.start()
+        for tick in range(ticks, ticks + min(ticks, 600)):
+            driver.tick(tick)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["tracemalloc_current_kb"] = current // 1024
+        result["tracemalloc_peak_kb"] = peak // 1024
+    result["maxrss_kb"] = _maxrss_kb()
+    return result
+
+
+FRAME_BUDGET_MS = 1000.0 / 60
+
+
+def run_fleet_ramp(engine: str, render: bool, ticks: Optional[int], seed: int,
+                   limit: Optional[Tuple[int, int]] = None) -> Dict:
+    """Grow the stress fleet level by level until a frame no longer fits 60 FPS.
+
+    Each level's formation is held for ``ticks`` ticks (default 180). A
+    level holds 60 FPS when its p95 tick cost (simulation, plus drawing
+    when rendering) fits the 16.7 ms frame budget. The ramp stops at the
+    first level that doesn't. ``limit`` raises or lowers the preset's
+    (rows, cols) cap.
+    """
+    ticks = ticks or 180
+    scenario = SCENARIOS["stress_max"]
+    if limit is not None:
+        scenario = copy.copy(scenario)
+        scenario.sim_class = StressSimulation.with_limits(*limit)
+    driver = DRIVERS[engine](scenario, seed, render)
+    sim = driver.sim
+    steps = []
+    largest = None
+    for level in range(1, max_level(sim) + 1):
+        _setup_stress_level(level)(sim)
+        rows, cols = sim.level_layout(level)[:2]
+        frame = summarize([sum(driver.tick(tick)) for tick in range(ticks)])
+        holds = frame["p95"] <= FRAME_BUDGET_MS
+        steps.append({"level": level, "rows": rows, "cols": cols, "enemies": rows * cols,
+                      "frame_ms": frame, "holds_60fps": holds})
+        if not holds:
+            break
+        largest = steps[-1]
+    return {
+        "engine": engine,
+        "scenario": "fleet_ramp",
+        "mode": "render" if render else "sim",
+        "frame_budget_ms": FRAME_BUDGET_MS,
+        "steps": steps,
+        "largest_60fps": largest and {k: largest[k] for k in ("rows", "cols", "enemies")},
+        "reached_max": bool(steps) and steps[-1]["holds_60fps"],
+    }
+
+
+def print_ramp(result: Dict):
+    print(f"\n{result['engine']} fleet ramp ({result['mode']}), p95 budget {result['frame_budget_ms']:.1f} ms")
+    print(f"{'level':>5} {'fleet':>7} {'enemies':>8} {'mean':>8} {'p95':>8}")
+    for step in result["steps"]:
+        f = step["frame_ms"]
+        mark = "" if step["holds_60fps"] else "  over budget"
+        print(f"{step['level']:>5} {step['rows']:>3}x{step['cols']:<3} {step['enemies']:>8} "
+              f"{f['mean']:8.3f} {f['p95']:8.3f}{mark}")
+    largest = result["largest_60fps"]
+    if largest is None:
+        print("No stress fleet holds 60 FPS")
+    else:
+        note = " (the ramp's limit; larger fleets untested)" if result["reached_max"] else ""
+        print(f"Largest fleet holding 60 FPS: {largest['rows']}x{largest['cols']} = {largest['enemies']} enemies{note}")
+
+
+def run_in_subprocess(engine: str, scenario: str, render: bool, ticks: Optional[int], seed: int,
+                      limit: Optional[Tuple[int, int]] = None) -> Dict:
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", engine, scenario, "--seed", str(seed)]
+    if limit:
+        cmd += ["--fleet-limit", "%dx%d" % limit]
+    if render:
+        cmd.append("--render")
+    if ticks:
+        cmd += ["--ticks", str(ticks)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proc.returncode != 0:
+        return {"engine": engine, "scenario": scenario, "mode": "render" if render else "sim",
+                "error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed"}
+    return json.loads(proc.stdout)
+
+
+# ---------------------- Reporting ----------------------
+def result_key(result: Dict) -> str:
+    return f"{result['engine']}/{result['scenario']}/{result['mode']}"
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    # Regressions where mean or p95 tick time grew by more than ``threshold``
+    base = {result_key(r): r for r in baseline.get("results", []) if "error" not in r}
+    regressions = []
+    for r in results:
+        old = base.get(result_key(r))
+        if old is None or "error" in r:
+            continue
+        for stat in ("mean", "p95"):
+            new_v, old_v = r["tick_ms"][stat], old["tick_ms"][stat]
+            if old_v > 0 and new_v > old_v * (1 + threshold):
+                regressions.append(f"{result_key(r)} {stat}: {old_v:.3f} -> {new_v:.3f} ms "
+                                   f"(+{(new_v / old_v - 1) * 100:.0f}%)")
+        r["baseline_tick_ms"] = old["tick_ms"]
+    return regressions
+
+
+def print_table(results: List[Dict]):
+    print(f"{'run':<34} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'ticks/s':>9} {'peak KB':>8} {'turtles':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{result_key(r):<34} ERROR: {r['error']}")
+            continue
+        t = r["tick_ms"]
+        line = (f"{result_key(r):<34} {t['mean']:8.3f} {t['p50']:8.3f} {t['p95']:8.3f} {t['p99']:8.3f} "
+                f"{r['ticks_per_s']:9.0f} {r.get('tracemalloc_peak_kb', ''):>8} {r['counts'].get('turtles', ''):>8}")
+        if "baseline_tick_ms" in r:
+            old = r["baseline_tick_ms"]["mean"]
+            line += f"  ({(t['mean'] / old - 1) * 100:+.0f}% vs baseline)" if old else ""
+        print(line)
+
+
+def _fleet_size(text: str) -> Tuple[int, int]:
+    try:
+        rows, cols = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}") from None
+    return rows, cols
+
+
+def run_meta() -> Dict:
+    try:
+        import numpy  # noqa: F401
+        has_numpy = True
+    except ImportError:
+        has_numpy = False
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": has_numpy,
+        "fleet_backend": Simulation.FLEET_BACKEND,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scenario benchmarks for tick and render cost")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default: all)")
+    parser.add_argument("--engine", action="append", choices=sorted(DRIVERS),
+                        help="engine to run (repeatable; default: game)")
+    parser.add_argument("--render", action="store_true", help="also run render-included passes")
+    parser.add_argument("--ticks", type=int, help="override ticks per scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a previous --json file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="regression threshold as a fraction (default 0.10)")
+    parser.add_argument("--worker", nargs=2, metavar=("ENGINE", "SCENARIO"), help=argparse.SUPPRESS)
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    parser.add_argument("--max-fleet", action="store_true",
+                        help="ramp the stress fleet and report the largest that holds 60 FPS")
+    parser.add_argument("--fleet-limit", metavar="ROWSxCOLS", type=_fleet_size,
+                        help="largest fleet the ramp may grow to (default: the stress preset's 20x40)")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<16} {scenario.ticks:>6} ticks  {scenario.description}")
+        return 0
+
+    if args.worker:
+        engine, scenario = args.worker
+        if scenario == "fleet_ramp":
+            print(json.dumps(run_fleet_ramp(engine, args.render, args.ticks, args.seed, args.fleet_limit)))
+        else:
+            print(json.dumps(run_one(engine, scenario, args.render, args.ticks, args.seed)))
+        return 0
+
+    if args.max_fleet:
+        ramps = []
+        for engine in args.engine or ["game"]:
+            if engine == "legacy":
+                continue
+            result = run_in_subprocess(engine, "fleet_ramp", args.render, args.ticks, args.seed, args.fleet_limit)
+            if "error" in result:
+                print(f"{result_key(result)} ERROR: {result['error']}")
+                continue
+            print_ramp(result)
+            ramps.append(result)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"meta": run_meta(), "fleet_ramps": ramps}, f, indent=2)
+        return 0
+
+    engines = args.engine or ["game"]
+    scenarios = args.scenario or list(SCENARIOS)
+    modes = [False, True] if args.render else [False]
+    results = []
+    for engine in engines:
+        for scenario in scenarios:
+            for render in modes:
+                if engine != "game" and not render:
+                    # canvas shares game's simulation; legacy state lives in turtles
+                    continue
+                if engine == "legacy" and not SCENARIOS[scenario].legacy:
+                    continue
+                results.append(run_in_subprocess(engine, scenario, render, args.ticks, args.seed))
+
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"meta": run_meta(), "results": results}, f, indent=2)
+
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print("  " + line)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,42 @@
-import turtle
+from typing import Tuple
 
 
 class Boss:
-    def __init__(self, shape_name: str, dx: float = 3.0, hp: int = 15, size: float = 1.0):
-        self.t = turtle.Turtle()
-        self.t.shape(shape_name)
-        self.t.penup()
-        self.t.color("#ff5555")
-        # Face downward toward the player
-        try:
-            self.t.setheading(270)
-        except Exception:
-            pass
-        try:
-            self.t.shapesize(size, size)
-        except Exception:
-            pass
-        self.dx = dx
+    __slots__ = ("x", "y", "size", "dx", "hp", "hp_max", "alive")
+
+    def __init__(self, dx: float = 180.0, hp: int = 15, size: float = 1.0):
+        self.x = 0.0
+        self.y = 0.0
+        self.size = size  # render scale
+        self.dx = dx  # px per second
         self.hp = hp
         self.hp_max = hp
+        self.alive = False
 
-    def setpos(self, x: float, y: float):
-        self.t.goto(x, y)
-
-    def xcor(self):
-        return self.t.xcor()
-
-    def ycor(self):
-        return self.t.ycor()
-
-    def setx(self, x: float):
-        self.t.setx(x)
+    def reset(self, x: float, y: float, dx: float, hp: int):
+        # Reuse the same boss for every boss phase
+        self.x = x
+        self.y = y
+        self.dx = dx
+        self.hp = hp
+        self.hp_max = hp
+        self.alive = True
 
-    def sety(self, y: float):
-        self.t.sety(y)
+    def step_delta(self, left: float, right: float, dt: float) -> Tuple[float, float]:
+        # How far update() will move this boss: sideways, or down at a border
+        nx = self.x + self.dx * dt
+        if nx < left + 30 or nx > right - 30:
+            return 0.0, -20.0
+        return self.dx * dt, 0.0
 
-    def update(self, left: float, right: float, bottom: float) -> bool:
+    def update(self, left: float, right: float, bottom: float, dt: float) -> bool:
         # Returns True if game over due to reaching bottom
-        nx = self.xcor() + self.dx
+        nx = self.x + self.dx * dt
         if nx < left + 30 or nx > right - 30:
             self.dx *= -1
-            self.sety(self.ycor() - 20)
-            if self.ycor() < bottom + 80:
+            self.y -= 20
+            if self.y < bottom + 80:
                 return True
         else:
-            self.setx(nx)
+            self.x = nx
         return False
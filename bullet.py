@@ -1,66 +1,27 @@
-import turtle
+import math
+from typing import Optional
+
+
+def sweep_circle(x0: float, y0: float, x1: float, y1: float, cx: float, cy: float, r: float) -> Optional[float]:
+    """First point where the segment (x0, y0)-(x1, y1) is inside a circle.
+
+    Returns the fraction of the segment (0..1) at which it enters the
+    circle of radius ``r`` at (cx, cy) -- 0 if it starts inside -- or
+    None if it never comes closer than ``r``. Like the point test
+    ``distance < r`` it replaces, touching the edge is not a hit.
+    """
+    fx, fy = x0 - cx, y0 - cy
+    c = fx * fx + fy * fy - r * r
+    if c < 0:
+        return 0.0
+    dx, dy = x1 - x0, y1 - y0
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    if a == 0 or b >= 0:
+        return None  # not moving, or moving away from the centre
+    disc = b * b - a * c
+    if disc <= 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1 else None
 
-
-class Bullet:
-    def __init__(self, shape_name: str, speed: float = 12.0):
-        self.t = turtle.Turtle(visible=False)
-        self.t.shape(shape_name)
-        self.t.color("yellow")
-        self.t.penup()
-        self.speed = speed
-        self.active = False
-
-    def fire_from(self, x: float, y: float):
-        self.t.goto(x, y)
-        self.t.setheading(90)
-        self.t.showturtle()
-        self.active = True
-
-    def update(self):
-        if not self.active:
-            return
-        self.t.sety(self.t.ycor() + self.speed)
-
-    def offscreen(self, top: float) -> bool:
-        return self.t.ycor() > top
-
-    def deactivate(self):
-        self.t.hideturtle()
-        self.active = False
-
-    def distance(self, other_turtle: turtle.Turtle) -> float:
-        return self.t.distance(other_turtle)
-
-
-class EnemyBullet:
-    def __init__(self, shape_name: str, speed: float = 6.0, color: str = "red"):
-        self.t = turtle.Turtle(visible=False)
-        self.t.shape(shape_name)
-        try:
-            self.t.color(color)
-        except Exception:
-            pass
-        self.t.penup()
-        self.speed = speed
-        self.active = False
-
-    def fire_from(self, x: float, y: float):
-        self.t.goto(x, y)
-        self.t.setheading(270)
-        self.t.showturtle()
-        self.active = True
-
-    def update(self):
-        if not self.active:
-            return
-        self.t.sety(self.t.ycor() - self.speed)
-
-    def offscreen(self, bottom: float) -> bool:
-        return self.t.ycor() < bottom
-
-    def deactivate(self):
-        self.t.hideturtle()
-        self.active = False
-
-    def distance(self, other_turtle: turtle.Turtle) -> float:
-        return self.t.distance(other_turtle)
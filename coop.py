@@ -0,0 +1,122 @@
+import hashlib
+import random
+from typing import Optional
+
+from boss import Boss
+from bullet import sweep_circle
+from player import Player
+from sim import CMD_SHIFT, Simulation
+
+# A two-player tick's input is one word: player 1's byte (IN_* / CMD_*) in
+# the low bits, player 2's shifted above it
+P2_SHIFT = 8
+PLAYER_MASK = 0xFF
+
+
+def combine_inputs(p1: int, p2: int) -> int:
+    return (p1 & PLAYER_MASK) | (p2 & PLAYER_MASK) << P2_SHIFT
+
+
+class CoopSimulation(Simulation):
+    """Two-player co-op: both ships share the fleet, the bosses and one bullet pool.
+
+    ``apply_input`` takes a ``combine_inputs`` word, so replays and the
+    lockstep netplay session (see netplay.py) carry both players in one
+    value per tick. Menu commands come from either byte, player 1's first.
+    A ship that is hit is out until the next level or the boss phase; the
+    game is over once both are out.
+    """
+
+    MODE = "coop"
+
+    MAX_PLAYER_BULLETS = 32
+    PLAYER_GAP = 200  # px between the two ships at the start of a game
+
+    def __init__(self, seed: Optional[int] = None, rng: Optional[random.Random] = None):
+        super().__init__(seed=seed, rng=rng)
+        self.player2 = Player(0, self.BORDER_BOTTOM + 40)
+        self.player2.fire_cooldown = self.PLAYER_FIRE_COOLDOWN
+        self.players = [self.player, self.player2]
+
+    def setup_player(self):
+        self.bullets.clear()
+        self.actors.clear()
+        y = self.BORDER_BOTTOM + 40
+        for i, player in enumerate(self.players):
+            player.reset((i - 0.5) * self.PLAYER_GAP, y)
+            self.actors.insert(player, player.x, player.y)
+
+    def spawn_level_enemies(self, level: int):
+        super().spawn_level_enemies(level)
+        self.revive_players()
+
+    def spawn_boss(self):
+        super().spawn_boss()
+        self.revive_players()
+
+    def revive_players(self):
+        for player in self.players:
+            if not player.alive:
+                player.alive = True
+                player.fire_requested = False
+                self.actors.insert(player, player.x, player.y)
+
+    def knock_out(self, player: Player, reason: str):
+        player.alive = False
+        self.actors.remove(player)
+        if not any(p.alive for p in self.players):
+            self.game_over(reason)
+
+    # ---------------------- Input ----------------------
+    def apply_input(self, bits: int):
+        p1 = bits & PLAYER_MASK
+        p2 = bits >> P2_SHIFT & PLAYER_MASK
+        self.apply_player_bits(self.player, p1)
+        self.apply_player_bits(self.player2, p2)
+        self.apply_command(p1 >> CMD_SHIFT or p2 >> CMD_SHIFT)
+
+    def state_hash(self) -> str:
+        p2 = self.player2
+        data = (super().state_hash(), p2.x, p2.last_fire_time, self.player.alive, p2.alive)
+        return hashlib.blake2b(repr(data).encode(), digest_size=8).hexdigest()
+
+    # ---------------------- Updates ----------------------
+    def update_player(self, dt: float):
+        for player in self.players:
+            if player.alive:
+                self.move_player(player, dt)
+
+    def update_enemy_bullets(self, dt: float):
+        if not self.enemy_bullets:
+            return
+        bottom = self.BORDER_BOTTOM
+        players = self.players
+        pool = self.enemy_bullets
+        xs, ys, prev_ys, speeds = pool.xs, pool.ys, pool.prev_ys, pool.speeds
+        for i in pool:
+            x = xs[i]
+            y0 = ys[i]
+            prev_ys[i] = y0
+            y = ys[i] = y0 - speeds[i] * dt
+            hit = None
+            for actor in self.actors.query_segment(x, y0, x, y, 18):
+                if actor in players and sweep_circle(x, y0, x, y, actor.x, actor.y, 18) is not None:
+                    hit = actor
+                    break
+            if hit is not None:
+                pool.release(i)
+                self.knock_out(hit, "Hit by enemy fire")
+                if self.state == "gameover":
+                    return
+            elif y < bottom:
+                pool.release(i)
+
+    def check_boss_contact(self) -> bool:
+        for player in self.players:
+            if not player.alive:
+                continue
+            for actor in self.actors.query(player.x, player.y, 35):
+                if isinstance(actor, Boss) and player.distance(actor.x, actor.y) < 35:
+                    self.knock_out(player, "Boss collided with player")
+                    break
+        return self.state == "gameover"
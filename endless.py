@@ -0,0 +1,109 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+from coop import CoopSimulation
+from sim import Simulation
+
+
+class EndlessSimulation(Simulation):
+    """Endless mode: procedurally generated levels with no boss.
+
+    Level N starts from the level-1 formation and adds ``ROW_GROWTH`` rows
+    and ``COL_GROWTH`` columns per level up to ``MAX_ROWS`` x ``MAX_COLS``.
+    Fleet speed keeps the classic +36 px/s per level up to ``MAX_SPEED``.
+    Spacing shrinks so wide or tall formations still fit between the
+    borders. The fleet is sized once for the largest formation.
+
+    Use ``with_limits`` for other caps, e.g. ``EndlessSimulation.with_limits(20, 40)``.
+    """
+
+    MODE = "endless"
+
+    START_ROWS = 3
+    START_COLS = 7
+    ROW_GROWTH = 1
+    COL_GROWTH = 2
+    MAX_ROWS = 12
+    MAX_COLS = 24
+    MAX_SPEED = 480.0  # px per second, before the difficulty multiplier
+
+    # Formation area: full width inside a margin, and down to this height
+    # above the bottom border so a fresh fleet has a few drops to go
+    SIDE_MARGIN = 40
+    FLOOR_MARGIN = 200
+
+    @classmethod
+    def with_limits(cls, max_rows: int, max_cols: int) -> type:
+        # Subclass with other fleet caps (Game and tools construct by class)
+        return type(cls.__name__, (cls,), {"MAX_ROWS": max_rows, "MAX_COLS": max_cols})
+
+    def mode_info(self) -> dict:
+        return {"mode": self.MODE, "max_fleet": [self.MAX_ROWS, self.MAX_COLS]}
+
+    def fleet_capacity(self) -> int:
+        return self.MAX_ROWS * self.MAX_COLS
+
+    def level_layout(self, level: int) -> Tuple[int, int, float, float]:
+        rows = min(self.MAX_ROWS, self.START_ROWS + (level - 1) * self.ROW_GROWTH)
+        cols = min(self.MAX_COLS, self.START_COLS + (level - 1) * self.COL_GROWTH)
+        width = self.BORDER_RIGHT - self.BORDER_LEFT - 2 * self.SIDE_MARGIN
+        height = (self.BORDER_TOP - 100) - (self.BORDER_BOTTOM + self.FLOOR_MARGIN)
+        spacing_x = min(60.0, width / max(1, cols - 1))
+        spacing_y = min(45.0, height / max(1, rows - 1))
+        return rows, cols, spacing_x, spacing_y
+
+    def level_speed(self, level: int) -> float:
+        return min(self.MAX_SPEED, super().level_speed(level))
+
+    def check_level_progression(self):
+        if not self.fleet.alive_count and self.state == "playing":
+            self.level += 1
+            self.spawn_level_enemies(self.level)
+
+
+class StressSimulation(EndlessSimulation):
+    """Load-testing preset: grows to a 20x40 fleet and never ends.
+
+    The fleet doesn't drop, and enemy fire hitting the player is removed and
+    counted in ``hits_taken`` instead of ending the game. A formation can
+    therefore stay on screen for as long as a measurement needs. The fleet
+    fires four times as often.
+    """
+
+    MODE = "stress"
+
+    START_ROWS = 5
+    START_COLS = 9
+    MAX_ROWS = 20
+    MAX_COLS = 40
+    ENEMY_FIRE_PERIOD = 7 / 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enemy_drop = 0
+        self.hits_taken = 0
+
+    def game_over(self, reason: str):
+        self.hits_taken += 1
+
+
+MODES: Dict[str, type] = {
+    Simulation.MODE: Simulation,
+    EndlessSimulation.MODE: EndlessSimulation,
+    StressSimulation.MODE: StressSimulation,
+    CoopSimulation.MODE: CoopSimulation,
+}
+
+
+def simulation_class(mode: str = "classic", max_fleet: Optional[Sequence[int]] = None) -> type:
+    """Simulation class for a mode name, with optional (rows, cols) fleet caps."""
+    try:
+        cls = MODES[mode]
+    except KeyError:
+        raise ValueError(f"Unknown game mode {mode!r}") from None
+    if max_fleet is not None:
+        if not issubclass(cls, EndlessSimulation):
+            raise ValueError(f"Fleet limits only apply to endless modes, not {mode!r}")
+        rows, cols = max_fleet
+        if (rows, cols) != (cls.MAX_ROWS, cls.MAX_COLS):
+            cls = cls.with_limits(rows, cols)
+    return cls
@@ -1,56 +1,54 @@
-import turtle
-from typing import List
+class Enemy:
+    """Handle on one fleet slot.
 
+    Position and alive flag live in the owning Fleet's arrays (``xs``,
+    ``ys``, ``alive``) so the fleet can update them in bulk; this object
+    just reads and writes its own index.
+    """
 
-class Enemy:
-    def __init__(self, frames: List[str]):
-        self.t = turtle.Turtle()
-        self.frames = frames if frames else ["square", "square"]
-        self.frame_index = 0
-        # self.t.shape(self.frames[self.frame_index])
-        self.t.shape("turtle")
-        # Face downward toward the player
-        try:
-            self.t.setheading(270)
-        except Exception:
-            pass
-        # Ensure visibility on dark background when using fallback polygons
-        try:
-            self.t.color("#66ff66")
-        except Exception:
-            pass
-        self.t.penup()
-        self.alive = True
+    __slots__ = ("fleet", "index")
+
+    def __init__(self, fleet, index: int):
+        self.fleet = fleet
+        self.index = index
 
-    def setpos(self, x: float, y: float):
-        self.t.goto(x, y)
+    @property
+    def x(self) -> float:
+        return self.fleet.xs[self.index]
 
-    def xcor(self):
-        return self.t.xcor()
+    @x.setter
+    def x(self, value: float):
+        self.fleet.xs[self.index] = value
 
-    def ycor(self):
-        return self.t.ycor()
+    @property
+    def y(self) -> float:
+        return self.fleet.ys[self.index]
 
-    def setx(self, x: float):
-        self.t.setx(x)
+    @y.setter
+    def y(self, value: float):
+        self.fleet.ys[self.index] = value
 
-    def sety(self, y: float):
-        self.t.sety(y)
+    @property
+    def frame_index(self) -> int:
+        # The whole fleet animates in step
+        return self.fleet.frame_index
+
+    @property
+    def alive(self) -> bool:
+        return bool(self.fleet.alive[self.index])
+
+    @alive.setter
+    def alive(self, value: bool):
+        self.fleet.alive[self.index] = value
+
+    def revive(self, x: float, y: float):
+        # Reuse this enemy for a new level instead of allocating another
+        self.x = x
+        self.y = y
+        self.alive = True
 
     def hide(self):
-        self.t.hideturtle()
         self.alive = False
 
     def is_visible(self):
-        return self.alive and self.t.isvisible()
-
-    def animate(self, tick: int, period: int = 20):
-        # Swap frames every 'period' ticks
-        if period <= 0:
-            period = 20
-        if tick % period == 0:
-            self.frame_index = 1 - self.frame_index
-            try:
-                self.t.shape(self.frames[self.frame_index])
-            except Exception:
-                pass
+        return self.alive
@@ -0,0 +1,228 @@
+"""Gym-style vectorized environment for training and evaluating bots.
+
+``VectorEnv`` runs N independent headless Simulations in lockstep in one
+process and returns batched NumPy arrays::
+
+    from env import VectorEnv
+
+    env = VectorEnv(64)
+    obs = env.reset(seed=1)                    # (64, obs_size) float32
+    obs, rewards, terminated, truncated, info = env.step(actions)  # actions: (64,) ints
+
+Actions index ``VectorEnv.ACTIONS`` (noop, left, right, fire, fire+left,
+fire+right). Episodes that end are reset automatically with the next seed;
+their last observation is in ``info["final_observation"]``.
+Requires numpy.
+
+Run ``python env.py`` for a random-policy throughput check.
+"""
+import argparse
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sim import IN_FIRE, IN_LEFT, IN_RIGHT, Simulation
+
+np = None
+
+
+def _import_numpy():
+    # Like NumpyFleet, only pay for numpy when an environment is built
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+STATE_CODES = {"menu": 0, "playing": 1, "boss": 2, "victory": 3, "gameover": 4}
+
+
+class ObservationLayout:
+    """Fixed float32 layout of one Simulation's state.
+
+    Fields, in order (world coordinates, pixels):
+      - ``header``: player x, state code (``STATE_CODES``), level, fleet dx
+      - ``fleet_x``, ``fleet_y``, ``fleet_alive``: one entry per fleet slot
+      - ``bullets``, ``enemy_bullets``: (x, y, active) per pool slot, with
+        the bullets in flight packed first
+      - ``bosses``: (x, y, hp) for each of the two bosses, hp 0 when dead
+
+    Sizes come from the simulation class (fleet capacity, pool sizes), so
+    every instance of a class encodes to the same length.
+    """
+
+    HEADER = 4
+    dtype = "float32"
+
+    def __init__(self, sim: Simulation):
+        cap = sim.fleet.capacity
+        self.fleet_capacity = cap
+        self.bullet_capacity = sim.bullets.capacity
+        self.enemy_bullet_capacity = sim.enemy_bullets.capacity
+        self.boss_count = len(sim.boss_pair)
+        sizes = [
+            ("header", self.HEADER),
+            ("fleet_x", cap),
+            ("fleet_y", cap),
+            ("fleet_alive", cap),
+            ("bullets", 3 * self.bullet_capacity),
+            ("enemy_bullets", 3 * self.enemy_bullet_capacity),
+            ("bosses", 3 * self.boss_count),
+        ]
+        self.slices: Dict[str, slice] = {}
+        start = 0
+        for name, size in sizes:
+            self.slices[name] = slice(start, start + size)
+            start += size
+        self.size = start
+        self.shape = (start,)
+        self._fleet_x = self.slices["fleet_x"]
+        self._fleet_y = self.slices["fleet_y"]
+        self._fleet_alive = self.slices["fleet_alive"]
+        self._bullets_at = self.slices["bullets"].start
+        self._enemy_bullets_at = self.slices["enemy_bullets"].start
+        self._bosses_at = self.slices["bosses"].start
+
+    def write(self, sim: Simulation, out):
+        """Encode ``sim`` into ``out``, a float32 array of ``size`` values."""
+        fleet = sim.fleet
+        out[:self.HEADER] = (sim.player.x, STATE_CODES[sim.state], sim.level, sim.enemy_dx)
+        # Array copies with a NumPy fleet, element conversion with lists
+        out[self._fleet_x] = fleet.xs
+        out[self._fleet_y] = fleet.ys
+        out[self._fleet_alive] = fleet.alive
+        # Only bullets in flight and live bosses are written; the rest is zero
+        out[self._bullets_at:] = 0.0
+        for pool, i in ((sim.bullets, self._bullets_at), (sim.enemy_bullets, self._enemy_bullets_at)):
+            active = pool.active
+            if active:
+                xs, ys = pool.xs, pool.ys
+                out[i:i + 3 * len(active)] = [v for b in active for v in (xs[b], ys[b], 1.0)]
+        if sim.bosses:
+            i = self._bosses_at
+            for boss in sim.boss_pair:
+                if boss.alive:
+                    out[i:i + 3] = (boss.x, boss.y, boss.hp)
+                i += 3
+
+
+class VectorEnv:
+    """N independent Simulations stepped in lockstep with batched arrays.
+
+    ``step`` applies one action per instance, advances each by
+    ``FRAME_SKIP`` ticks and returns ``(obs, rewards, terminated,
+    truncated, info)``. Rewards are ``REWARD_KILL`` per enemy,
+    ``REWARD_BOSS_HIT`` per boss hit, plus ``REWARD_WIN`` or
+    ``REWARD_DEATH`` when the game ends. An episode is truncated after
+    ``MAX_EPISODE_TICKS`` ticks. Instance ``i`` starts with seed
+    ``seed + i`` and each automatic reset moves it on by ``num_envs``, so
+    a run is reproducible from the ``reset`` seed.
+    """
+
+    SIMULATION_CLASS = Simulation
+    DIFFICULTY = "Normal"
+    ACTIONS: Tuple[int, ...] = (0, IN_LEFT, IN_RIGHT, IN_FIRE, IN_FIRE | IN_LEFT, IN_FIRE | IN_RIGHT)
+    FRAME_SKIP = 1
+    MAX_EPISODE_TICKS = 36000  # 10 minutes at 60 Hz
+
+    REWARD_KILL = 1.0
+    REWARD_BOSS_HIT = 1.0
+    REWARD_WIN = 10.0
+    REWARD_DEATH = -10.0
+
+    def __init__(self, num_envs: int, sim_class: Optional[type] = None, difficulty: Optional[str] = None):
+        _import_numpy()
+        sim_class = sim_class or self.SIMULATION_CLASS
+        self.num_envs = num_envs
+        self.difficulty = difficulty or self.DIFFICULTY
+        self.sims: List[Simulation] = [sim_class() for _ in range(num_envs)]
+        self.layout = ObservationLayout(self.sims[0])
+        self.observation_shape = (num_envs, self.layout.size)
+        self.action_count = len(self.ACTIONS)
+
+        self._obs = np.zeros(self.observation_shape, dtype=np.float32)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._terminated = np.zeros(num_envs, dtype=bool)
+        self._truncated = np.zeros(num_envs, dtype=bool)
+        self._seeds = [0] * num_envs
+        self._scores = [0] * num_envs
+
+    def reset(self, seed: Optional[int] = None) -> "np.ndarray":
+        base = seed if seed is not None else int.from_bytes(os.urandom(4), "little")
+        for i in range(self.num_envs):
+            self._restart(i, base + i)
+        return self._obs.copy()
+
+    def _restart(self, i: int, seed: int):
+        sim = self.sims[i]
+        sim.reset(seed)
+        sim.start_game(self.difficulty)
+        self._seeds[i] = seed
+        self._scores[i] = 0
+        self.layout.write(sim, self._obs[i])
+
+    def step(self, actions: Sequence[int]):
+        actions_bits = self.ACTIONS
+        write = self.layout.write
+        obs, rewards = self._obs, self._rewards
+        terminated, truncated = self._terminated, self._truncated
+        skip = self.FRAME_SKIP
+        reward_kill, reward_boss = self.REWARD_KILL, self.REWARD_BOSS_HIT
+        max_ticks = self.MAX_EPISODE_TICKS
+        done_rows = []
+        for i, sim in enumerate(self.sims):
+            sim.apply_input(actions_bits[actions[i]])
+            for _ in range(skip):
+                sim.step()
+                if sim.state not in ("playing", "boss"):
+                    break
+            score = sim.kills * reward_kill + sim.boss_hits * reward_boss
+            reward = score - self._scores[i]
+            self._scores[i] = score
+            state = sim.state
+            ended = state == "victory" or state == "gameover"
+            if ended:
+                reward += self.REWARD_WIN if state == "victory" else self.REWARD_DEATH
+            terminated[i] = ended
+            truncated[i] = cut = not ended and sim.tick >= max_ticks
+            rewards[i] = reward
+            write(sim, obs[i])
+            if ended or cut:
+                done_rows.append(i)
+
+        info: Dict[str, object] = {}
+        if done_rows:
+            info["final_observation"] = obs.copy()
+            info["done_envs"] = done_rows
+            for i in done_rows:
+                self._restart(i, self._seeds[i] + self.num_envs)
+        return obs.copy(), rewards.copy(), terminated.copy(), truncated.copy(), info
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Random-policy throughput of the vectorized environment")
+    parser.add_argument("--envs", type=int, default=64, help="environments stepped in lockstep (default 64)")
+    parser.add_argument("--steps", type=int, default=500, help="batched steps to time (default 500)")
+    parser.add_argument("--frame-skip", type=int, default=VectorEnv.FRAME_SKIP, help="ticks per env step")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    env = VectorEnv(args.envs)
+    env.FRAME_SKIP = args.frame_skip
+    env.reset(args.seed)
+    rng = np.random.default_rng(args.seed)
+    actions = rng.integers(0, env.action_count, size=(args.steps, args.envs))
+    episodes = 0
+    started = time.perf_counter()
+    for step_actions in actions:
+        _, _, terminated, truncated, _ = env.step(step_actions)
+        episodes += int(terminated.sum() + truncated.sum())
+    elapsed = time.perf_counter() - started
+    steps = args.steps * args.envs
+    print(f"{steps} env steps ({args.envs} envs, frame skip {args.frame_skip}, obs size {env.layout.size}) "
+          f"in {elapsed:.2f} s: {steps / elapsed:.0f} steps/s, {steps * args.frame_skip / elapsed:.0f} ticks/s, "
+          f"{episodes} episodes ended")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import importlib.util
+from typing import List, Tuple
+
+from enemy import Enemy
+from spatial import SpatialHash
+
+# Optional and slow to import (~100 ms), so only loaded for a NumpyFleet;
+# the pure-Python fleet is always available
+np = None
+
+
+def numpy_available() -> bool:
+    return np is not None or importlib.util.find_spec("numpy") is not None
+
+
+def _import_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+class Fleet:
+    """Pre-sized set of enemies shared by every level and restart.
+
+    Enemies are created once, sized for the largest formation, and each
+    level repositions and revives the ones it needs. Unused slots stay
+    dead, so the renderer holds the same number of enemy turtles no matter
+    how many games are played.
+
+    Positions and alive flags are stored column-wise in ``xs``, ``ys`` and
+    ``alive`` so fleet-wide operations (border test, drop, move, bottom
+    check) are single passes. This class keeps them in Python lists;
+    ``NumpyFleet`` keeps them in NumPy arrays.
+
+    Alive enemies are also indexed in ``grid``, a spatial hash whose cells
+    match the formation spacing. The formation moves rigidly, so ``shift``
+    just translates the grid origin; kills are the only incremental update.
+
+    The same rigidity keeps the extents cheap: every slot in a column has
+    the same x and every slot in a row the same y, so the fleet tracks
+    alive counts per row and column plus the leftmost/rightmost alive
+    column and lowest alive row, updated on each kill. Border, bottom and
+    level-clear checks then read one slot instead of scanning the fleet.
+    ``col_bottom`` holds each column's lowest alive row, so the enemy that
+    can fire from a column is found without a scan either.
+    """
+
+    backend = "python"
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.xs = [0.0] * capacity
+        self.ys = [0.0] * capacity
+        self.alive = [False] * capacity
+        self.enemies: List[Enemy] = [Enemy(self, i) for i in range(capacity)]
+        self.grid = SpatialHash(60, 45)
+        # Formation bookkeeping, maintained by deploy/kill/hide_all
+        self.rows = 0
+        self.cols = 0
+        self.alive_count = 0
+        self.row_alive: List[int] = []
+        self.col_alive: List[int] = []
+        self.col_bottom: List[int] = []  # lowest alive row per column, -1 when empty
+        self.left_col = 0
+        self.right_col = -1
+        self.bottom_row = -1
+        # Animation frame shared by every enemy (Simulation flips it)
+        self.frame_index = 0
+        # Bumped whenever slots are revived or cleared, for renderers that
+        # otherwise only follow rigid shifts and kills
+        self.generation = 0
+
+    def deploy(self, rows: int, cols: int, start_x: float, start_y: float,
+               spacing_x: float, spacing_y: float) -> List[Enemy]:
+        count = rows * cols
+        if count > self.capacity:
+            raise ValueError(f"Formation {rows}x{cols} exceeds fleet capacity {self.capacity}")
+        grid = self.grid
+        grid.clear()
+        grid.cell_w = spacing_x
+        grid.cell_h = spacing_y
+        self.hide_all()
+        for i in range(count):
+            r, c = divmod(i, cols)
+            enemy = self.enemies[i]
+            enemy.revive(start_x + c * spacing_x, start_y - r * spacing_y)
+            grid.insert(enemy, enemy.x, enemy.y)
+        self.rows = rows
+        self.cols = cols
+        self.alive_count = count
+        self.row_alive = [cols] * rows
+        self.col_alive = [rows] * cols
+        self.col_bottom = [rows - 1] * cols
+        self.left_col = 0
+        self.right_col = cols - 1
+        self.bottom_row = rows - 1
+        self.frame_index = 0
+        return self.enemies[:count]
+
+    def kill(self, enemy: Enemy):
+        if not enemy.alive:
+            return
+        enemy.hide()
+        self.grid.remove(enemy)
+        self.alive_count -= 1
+        r, c = divmod(enemy.index, self.cols)
+        self.row_alive[r] -= 1
+        self.col_alive[c] -= 1
+        if r == self.col_bottom[c]:
+            alive, cols = self.alive, self.cols
+            while r >= 0 and not alive[r * cols + c]:
+                r -= 1
+            self.col_bottom[c] = r
+        # Extents only ever shrink, so each pointer walks its axis once per level
+        if not self.alive_count:
+            self.left_col, self.right_col, self.bottom_row = 0, -1, -1
+            return
+        col_alive = self.col_alive
+        while not col_alive[self.left_col]:
+            self.left_col += 1
+        while not col_alive[self.right_col]:
+            self.right_col -= 1
+        while not self.row_alive[self.bottom_row]:
+            self.bottom_row -= 1
+
+    def hide_all(self):
+        self.alive[:] = [False] * self.capacity
+        self.grid.clear()
+        self._reset_extents()
+
+    def _reset_extents(self):
+        self.generation += 1
+        self.alive_count = 0
+        self.row_alive = []
+        self.col_alive = []
+        self.col_bottom = []
+        self.left_col, self.right_col, self.bottom_row = 0, -1, -1
+
+    # ---------------------- Fleet-wide operations ----------------------
+    def shift(self, dx: float, dy: float):
+        # Dead slots move too; their positions are reset on revive
+        if dx:
+            self.xs = [x + dx for x in self.xs]
+        if dy:
+            self.ys = [y + dy for y in self.ys]
+        self.grid.translate(dx, dy)
+
+    def will_hit_border(self, dx: float, left: float, right: float) -> bool:
+        # Row-0 slots of the extreme columns share x with every enemy below them
+        if not self.alive_count:
+            return False
+        xs = self.xs
+        return bool(xs[self.left_col] + dx < left or xs[self.right_col] + dx > right)
+
+    def lowest_y(self) -> float:
+        if not self.alive_count:
+            return float("inf")
+        return float(self.ys[self.bottom_row * self.cols])
+
+    def firing_columns(self) -> List[int]:
+        # Columns with at least one alive enemy, left to right
+        col_alive = self.col_alive
+        return [c for c in range(self.left_col, self.right_col + 1) if col_alive[c]]
+
+    def bottom_enemy(self, col: int) -> Enemy:
+        # Lowest alive enemy of a non-empty column (the only one that can fire)
+        return self.enemies[self.col_bottom[col] * self.cols + col]
+
+    def alive_enemies(self) -> List[Enemy]:
+        return [e for e, alive in zip(self.enemies, self.alive) if alive]
+
+    def snapshot(self) -> Tuple[List[float], List[float], List[bool]]:
+        # Positions and alive flags as plain lists, for the renderer
+        return self.xs, self.ys, self.alive
+
+
+class NumpyFleet(Fleet):
+    """Fleet whose positions and alive flags are NumPy arrays.
+
+    Each fleet-wide operation is one vectorized expression, which is what
+    keeps several-hundred-invader stress fleets cheap. Extent checks use
+    the inherited O(1) bookkeeping.
+    """
+
+    backend = "numpy"
+
+    def __init__(self, capacity: int):
+        _import_numpy()
+        super().__init__(capacity)
+        self.xs = np.zeros(capacity, dtype=np.float64)
+        self.ys = np.zeros(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def hide_all(self):
+        self.alive[:] = False
+        self.grid.clear()
+        self._reset_extents()
+
+    def shift(self, dx: float, dy: float):
+        if dx:
+            self.xs += dx
+        if dy:
+            self.ys += dy
+        self.grid.translate(dx, dy)
+
+    def alive_enemies(self) -> List[Enemy]:
+        enemies = self.enemies
+        return [enemies[i] for i in np.flatnonzero(self.alive).tolist()]
+
+    def snapshot(self) -> Tuple[List[float], List[float], List[bool]]:
+        return self.xs.tolist(), self.ys.tolist(), self.alive.tolist()
+
+
+# Below this many slots NumPy's per-call overhead outweighs the vector win
+NUMPY_MIN_CAPACITY = 128
+
+
+def make_fleet(capacity: int, backend: str = "auto") -> Fleet:
+    """Create a fleet with the requested backend: "python", "numpy" or "auto".
+
+    "auto" picks NumPy when it is installed and the fleet is large enough
+    to benefit, and the pure-Python fleet otherwise.
+    """
+    if backend == "auto":
+        backend = "numpy" if capacity >= NUMPY_MIN_CAPACITY and numpy_available() else "python"
+    if backend == "numpy":
+        if not numpy_available():
+            raise RuntimeError("NumPy fleet backend requested but numpy is not installed")
+        return NumpyFleet(capacity)
+    if backend == "python":
+        return Fleet(capacity)
+    raise ValueError(f"Unknown fleet backend {backend!r}")
@@ -1,84 +1,150 @@
+import random
 import time
 import turtle
-import random
-from typing import List, Optional
+from typing import Optional
 
 from sprites import SpriteLoader
-from player import Player
-from bullet import Bullet, EnemyBullet
-from enemy import Enemy
-from boss import Boss
+from sim import (
+    CMD_EASY, CMD_HARD, CMD_NORMAL, CMD_RESTART, CMD_SHIFT,
+    IN_FIRE, IN_FIRE_TAP, IN_LEFT, IN_RIGHT, Simulation,
+)
+from renderer import RENDERERS
+from profiler import FrameProfiler, StartupReport
+from governor import QualityGovernor
+from hud import HealthBar, TextGroup, TextItem, TextLines
+from replay import InputRecorder, Replay
+from coop import CoopSimulation
+from netplay import LockstepSession
 
 
 class Game:
+    """Turtle front end: window, input, menus/HUD and the frame loop.
+
+    Game rules live in ``Simulation``; this class steps it once per frame
+    and renders the result through ``TurtleRenderer`` or, with
+    ``renderer="canvas"``, ``CanvasRenderer``. With a ``netplay`` session
+    the keyboard drives one ship of a ``CoopSimulation`` and each tick
+    waits for the other player's input (see netplay.py).
+    """
+
     SCREEN_WIDTH = 800
     SCREEN_HEIGHT = 600
-    BORDER_LEFT = -380
-    BORDER_RIGHT = 380
-    BORDER_TOP = 280
-    BORDER_BOTTOM = -280
-
-    LEVEL_CONFIG = {
-        1: {"rows": 3, "cols": 7},
-        2: {"rows": 4, "cols": 8},
-        3: {"rows": 5, "cols": 9},
-    }
-
-    DIFFICULTY_SPEED = {
-        "Easy": 1.0,
-        "Normal": 1.3,
-        "Hard": 1.7,
-    }
-
-    def __init__(self):
+    BORDER_LEFT = Simulation.BORDER_LEFT
+    BORDER_RIGHT = Simulation.BORDER_RIGHT
+    BORDER_TOP = Simulation.BORDER_TOP
+    BORDER_BOTTOM = Simulation.BORDER_BOTTOM
+
+    # Fixed-timestep loop: the simulation advances in DT steps measured
+    # against perf_counter, rendering at most once per frame.
+    MAX_STEPS_PER_FRAME = 5  # catch-up cap; older backlog is dropped
+    MAX_SKIPPED_RENDERS = 2  # consecutive frames allowed to skip drawing
+    NETPLAY_RETRY_MS = 2  # poll interval while waiting for the other player's input
+
+    QUALITY = "auto"  # adaptive tiers, or a fixed QualityGovernor tier name
+
+    OVERLAY_REFRESH_FRAMES = 30  # profiler overlay / counter sampling interval
+    SPRITE_PRELOAD_DELAY_MS = 100  # after the menu's first paint
+    STARTUP_MENU_TARGET_MS = 250  # cold start (main.py entry) to menu painted
+
+    TITLE_FONT = ("Arial", 32, "bold")
+
+    # Simulation type to run; tools (bench.py) substitute configured subclasses
+    SIMULATION_CLASS = Simulation
+
+    def __init__(self, profile: bool = False, stats_path: Optional[str] = None,
+                 seed: Optional[int] = None, record_path: Optional[str] = None,
+                 replay: Optional[Replay] = None, time_scale: float = 1.0,
+                 renderer: str = "turtle", startup: Optional[StartupReport] = None,
+                 sim_class: Optional[type] = None, quality: Optional[str] = None,
+                 netplay: Optional[LockstepSession] = None):
+        # Startup is split in two: everything the menu needs is built here
+        # and painted, the rest (sprites, entity renderer, HUD) is built by
+        # finish_startup once the window is up
+        self.startup = startup or StartupReport()
+
         # Screen
         self.screen = turtle.Screen()
         self.screen.setup(self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
         self.screen.title("Space Invaders - Enhanced MVP")
         self.screen.bgcolor("black")
         self.screen.tracer(0)
-
-        # Sprites
-        self.sprites = SpriteLoader()
-
-        # Pens / HUD
-        self.menu_pen = turtle.Turtle(visible=False)
-        self.menu_pen.color("white")
-        self.menu_pen.penup()
-
-        self.hud_pen = turtle.Turtle(visible=False)
-        self.hud_pen.color("white")
-        self.hud_pen.penup()
-        self.hud_pen.goto(self.BORDER_LEFT + 10, self.BORDER_TOP + 10)
-
-        self.health_pen = turtle.Turtle(visible=False)
-        self.health_pen.hideturtle()
-        self.health_pen.penup()
-        self.health_pen.color("white")
-
-        # Entities
-        self.player: Optional[Player] = None
-        self.bullets: List[Bullet] = []
-        self.enemies: List[Enemy] = []
-        self.enemy_dx = 2.2
-        self.enemy_drop = 30
-        self.boss: Optional[Boss] = None
-        self.bosses: List[Boss] = []
-        self.enemy_bullets: List[EnemyBullet] = []
-
-        # Game state
-        self.state = "menu"  # menu, playing, boss, victory, gameover
-        self.level = 1
-        self.difficulty = None
-        self.diff_mult = 1.0
-        self.tick = 0
-        self.boss_fire_period = 24  # slower boss fire cadence
-
-        # Input
+        self.startup.mark("screen")
+
+        # Instrumentation (F3 toggles); stats are written to stats_path on exit
+        self.profiler = FrameProfiler(enabled=profile or bool(stats_path))
+        self.stats_path = stats_path
+        self.show_overlay = profile
+
+        # Simulation. The seed is always explicit so a session can be
+        # recorded and replayed exactly.
+        if replay is not None:
+            seed = replay.seed
+        elif netplay is not None:
+            seed = netplay.seed
+            sim_class = CoopSimulation
+        elif seed is None:
+            seed = random.randrange(2 ** 31)
+        if sim_class is None:
+            sim_class = replay.simulation_class() if replay is not None else self.SIMULATION_CLASS
+        self.sim = sim_class(seed=seed)
+        self.sim.profiler = self.profiler
+        self.dt = 1.0 / replay.tick_rate if replay is not None else self.sim.DT
+        self.time_scale = time_scale
+
+        # Input is sampled once per tick (see Simulation.apply_input): held
+        # buttons plus latched presses/commands since the last tick. Keys
+        # pressed before startup finishes are latched the same way.
+        self._held = 0
+        self._pending = 0
+        self.replay = replay
+        self.netplay = netplay
+        self._replay_inputs = replay.inputs() if replay is not None else None
+        self.recorder = (
+            InputRecorder(record_path, seed, round(1.0 / self.dt), self.sim.mode_info()) if record_path else None
+        )
+        self.startup.mark("simulation")
+
+        # Quality tiers shed drawing work when frames run over one step.
+        # Capping enemy bullets changes gameplay, so never while recording,
+        # replaying or in lockstep with another machine.
+        quality = quality or self.QUALITY
+        self.governor = QualityGovernor(self.dt, fixed=None if quality == "auto" else quality,
+                                        gameplay=not (record_path or replay or netplay))
+
+        # Menu, on screen before anything else is built
+        self.renderer_name = renderer
+        self.renderer = None
+        self.build_menu_text()
         self.bind_keys()
+        self.screen.update()
+        self.startup.mark("menu")
 
-        # Menu
-        self.show_menu()
+        self.screen.ontimer(self.finish_startup, 0)
+
+    def finish_startup(self):
+        # Second half of construction; safe to call early (tools do) or twice
+        if self.renderer is not None:
+            return
+        self.sprites = SpriteLoader()
+        self.startup.mark("sprites")
+        self.renderer = RENDERERS[self.renderer_name](self.sim, self.sprites)
+        self.startup.mark("renderer")
+
+        # Retained text and health bars, created above the entities
+        self.build_text()
+        self._shown_state = None
+        self.sync_screens()
+        self.startup.mark("hud")
+
+        self._accumulator = 0.0
+        self._skipped_renders = 0
+        self._frames_since_render = 0
+        self._next_hud_time = 0.0
+        self.apply_quality()
+        self._last_frame_time = time.perf_counter()
+        self.screen.ontimer(self.sprites.preload, self.SPRITE_PRELOAD_DELAY_MS)
+        self.startup.mark("ready")
+        self.startup.finish("menu", self.STARTUP_MENU_TARGET_MS)
 
         # Loop
         self.schedule_next_frame()
@@ -86,409 +152,326 @@ class Game:
     # ---------------------- Input ----------------------
     def bind_keys(self):
         self.screen.listen()
+        self.screen.onkey(self.quit_game, "q")
+        self.screen.onkey(self.toggle_profiler, "F3")
+        if self.replay is not None:
+            # Gameplay input comes from the replay log
+            return
+
         # Difficulty selection
-        self.screen.onkey(lambda: self.start_game("Easy"), "1")
-        self.screen.onkey(lambda: self.start_game("Normal"), "2")
-        self.screen.onkey(lambda: self.start_game("Hard"), "3")
+        self.screen.onkey(lambda: self._command(CMD_EASY), "1")
+        self.screen.onkey(lambda: self._command(CMD_NORMAL), "2")
+        self.screen.onkey(lambda: self._command(CMD_HARD), "3")
 
         # Movement
-        self.screen.onkeypress(lambda: self.player and self.player.on_left_press(), "Left")
-        self.screen.onkeypress(lambda: self.player and self.player.on_right_press(), "Right")
+        self.screen.onkeypress(lambda: self._press(IN_LEFT), "Left")
+        self.screen.onkeypress(lambda: self._press(IN_RIGHT), "Right")
         try:
-            self.screen.onkeyrelease(lambda: self.player and self.player.on_left_release(), "Left")
-            self.screen.onkeyrelease(lambda: self.player and self.player.on_right_release(), "Right")
+            self.screen.onkeyrelease(lambda: self._release(IN_LEFT), "Left")
+            self.screen.onkeyrelease(lambda: self._release(IN_RIGHT), "Right")
         except Exception:
             pass
 
-        # Shooting (multi-bullets with cooldown on player)
-        self.screen.onkeypress(self._player_fire, "space")
+        # Shooting (held fire, cooldown on player); a tap still fires once
+        self.screen.onkeypress(lambda: self._press(IN_FIRE, IN_FIRE_TAP), "space")
+        try:
+            self.screen.onkeyrelease(lambda: self._release(IN_FIRE), "space")
+        except Exception:
+            pass
 
-        # Restart / Quit
-        self.screen.onkey(self.restart_to_menu, "r")
-        self.screen.onkey(self.quit_game, "q")
+        # Restart
+        self.screen.onkey(lambda: self._command(CMD_RESTART), "r")
 
-    def _player_fire(self):
-        if self.state not in ("playing", "boss") or not self.player:
-            return
-        self.player.try_fire(self.spawn_bullet)
+    def _press(self, bit: int, latch: int = 0):
+        self._held |= bit
+        self._pending |= latch
+
+    def _release(self, bit: int):
+        self._held &= ~bit
+
+    def _command(self, command: int):
+        self._pending = (self._pending & ~(0x7 << CMD_SHIFT)) | (command << CMD_SHIFT)
+
+    def next_input(self) -> Optional[int]:
+        # Input byte for the next tick; None once a replay has run out
+        if self._replay_inputs is not None:
+            return next(self._replay_inputs, None)
+        bits = self._held | self._pending
+        self._pending = 0
+        return bits
 
     # ---------------------- UI / HUD ----------------------
+    def build_menu_text(self):
+        # Every text screen is created once as hidden canvas items and then
+        # only shown/hidden or updated when its value changes
+        self.menu_text = TextGroup(self.screen, [
+            (0, 140, "SPACE INVADERS", self.TITLE_FONT),
+            (0, 90, "Enhanced MVP", ("Arial", 18, "normal")),
+            (0, 30, "Select Difficulty:", ("Arial", 16, "normal")),
+            (0, 0, "1) Easy   2) Normal   3) Hard", ("Arial", 16, "normal")),
+            (0, -60, "Controls: Left/Right to move, Space to shoot", ("Arial", 12, "normal")),
+            (0, -90, "R: menu (after game)   Q: quit", ("Arial", 12, "normal")),
+        ], visible=self.sim.state == "menu")
+
+    def build_text(self):
+        big = self.TITLE_FONT
+        self.victory_text = TextGroup(self.screen, [
+            (0, 60, "VICTORY!", big),
+            (0, 10, "You defeated the boss.", ("Arial", 16, "normal")),
+            (0, -40, "Press R to return to main menu.", ("Arial", 14, "normal")),
+        ])
+        self.victory_text[0].set_color("#66ff66")
+        self.game_over_text = TextGroup(self.screen, [
+            (0, 60, "GAME OVER", big),
+            (0, 10, "", ("Arial", 14, "normal")),
+            (0, -40, "Press R to return to main menu.", ("Arial", 14, "normal")),
+        ])
+        self.game_over_text[0].set_color("#ff6666")
+        self.hud_text = TextItem(self.screen, self.BORDER_LEFT + 10, self.BORDER_TOP + 10, visible=False)
+        self._hud_key = None
+        bar_width = 280
+        self.health_bars = [
+            HealthBar(self.screen, -bar_width // 2, self.BORDER_TOP - 10 - i * 24, bar_width, 14, label)
+            for i, label in enumerate(["Boss A HP", "Boss B HP"])
+        ]
+        self.overlay_text = TextLines(self.screen, self.BORDER_RIGHT - 250, self.BORDER_TOP - 10, 13)
+
     def show_menu(self):
-        self.menu_pen.clear()
-        self.menu_pen.goto(0, 140)
-        self.menu_pen.write("SPACE INVADERS", align="center", font=("Arial", 32, "bold"))
-        self.menu_pen.goto(0, 90)
-        self.menu_pen.write("Enhanced MVP", align="center", font=("Arial", 18, "normal"))
-        self.menu_pen.goto(0, 30)
-        self.menu_pen.write("Select Difficulty:", align="center", font=("Arial", 16, "normal"))
-        self.menu_pen.goto(0, 0)
-        self.menu_pen.write("1) Easy   2) Normal   3) Hard", align="center", font=("Arial", 16, "normal"))
-        self.menu_pen.goto(0, -60)
-        self.menu_pen.write("Controls: Left/Right to move, Space to shoot", align="center", font=("Arial", 12, "normal"))
-        self.menu_pen.goto(0, -90)
-        self.menu_pen.write("R: menu (after game)   Q: quit", align="center", font=("Arial", 12, "normal"))
+        self.victory_text.hide()
+        self.game_over_text.hide()
+        self.menu_text.show()
 
     def update_hud(self):
-        self.hud_pen.clear()
-        if self.state in ("playing", "boss"):
-            self.hud_pen.goto(self.BORDER_LEFT + 10, self.BORDER_TOP + 10)
-            text = f"Level {self.level} | Difficulty: {self.difficulty}"
-            self.hud_pen.write(text, font=("Arial", 12, "normal"))
+        sim = self.sim
+        in_play = sim.state in ("playing", "boss")
+        key = (in_play, sim.level, sim.difficulty)
+        if key == self._hud_key:
+            return
+        self._hud_key = key
+        if in_play:
+            text = f"Level {sim.level} | Difficulty: {sim.difficulty}"
+            if self.netplay is not None:
+                text += f" | You: P{self.netplay.local_index + 1}"
+            self.hud_text.set_text(text)
+        self.hud_text.set_visible(in_play)
 
     def draw_boss_health(self):
-        self.health_pen.clear()
-        if self.state == "boss" and self.bosses:
-            bar_width = 280
-            bar_height = 14
-            y_top = self.BORDER_TOP - 10
-            labels = ["Boss A HP", "Boss B HP"]
-            for i, boss in enumerate(self.bosses[:2]):
-                x = -bar_width // 2
-                y = y_top - i * 24
-                # Outline
-                self.health_pen.goto(x, y)
-                self.health_pen.pendown()
-                self.health_pen.pencolor("white")
-                self.health_pen.fillcolor("black")
-                self.health_pen.begin_fill()
-                for _ in range(2):
-                    self.health_pen.forward(bar_width)
-                    self.health_pen.right(90)
-                    self.health_pen.forward(bar_height)
-                    self.health_pen.right(90)
-                self.health_pen.end_fill()
-                self.health_pen.penup()
-
-                # Fill
-                ratio = max(0.0, min(1.0, boss.hp / boss.hp_max))
-                fill_w = int(bar_width * ratio)
-                self.health_pen.goto(x, y)
-                self.health_pen.pendown()
-                self.health_pen.fillcolor("red")
-                self.health_pen.begin_fill()
-                for _ in range(2):
-                    self.health_pen.forward(fill_w)
-                    self.health_pen.right(90)
-                    self.health_pen.forward(bar_height)
-                    self.health_pen.right(90)
-                self.health_pen.end_fill()
-                self.health_pen.penup()
-
-                # Label
-                self.health_pen.goto(0, y - 22)
-                self.health_pen.write(labels[i], align="center", font=("Arial", 10, "normal"))
+        # Bars only touch the canvas when a boss's hp changes
+        bosses = self.sim.bosses if self.sim.state == "boss" else []
+        for i, bar in enumerate(self.health_bars):
+            if i < len(bosses):
+                bar.set_value(bosses[i].hp, bosses[i].hp_max)
+                bar.show()
+            else:
+                bar.hide()
 
     # ---------------------- Game Flow ----------------------
-    def start_game(self, difficulty: str):
-        if self.state != "menu":
+    def sync_screens(self):
+        # Redraw menu / end screens when the simulation changes state
+        state = self.sim.state
+        if state == self._shown_state:
             return
-        self.difficulty = difficulty
-        self.diff_mult = self.DIFFICULTY_SPEED[difficulty]
-        self.menu_pen.clear()
-        self.level = 1
-        self.setup_player()
-        self.spawn_level_enemies(self.level)
-        self.state = "playing"
-        self.update_hud()
-
-    def setup_player(self):
-        self.bullets.clear()
-        self.player = Player(self.sprites.player, 0, self.BORDER_BOTTOM + 40)
-
-    def restart_to_menu(self):
-        if self.state in ("gameover", "victory"):
-            self.cleanup_all()
-            self.state = "menu"
+        self._shown_state = state
+        if state == "menu":
             self.show_menu()
-            self.update_hud()
+        elif state == "playing":
+            self.menu_text.hide()
+        elif state == "victory":
+            self.show_victory()
+        elif state == "gameover":
+            self.show_game_over(self.sim.end_reason)
 
     def quit_game(self):
+        self.shutdown()
         try:
             turtle.bye()
         except Exception:
             pass
 
-    def cleanup_all(self):
-        # Clear enemies
-        for e in self.enemies:
-            e.hide()
-        self.enemies.clear()
-        # Clear bullets
-        for b in self.bullets:
-            b.deactivate()
-        self.bullets.clear()
-        # Clear enemy bullets
-        for eb in self.enemy_bullets:
-            eb.deactivate()
-        self.enemy_bullets.clear()
-        # Clear player
-        if self.player:
-            try:
-                self.player.t.hideturtle()
-            except Exception:
-                pass
-            self.player = None
-        # Clear boss
-        if self.boss:
-            self.boss.t.hideturtle()
-            self.boss = None
-        if self.bosses:
-            for b in self.bosses:
-                try:
-                    b.t.hideturtle()
-                except Exception:
-                    pass
-            self.bosses.clear()
-        # Clear pens
-        self.health_pen.clear()
-
-    # ---------------------- Spawning ----------------------
-    def spawn_level_enemies(self, level: int):
-        # do not cleanup player or pens here; just enemies and bullets
-        for e in self.enemies:
-            e.hide()
-        self.enemies.clear()
-        for b in self.bullets:
-            b.deactivate()
-        self.bullets.clear()
-        for eb in self.enemy_bullets:
-            eb.deactivate()
-        self.enemy_bullets.clear()
-
-        cfg = self.LEVEL_CONFIG.get(level, self.LEVEL_CONFIG[3])
-        rows, cols = cfg["rows"], cfg["cols"]
-        spacing_x = 60
-        spacing_y = 45
-        total_width = (cols - 1) * spacing_x
-        start_x = -total_width / 2
-        start_y = self.BORDER_TOP - 100
-
-        for r in range(rows):
-            for c in range(cols):
-                enemy = Enemy(self.sprites.enemy_frames)
-                x = start_x + c * spacing_x
-                y = start_y - r * spacing_y
-                enemy.setpos(x, y)
-                self.enemies.append(enemy)
-
-        base = 1.8 + (level - 1) * 0.6
-        self.enemy_dx = base * self.diff_mult
-
-    def spawn_boss(self):
-        # Clear remaining enemies and bullets
-        for e in self.enemies:
-            e.hide()
-        self.enemies.clear()
-        for b in self.bullets:
-            b.deactivate()
-        self.bullets.clear()
-        for eb in self.enemy_bullets:
-            eb.deactivate()
-        self.enemy_bullets.clear()
-
-        # Two giant turtles moving in opposite directions
-        left = Boss("turtle", dx=-3.0, hp=15, size=3.5)
-        right = Boss("turtle", dx=3.0, hp=15, size=3.5)
-        left.setpos(-140, self.BORDER_TOP - 120)
-        right.setpos(140, self.BORDER_TOP - 120)
-        self.bosses = [left, right]
-        self.draw_boss_health()
-
-    def spawn_bullet(self, x: float, y: float):
-        bullet = Bullet(self.sprites.bullet, speed=12.0)
-        bullet.fire_from(x, y)
-        self.bullets.append(bullet)
-
-    def spawn_enemy_bullet(self, x: float, y: float, speed: float = 6.0):
-        eb = EnemyBullet(self.sprites.bullet, speed=speed, color="#ff6666")
-        eb.fire_from(x, y)
-        self.enemy_bullets.append(eb)
-
     # ---------------------- Update Loop ----------------------
     def schedule_next_frame(self):
-        self.screen.ontimer(self.update, 16)
+        # Wake up when the next simulation step is due (immediately if behind)
+        delay = (self.dt - self._accumulator) / self.time_scale * 1000
+        self.screen.ontimer(self.update, max(0, int(delay)))
 
     def update(self):
-        self.tick += 1
-        if self.state == "menu":
-            pass
-        elif self.state == "playing":
-            self.update_player()
-            self.update_bullets()
-            self.update_enemy_bullets()
-            self.update_enemies()
-            self.check_level_progression()
-        elif self.state == "boss":
-            self.update_player()
-            self.update_bullets()
-            self.update_enemy_bullets()
-            self.update_bosses()
-        elif self.state in ("victory", "gameover"):
-            pass
-
-        self.update_hud()
-        if self.state == "boss":
+        now = time.perf_counter()
+        self._accumulator += (now - self._last_frame_time) * self.time_scale
+        self._last_frame_time = now
+        prof = self.profiler
+
+        dt = self.dt
+        max_steps = self.MAX_STEPS_PER_FRAME * max(1, int(self.time_scale))
+        steps = 0
+        netplay = self.netplay
+        stalled = False
+        while self._accumulator >= dt and steps < max_steps:
+            if netplay is not None:
+                bits = netplay.advance(self.next_input)
+                if bits is None:
+                    stalled = True  # waiting for the other player's input
+                    break
+            else:
+                bits = self.next_input()
+                if bits is None:
+                    self.finish_replay()
+                    return
+            self.sim.apply_input(bits)
+            if self.recorder:
+                self.recorder.record(bits)
+            self.sim.step(dt)
+            if netplay is not None:
+                netplay.record_hash(self.sim.tick, self.sim.state_hash())
+            self._accumulator -= dt
+            steps += 1
+        if netplay is not None:
+            self.check_netplay()
+        if prof and steps:
+            prof.mark("sim", now)
+        behind = self._accumulator >= dt and not stalled
+        if behind:
+            # Hit the catch-up cap: drop the backlog so an overloaded host
+            # slows the game down instead of spiralling
+            self._accumulator = 0.0
+        elif stalled:
+            # Keep the time owed (up to one catch-up burst) so the ticks run
+            # as soon as the input arrives
+            self._accumulator = min(self._accumulator, max_steps * dt)
+
+        if steps:
+            self._frames_since_render += 1
+            if self._frames_since_render < self._render_every:
+                pass  # governor: only every Nth frame is drawn
+            elif not behind or self._skipped_renders >= self.MAX_SKIPPED_RENDERS:
+                self.render()
+                self._skipped_renders = 0
+                self._frames_since_render = 0
+            else:
+                self._skipped_renders += 1
+            if self.governor.record(time.perf_counter() - now):
+                self.apply_quality()
+        if prof and steps:
+            prof.mark("frame", now)
+            prof.frames += 1
+            if prof.frames % self.OVERLAY_REFRESH_FRAMES == 0:
+                self.sample_counts()
+                if self.show_overlay:
+                    self.draw_overlay()
+        if stalled:
+            self.screen.ontimer(self.update, self.NETPLAY_RETRY_MS)
+        else:
+            self.schedule_next_frame()
+
+    def render(self):
+        prof = self.profiler
+        t = prof.now() if prof else 0.0
+        self.renderer.sync()
+        if prof:
+            t = prof.mark("renderer.sync", t)
+        self.sync_screens()
+
+        # The governor may throttle HUD text and health bars to a few Hz
+        now = time.perf_counter()
+        if now >= self._next_hud_time:
+            self._next_hud_time = now + self._hud_interval
+            self.update_hud()
+            if prof:
+                t = prof.mark("update_hud", t)
             self.draw_boss_health()
+            if prof:
+                t = prof.mark("draw_boss_health", t)
 
         self.screen.update()
-        self.schedule_next_frame()
-
-    # ---------------------- Updates ----------------------
-    def update_player(self):
-        if self.player:
-            self.player.update(self.BORDER_LEFT, self.BORDER_RIGHT)
-
-    def update_bullets(self):
-        if not self.bullets:
-            return
-        top = self.BORDER_TOP
-        # Update movement
-        for b in list(self.bullets):
-            b.update()
-            if b.offscreen(top):
-                b.deactivate()
-                self.bullets.remove(b)
-                continue
-            # Collisions
-            if self.state == "playing":
-                hit_enemy = None
-                for e in self.enemies:
-                    if e.is_visible() and b.distance(e.t) < 20:
-                        hit_enemy = e
-                        break
-                if hit_enemy:
-                    hit_enemy.hide()
-                    if b in self.bullets:
-                        b.deactivate()
-                        self.bullets.remove(b)
-            elif self.state == "boss" and self.bosses:
-                hit = False
-                for boss in list(self.bosses):
-                    if b.distance(boss.t) < 48:
-                        boss.hp -= 1
-                        hit = True
-                        if boss.hp <= 0:
-                            boss.t.hideturtle()
-                            self.bosses.remove(boss)
-                        break
-                if hit:
-                    b.deactivate()
-                    if b in self.bullets:
-                        self.bullets.remove(b)
-                if not self.bosses:
-                    self.state = "victory"
-                    self.show_victory()
-
-    def update_enemy_bullets(self):
-        if not self.enemy_bullets:
-            return
-        bottom = self.BORDER_BOTTOM
-        for eb in list(self.enemy_bullets):
-            eb.update()
-            if eb.offscreen(bottom):
-                eb.deactivate()
-                self.enemy_bullets.remove(eb)
-                continue
-            # Collision with player
-            if self.player and eb.distance(self.player.t) < 18:
-                self.state = "gameover"
-                self.show_game_over("Hit by enemy fire")
-                return
-
-    def update_enemies(self):
-        if not self.enemies:
-            return
-        # Animate
-        for e in self.enemies:
-            if e.is_visible():
-                e.animate(self.tick, period=16)
-
-        # Move as a fleet
-        next_hit_border = False
-        for e in self.enemies:
-            if not e.is_visible():
-                continue
-            nx = e.xcor() + self.enemy_dx
-            if nx < self.BORDER_LEFT or nx > self.BORDER_RIGHT:
-                next_hit_border = True
-                break
-
-        if next_hit_border:
-            self.enemy_dx *= -1
-            for e in self.enemies:
-                if e.is_visible():
-                    e.sety(e.ycor() - self.enemy_drop)
-                    if e.ycor() < self.BORDER_BOTTOM + 60:
-                        self.state = "gameover"
-                        self.show_game_over("Enemies reached the bottom")
-                        return
-
-        for e in self.enemies:
-            if e.is_visible():
-                e.setx(e.xcor() + self.enemy_dx)
-
-        # Fire: every few ticks, one random enemy shoots
-        if self.tick % 28 == 0:
-            shooters = [e for e in self.enemies if e.is_visible()]
-            if shooters:
-                shooter = random.choice(shooters)
-                self.spawn_enemy_bullet(shooter.xcor(), shooter.ycor() - 12, speed=6.0)
-
-    def check_level_progression(self):
-        # Clear out dead enemies from list
-        self.enemies = [e for e in self.enemies if e.is_visible()]
-        if not self.enemies and self.state == "playing":
-            if self.level < 3:
-                self.level += 1
-                self.spawn_level_enemies(self.level)
-            else:
-                self.state = "boss"
-                self.spawn_boss()
-
-    def update_bosses(self):
-        if not self.bosses:
-            return
-        # Move and check
-        for boss in list(self.bosses):
-            if boss.update(self.BORDER_LEFT, self.BORDER_RIGHT, self.BORDER_BOTTOM):
-                self.state = "gameover"
-                self.show_game_over("Boss reached the player line")
-                return
-            if self.player and self.player.t.distance(boss.t) < 35:
-                self.state = "gameover"
-                self.show_game_over("Boss collided with player")
-                return
-        # Boss firing: slower cadence, fires in pairs
-        if self.tick % self.boss_fire_period == 0:
-            for boss in self.bosses:
-                y = boss.ycor() - 28
-                x = boss.xcor()
-                self.spawn_enemy_bullet(x - 14, y, speed=8.0)
-                self.spawn_enemy_bullet(x + 14, y, speed=8.0)
+        if prof:
+            prof.mark("screen.update", t)
+
+    # ---------------------- Quality ----------------------
+    def apply_quality(self):
+        # Push the governor's current tier into the simulation and loop
+        tier = self.governor.tier
+        sim = self.sim
+        sim.enemy_anim_period = sim.ENEMY_ANIM_PERIOD * tier["anim_scale"]
+        sim.enemy_bullet_limit = tier["enemy_bullet_cap"] if self.governor.gameplay else None
+        self._hud_interval = 1.0 / tier["hud_hz"] if tier["hud_hz"] else 0.0
+        self._next_hud_time = 0.0  # refresh once right away
+        self._render_every = tier["render_every"]
+        self.profiler.count("quality_tier", self.governor.level)
+        self.profiler.count("quality_changes", len(self.governor.changes))
+
+    # ---------------------- Instrumentation ----------------------
+    def toggle_profiler(self):
+        self.show_overlay = not self.show_overlay
+        self.profiler.enabled = self.show_overlay or bool(self.stats_path)
+        if not self.show_overlay and self.renderer is not None:
+            self.overlay_text.hide()
+
+    def sample_counts(self):
+        sim = self.sim
+        prof = self.profiler
+        prof.count("bullets", len(sim.bullets))
+        prof.count("enemy_bullets", len(sim.enemy_bullets))
+        prof.count("enemies", sim.fleet.alive_count)
+        prof.count("bosses", len(sim.bosses))
+        prof.count("turtles", len(self.screen.turtles()))
+        prof.count("canvas_items", len(self.screen.getcanvas().find_all()))
+
+    def draw_overlay(self):
+        lines = self.profiler.report_lines() + self.governor.report_lines()
+        if self.netplay is not None:
+            lines += self.netplay.report_lines()
+        self.overlay_text.set_lines(lines)
+
+    def dump_stats(self):
+        if self.stats_path:
+            self.profiler.dump(self.stats_path)
+
+    # ---------------------- Record / Replay ----------------------
+    def finish_replay(self):
+        # Draw the final state, report the checksum and stop the loop
+        self.render()
+        checksum = self.sim.state_hash()
+        expected = self.replay.expected_checksum
+        verdict = "match" if checksum == expected else "MISMATCH" if expected else "n/a"
+        print(f"replay finished at tick {self.sim.tick}: checksum {checksum} ({verdict})")
+
+    # ---------------------- Netplay ----------------------
+    def check_netplay(self):
+        # A desync or a silent peer ends the lockstep game for good
+        session = self.netplay
+        if session.desync:
+            tick, local, peer = session.desync
+            print(f"netplay desync at tick {tick}: state hash {local:016x}, peer {peer:016x}")
+            self.end_netplay(f"Desync at tick {tick}")
+        elif session.peer_lost:
+            self.end_netplay("Lost contact with the other player")
+
+    def end_netplay(self, reason: str):
+        self.netplay.close()
+        self.netplay = None
+        self.sim.game_over(reason)
+
+    def shutdown(self):
+        if self.netplay:
+            self.netplay.close()
+            self.netplay = None
+        if self.recorder:
+            self.recorder.close(self.sim)
+            self.recorder = None
+        self.dump_stats()
 
     # ---------------------- End States ----------------------
     def show_victory(self):
-        self.menu_pen.clear()
-        self.menu_pen.goto(0, 60)
-        self.menu_pen.color("#66ff66")
-        self.menu_pen.write("VICTORY!", align="center", font=("Arial", 32, "bold"))
-        self.menu_pen.color("white")
-        self.menu_pen.goto(0, 10)
-        self.menu_pen.write("You defeated the boss.", align="center", font=("Arial", 16, "normal"))
-        self.menu_pen.goto(0, -40)
-        self.menu_pen.write("Press R to return to main menu.", align="center", font=("Arial", 14, "normal"))
+        self.menu_text.hide()
+        self.victory_text.show()
 
     def show_game_over(self, reason: str = ""):
-        self.menu_pen.clear()
-        self.menu_pen.goto(0, 60)
-        self.menu_pen.color("#ff6666")
-        self.menu_pen.write("GAME OVER", align="center", font=("Arial", 32, "bold"))
-        self.menu_pen.color("white")
-        self.menu_pen.goto(0, 10)
-        self.menu_pen.write(reason, align="center", font=("Arial", 14, "normal"))
-        self.menu_pen.goto(0, -40)
-        self.menu_pen.write("Press R to return to main menu.", align="center", font=("Arial", 14, "normal"))
+        self.menu_text.hide()
+        self.game_over_text[1].set_text(reason)
+        self.game_over_text.show()
 
     # ---------------------- Entrypoint ----------------------
     def run(self):
-        turtle.done()
+        try:
+            turtle.done()
+        finally:
+            self.shutdown()
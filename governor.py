@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Tuple
+
+from profiler import RingBuffer, percentile
+
+
+class QualityGovernor:
+    """Steps render quality down when frames run long, and back up with headroom.
+
+    ``record`` takes each frame's work time (simulation plus drawing).
+    Every ``WINDOW`` frames the window's p90 is compared with the frame
+    budget (one simulation step): over budget drops one tier at once;
+    under ``HEADROOM`` of the budget for ``RECOVER_WINDOWS`` windows in a
+    row climbs one tier. The asymmetry keeps it from flapping at the edge.
+
+    Each tier in ``TIERS`` sets:
+      - ``anim_scale``: enemy animation period multiplier
+      - ``hud_hz``: HUD/health-bar refresh rate, None for every frame
+      - ``enemy_bullet_cap``: most enemy bullets in flight, None for the
+        pool size (gameplay-affecting, so only applied when ``gameplay``)
+      - ``render_every``: draw every Nth frame
+    """
+
+    TIERS: Tuple[Dict, ...] = (
+        {"name": "high", "anim_scale": 1, "hud_hz": None, "enemy_bullet_cap": None, "render_every": 1},
+        {"name": "medium", "anim_scale": 2, "hud_hz": 4, "enemy_bullet_cap": None, "render_every": 1},
+        {"name": "low", "anim_scale": 4, "hud_hz": 4, "enemy_bullet_cap": 24, "render_every": 1},
+        {"name": "minimal", "anim_scale": 4, "hud_hz": 2, "enemy_bullet_cap": 16, "render_every": 2},
+    )
+    WINDOW = 30  # frames per decision
+    HEADROOM = 0.6  # fraction of the budget a window must stay under to step up
+    RECOVER_WINDOWS = 3
+
+    def __init__(self, budget: float, fixed: Optional[str] = None, gameplay: bool = True):
+        self.budget = budget  # seconds
+        self.adaptive = fixed is None
+        self.gameplay = gameplay
+        self.level = 0 if fixed is None else self.tier_index(fixed)
+        self.frames = 0
+        self.changes: List[Tuple[int, str, float]] = []  # (frame, new tier, window p90 ms)
+        self._window = RingBuffer(self.WINDOW)
+        self._calm_windows = 0
+
+    @classmethod
+    def tier_index(cls, name: str) -> int:
+        for i, tier in enumerate(cls.TIERS):
+            if tier["name"] == name:
+                return i
+        raise ValueError(f"Unknown quality tier {name!r}")
+
+    @property
+    def tier(self) -> Dict:
+        return self.TIERS[self.level]
+
+    def record(self, seconds: float) -> bool:
+        # Add one frame's work time; True when the tier changed
+        self.frames += 1
+        if not self.adaptive:
+            return False
+        window = self._window
+        window.append(seconds)
+        if self.frames % self.WINDOW:
+            return False
+        p90 = percentile(sorted(window.values()), 90)
+        level = self.level
+        if p90 > self.budget:
+            self._calm_windows = 0
+            level = min(level + 1, len(self.TIERS) - 1)
+        elif p90 < self.budget * self.HEADROOM:
+            self._calm_windows += 1
+            if self._calm_windows >= self.RECOVER_WINDOWS:
+                self._calm_windows = 0
+                level = max(level - 1, 0)
+        else:
+            self._calm_windows = 0
+        if level == self.level:
+            return False
+        self.level = level
+        self.changes.append((self.frames, self.tier["name"], p90 * 1000))
+        return True
+
+    def report_lines(self) -> List[str]:
+        mode = "auto" if self.adaptive else "fixed"
+        lines = [f"quality: {self.tier['name']} ({mode}, {len(self.changes)} changes)"]
+        if self.changes:
+            frame, name, p90 = self.changes[-1]
+            lines.append(f"  -> {name} at frame {frame} (p90 {p90:.1f} ms)")
+        return lines
@@ -0,0 +1,160 @@
+from typing import List, Sequence, Tuple
+
+Font = Tuple[str, int, str]
+
+_ANCHORS = {"left": "sw", "center": "s", "right": "se"}
+
+
+class TextItem:
+    """A persistent canvas text item in turtle world coordinates.
+
+    Created once and kept on the canvas; ``set_text``/``set_color`` only
+    reconfigure the item when the value actually changes, and ``show``/
+    ``hide`` toggle the item's state instead of deleting and rewriting it
+    the way ``Turtle.clear()`` + ``write()`` does.
+    """
+
+    def __init__(self, screen, x: float, y: float, text: str = "", align: str = "left",
+                 font: Font = ("Arial", 12, "normal"), color: str = "white", visible: bool = True):
+        self.canvas = screen.getcanvas()
+        self._text = text
+        self._color = color
+        self._visible = visible
+        # Same placement turtle's write() uses: canvas y grows downward
+        self.item = self.canvas.create_text(
+            x * screen.xscale - 1, -y * screen.yscale,
+            text=text, anchor=_ANCHORS[align], fill=color, font=font,
+            state="normal" if visible else "hidden",
+        )
+
+    def set_text(self, text: str):
+        if text != self._text:
+            self._text = text
+            self.canvas.itemconfigure(self.item, text=text)
+
+    def set_color(self, color: str):
+        if color != self._color:
+            self._color = color
+            self.canvas.itemconfigure(self.item, fill=color)
+
+    def show(self):
+        if not self._visible:
+            self._visible = True
+            self.canvas.itemconfigure(self.item, state="normal")
+
+    def hide(self):
+        if self._visible:
+            self._visible = False
+            self.canvas.itemconfigure(self.item, state="hidden")
+
+    def set_visible(self, visible: bool):
+        if visible:
+            self.show()
+        else:
+            self.hide()
+
+
+class TextGroup:
+    """Several text items shown and hidden together (one screen of text)."""
+
+    def __init__(self, screen, lines: Sequence[Tuple[float, float, str, Font]],
+                 align: str = "center", color: str = "white", visible: bool = False):
+        self.items: List[TextItem] = [
+            TextItem(screen, x, y, text, align=align, font=font, color=color, visible=visible)
+            for x, y, text, font in lines
+        ]
+
+    def __getitem__(self, index: int) -> TextItem:
+        return self.items[index]
+
+    def show(self):
+        for item in self.items:
+            item.show()
+
+    def hide(self):
+        for item in self.items:
+            item.hide()
+
+
+class TextLines:
+    """A growable column of text lines, e.g. the profiler overlay.
+
+    Lines keep their canvas items between refreshes; only lines whose text
+    changed are reconfigured.
+    """
+
+    def __init__(self, screen, x: float, y: float, line_height: float,
+                 font: Font = ("Courier", 9, "normal"), color: str = "#aaaaaa"):
+        self.screen = screen
+        self.x = x
+        self.y = y
+        self.line_height = line_height
+        self.font = font
+        self.color = color
+        self.items: List[TextItem] = []
+
+    def set_lines(self, lines: Sequence[str]):
+        while len(self.items) < len(lines):
+            y = self.y - len(self.items) * self.line_height
+            self.items.append(TextItem(self.screen, self.x, y, font=self.font, color=self.color))
+        for item, text in zip(self.items, lines):
+            item.set_text(text)
+            item.show()
+        for item in self.items[len(lines):]:
+            item.hide()
+
+    def hide(self):
+        for item in self.items:
+            item.hide()
+
+
+class HealthBar:
+    """Boss health bar made of two persistent canvas rectangles and a label.
+
+    The outline and label never change; the red fill is resized with a
+    single ``coords`` call, and only when the hp value actually changes.
+    """
+
+    def __init__(self, screen, x: float, y: float, width: float, height: float, label: str,
+                 fill: str = "red", outline: str = "white", visible: bool = False):
+        self.canvas = screen.getcanvas()
+        self.xscale = screen.xscale
+        self.yscale = screen.yscale
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self._value = None
+        self._visible = visible
+        state = "normal" if visible else "hidden"
+        x0, y0, x1, y1 = self._canvas_rect(width)
+        self.frame_item = self.canvas.create_rectangle(x0, y0, x1, y1, outline=outline, fill="black", state=state)
+        self.fill_item = self.canvas.create_rectangle(x0, y0, x1, y1, outline=outline, fill=fill, state=state)
+        self.label = TextItem(screen, 0, y - 22, label, align="center", font=("Arial", 10, "normal"), visible=visible)
+
+    def _canvas_rect(self, width: float) -> Tuple[float, float, float, float]:
+        # Turtle world (y up) to canvas (y down), top-left at (x, y)
+        return (self.x * self.xscale, -self.y * self.yscale,
+                (self.x + width) * self.xscale, -(self.y - self.height) * self.yscale)
+
+    def set_value(self, hp: int, hp_max: int):
+        value = (hp, hp_max)
+        if value == self._value:
+            return
+        self._value = value
+        ratio = max(0.0, min(1.0, hp / hp_max)) if hp_max else 0.0
+        self.canvas.coords(self.fill_item, *self._canvas_rect(int(self.width * ratio)))
+
+    def show(self):
+        if not self._visible:
+            self._visible = True
+            self.canvas.itemconfigure(self.frame_item, state="normal")
+            self.canvas.itemconfigure(self.fill_item, state="normal")
+            self.label.show()
+
+    def hide(self):
+        if self._visible:
+            self._visible = False
+            self.canvas.itemconfigure(self.frame_item, state="hidden")
+            self.canvas.itemconfigure(self.fill_item, state="hidden")
+            self.label.hide()
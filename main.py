@@ -1,11 +1,142 @@
-from game import Game
+import time
+
+_START = time.perf_counter()  # startup report baseline, before any heavy import
+
+import argparse  # noqa: E402
+
+
+def _fleet_size(text: str):
+    try:
+        rows, cols = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, got {text!r}") from None
+    if rows < 1 or cols < 1:
+        raise argparse.ArgumentTypeError("fleet rows and columns must be positive")
+    return rows, cols
+
+
+def _address(text: str):
+    host, _, port = text.rpartition(":")
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT, got {text!r}")
+    return host, int(port)
+
+
+def _input_delay(text: str):
+    from netplay import LockstepSession
+
+    try:
+        delay = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number of ticks, got {text!r}") from None
+    max_delay = LockstepSession.BUFFER_TICKS // 2 - 2
+    if not 0 <= delay <= max_delay:
+        raise argparse.ArgumentTypeError(f"input delay must be 0..{max_delay} ticks, got {delay}")
+    return delay
+
+
+def _milliseconds(text: str):
+    try:
+        ms = float(text)
+    except ValueError:
+        ms = -1.0
+    if not 0 <= ms < float("inf"):
+        raise argparse.ArgumentTypeError(f"expected a non-negative number of ms, got {text!r}")
+    return ms
+
+
+def _loss(text: str):
+    # 1.0 would drop every datagram, so the session could never start
+    try:
+        loss = float(text)
+    except ValueError:
+        loss = -1.0
+    if not 0 <= loss < 1:
+        raise argparse.ArgumentTypeError(f"loss must be a fraction from 0 up to 1, got {text!r}")
+    return loss
+
+
+def _connect(args):
+    # Blocks until the other player is there; returns the lockstep session
+    import random
+    from netplay import DelayedTransport, UdpTransport, host, join
+
+    if args.host is not None:
+        transport = UdpTransport(("0.0.0.0", args.host))
+    else:
+        transport = UdpTransport(peer=args.join)
+    if args.net_latency or args.net_jitter or args.net_loss:
+        transport = DelayedTransport(transport, args.net_latency / 1000, args.net_jitter / 1000, args.net_loss)
+    if args.host is not None:
+        print(f"Waiting for player 2 on UDP port {args.host}...")
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 31)
+        return host(transport, seed, args.input_delay)
+    print(f"Joining {args.join[0]}:{args.join[1]}...")
+    return join(transport)
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description="Space Invaders (turtle)")
+    parser.add_argument("--profile", action="store_true",
+                        help="show the frame-time overlay from the start (F3 toggles it)")
+    parser.add_argument("--stats", metavar="PATH",
+                        help="write frame-time stats as JSON to PATH on exit")
+    parser.add_argument("--seed", type=int, help="random seed (default: random)")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record per-tick input to PATH for replay.py")
+    parser.add_argument("--renderer", choices=("turtle", "canvas"), default="turtle",
+                        help="draw entities as turtles or as tagged canvas items")
+    parser.add_argument("--mode", choices=("classic", "endless", "stress"), default="classic",
+                        help="classic 3 levels + boss, endless generated levels, or the stress preset")
+    parser.add_argument("--max-fleet", metavar="ROWSxCOLS", type=_fleet_size,
+                        help="largest generated fleet in endless/stress mode (e.g. 20x40)")
+    parser.add_argument("--quality", choices=("auto", "high", "medium", "low", "minimal"), default="auto",
+                        help="render quality tier; auto steps down when frames run long")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print startup milestones (import, screen, menu, ready)")
+    net = parser.add_mutually_exclusive_group()
+    net.add_argument("--host", type=int, metavar="PORT",
+                     help="host a two-player lockstep co-op game on UDP PORT (you are player 1)")
+    net.add_argument("--join", type=_address, metavar="HOST:PORT",
+                     help="join a two-player game hosted at HOST:PORT (you are player 2)")
+    parser.add_argument("--input-delay", type=_input_delay, metavar="TICKS",
+                        help="lockstep input delay, host only (default 3 ticks, 50 ms)")
+    parser.add_argument("--net-latency", type=_milliseconds, default=0.0, metavar="MS",
+                        help="simulated extra one-way latency for testing netplay")
+    parser.add_argument("--net-jitter", type=_milliseconds, default=0.0, metavar="MS",
+                        help="simulated latency jitter, +/- MS")
+    parser.add_argument("--net-loss", type=_loss, default=0.0, metavar="FRACTION",
+                        help="simulated fraction of datagrams dropped")
+    args = parser.parse_args()
+    if args.max_fleet and args.mode == "classic":
+        parser.error("--max-fleet needs --mode endless or --mode stress")
+    netplay_game = args.host is not None or args.join is not None
+    if netplay_game and (args.mode != "classic" or args.max_fleet):
+        parser.error("two-player games are co-op classic; --mode and --max-fleet don't apply")
+    if args.input_delay is not None and args.host is None:
+        parser.error("--input-delay is set by the host (--host)")
+
+    from endless import simulation_class
+    from profiler import StartupReport
+
+    startup = StartupReport(_START, echo=args.startup_report)
+    # Imported after argument parsing so --help never loads turtle/tkinter
+    from game import Game
+
+    startup.mark("import")
+    netplay = None
+    if netplay_game:
+        try:
+            netplay = _connect(args)
+        except (OSError, TimeoutError) as e:
+            print(f"netplay: {e}")
+            raise SystemExit(1)
+    game = Game(profile=args.profile, stats_path=args.stats, seed=args.seed, record_path=args.record,
+                renderer=args.renderer, startup=startup,
+                sim_class=simulation_class(args.mode, args.max_fleet), quality=args.quality,
+                netplay=netplay)
     game.run()
 
 
 if __name__ == "__main__":
     main()
-
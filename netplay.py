@@ -0,0 +1,489 @@
+"""Deterministic lockstep netplay for two-player co-op.
+
+Both peers run the same ``CoopSimulation`` from the same seed and only
+exchange per-tick input bytes. A peer steps tick ``t`` once it holds both
+players' inputs for ``t``; its own input for ``t`` was sampled
+``input_delay`` ticks earlier, which hides up to that much one-way
+latency. Every packet repeats the local inputs the peer hasn't
+acknowledged, so a lost or reordered datagram is covered by the next one.
+Each packet also carries the state hash of the sender's latest tick; a
+hash that differs from the local one for the same tick is a desync::
+
+    python main.py --host 7777                  # player 1
+    python main.py --join 192.168.1.5:7777      # player 2
+
+Run ``python netplay.py`` for a headless check: two sessions over an
+in-process loopback with simulated latency, jitter and loss.
+"""
+import argparse
+import heapq
+import random
+import socket
+import struct
+import time
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+from coop import CoopSimulation, PLAYER_MASK, combine_inputs
+from sim import CMD_NORMAL, CMD_RESTART, CMD_SHIFT, IN_FIRE, IN_FIRE_TAP, IN_LEFT, IN_RIGHT
+
+MAGIC = b"TINP"
+PROTOCOL_VERSION = 1
+KIND_HELLO = 1  # guest -> host, until welcomed
+KIND_WELCOME = 2  # host -> guest: seed and input delay
+KIND_INPUTS = 3
+
+_HEADER = struct.Struct("!4sBB")  # magic, version, kind
+_WELCOME = struct.Struct("!qB")  # seed, input delay
+_INPUTS = struct.Struct("!iiQiH")  # ack, hash tick, hash, first input tick, input count
+
+
+def _packet(kind: int, body: bytes = b"") -> bytes:
+    return _HEADER.pack(MAGIC, PROTOCOL_VERSION, kind) + body
+
+
+def _kind(data: bytes) -> int:
+    # Packet kind, or 0 for anything that isn't ours
+    if len(data) < _HEADER.size:
+        return 0
+    magic, version, kind = _HEADER.unpack_from(data)
+    return kind if magic == MAGIC and version == PROTOCOL_VERSION else 0
+
+
+# ---------------------- Transports ----------------------
+class UdpTransport:
+    """Non-blocking UDP socket talking to one peer.
+
+    Without ``peer`` (the host) the first address a datagram arrives from
+    becomes the peer; datagrams from anywhere else are ignored.
+    """
+
+    MAX_DATAGRAM = 2048
+
+    def __init__(self, bind: Tuple[str, int] = ("0.0.0.0", 0), peer: Optional[Tuple[str, int]] = None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind)
+        self.sock.setblocking(False)
+        # Resolved, so it compares equal to recvfrom's addresses
+        self.peer = (socket.gethostbyname(peer[0]), peer[1]) if peer else None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self.sock.getsockname()
+
+    def send(self, data: bytes):
+        if self.peer is None:
+            return
+        try:
+            self.sock.sendto(data, self.peer)
+        except OSError:
+            pass  # e.g. port unreachable while the peer starts up; resent anyway
+
+    def receive(self) -> List[bytes]:
+        packets = []
+        while True:
+            try:
+                data, address = self.sock.recvfrom(self.MAX_DATAGRAM)
+            except BlockingIOError:
+                return packets
+            except OSError:
+                continue  # an earlier send's ICMP error, reported here on some platforms
+            if self.peer is None:
+                self.peer = address
+            if address == self.peer:
+                packets.append(data)
+
+    def close(self):
+        self.sock.close()
+
+
+class LoopbackTransport:
+    """In-process transport; ``pair()`` returns two connected ends."""
+
+    def __init__(self):
+        self.inbox: Deque[bytes] = deque()
+        self.peer: Optional["LoopbackTransport"] = None
+
+    @classmethod
+    def pair(cls) -> Tuple["LoopbackTransport", "LoopbackTransport"]:
+        a, b = cls(), cls()
+        a.peer, b.peer = b, a
+        return a, b
+
+    def send(self, data: bytes):
+        self.peer.inbox.append(data)
+
+    def receive(self) -> List[bytes]:
+        packets = list(self.inbox)
+        self.inbox.clear()
+        return packets
+
+    def close(self):
+        pass
+
+
+class DelayedTransport:
+    """Wraps a transport to simulate a network: latency, jitter and loss.
+
+    Each outgoing datagram is held for ``latency`` +/- ``jitter`` seconds
+    (one way) and a ``loss`` fraction is dropped. Jitter reorders
+    datagrams like a real network can. Held datagrams go out on the next
+    ``send`` or ``receive`` after they are due.
+    """
+
+    def __init__(self, inner, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+                 seed: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.inner = inner
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self._held: List[Tuple[float, int, bytes]] = []  # heap of (due, order, datagram)
+        self._order = 0
+
+    def send(self, data: bytes):
+        if self.loss and self.rng.random() < self.loss:
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        heapq.heappush(self._held, (self.clock() + delay, self._order, data))
+        self._order += 1
+        self.flush()
+
+    def flush(self):
+        now = self.clock()
+        held = self._held
+        while held and held[0][0] <= now:
+            self.inner.send(heapq.heappop(held)[2])
+
+    def receive(self) -> List[bytes]:
+        self.flush()
+        return self.inner.receive()
+
+    def close(self):
+        self.inner.close()
+
+
+# ---------------------- Session ----------------------
+class LockstepSession:
+    """One peer's side of a two-player lockstep game.
+
+    Per tick: ``add_local_input`` when ``wants_input``, then
+    ``next_input`` returns the ``combine_inputs`` word for ``tick`` or
+    None while the peer's input is still missing (stall and try again
+    later), then ``record_hash`` once the tick is stepped. ``advance``
+    does everything but the hash and sends the packets.
+
+    Inputs sit in a ring of ``BUFFER_TICKS`` entries per player indexed
+    by tick, so a peer can't run more than the buffer ahead; inputs
+    outside the window are dropped and arrive again in a later packet.
+    The first ``input_delay`` ticks are empty input for both players.
+    """
+
+    INPUT_DELAY = 3  # ticks; 50 ms at 60 Hz
+    BUFFER_TICKS = 64
+    PEER_TIMEOUT = 5.0  # seconds without a packet before the peer counts as gone
+    RESEND_INTERVAL = 1 / 60  # seconds between packets while stalled
+
+    def __init__(self, transport, local_index: int, seed: int, input_delay: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        delay = self.INPUT_DELAY if input_delay is None else input_delay
+        max_delay = self.BUFFER_TICKS // 2 - 2
+        if local_index not in (0, 1):
+            raise ValueError(f"local_index must be 0 or 1, not {local_index!r}")
+        if not 0 <= delay <= max_delay:
+            raise ValueError(f"Input delay must be 0..{max_delay} ticks, not {delay}")
+        self.transport = transport
+        self.local_index = local_index
+        self.remote_index = 1 - local_index
+        self.seed = seed
+        self.input_delay = delay
+        self.clock = clock
+        self.tick = 0  # next tick to simulate
+
+        size = self.BUFFER_TICKS
+        self._input_ticks = [[-1] * size, [-1] * size]  # tick held in each ring entry
+        self._inputs = [[0] * size, [0] * size]
+        for player in (0, 1):
+            for t in range(delay):
+                self._store(player, t, 0)
+        self._local_next = delay  # next tick a local input is sampled for
+        self._remote_next = delay  # first tick whose remote input is missing
+        self._peer_ack = delay - 1  # last local input tick the peer confirmed
+
+        self._hash_ticks = [-1] * size
+        self._hashes = [0] * size
+        self._peer_hash_ticks = [-1] * size
+        self._peer_hashes = [0] * size
+        self._last_hash = (-1, 0)
+        self.desync: Optional[Tuple[int, int, int]] = None  # (tick, local hash, peer hash)
+
+        # The host answers repeated HELLOs in case its first WELCOME was lost
+        self._welcome = _packet(KIND_WELCOME, _WELCOME.pack(seed, delay)) if local_index == 0 else None
+        self._last_heard = clock()
+        self._last_sent = float("-inf")
+        self._stalled_tick = -1
+        self.stalls = 0  # ticks that had to wait for the peer's input
+        self.packets_sent = 0
+        self.packets_received = 0
+
+    def _store(self, player: int, tick: int, bits: int):
+        i = tick % self.BUFFER_TICKS
+        self._input_ticks[player][i] = tick
+        self._inputs[player][i] = bits
+
+    # ---------------------- Inputs ----------------------
+    def wants_input(self) -> bool:
+        # True once per tick: the local input for tick + input_delay is due
+        return self._local_next <= self.tick + self.input_delay
+
+    def add_local_input(self, bits: int):
+        self._store(self.local_index, self._local_next, bits & PLAYER_MASK)
+        self._local_next += 1
+
+    def next_input(self) -> Optional[int]:
+        t = self.tick
+        i = t % self.BUFFER_TICKS
+        ticks = self._input_ticks
+        if ticks[0][i] != t or ticks[1][i] != t:
+            if self._stalled_tick != t:
+                self._stalled_tick = t
+                self.stalls += 1
+            return None
+        self.tick += 1
+        return combine_inputs(self._inputs[0][i], self._inputs[1][i])
+
+    def advance(self, sample: Callable[[], int]) -> Optional[int]:
+        # One attempt at the next tick; ``sample`` is only called when a
+        # local input is due, so latched presses are never dropped. Retries
+        # while stalled send at most every RESEND_INTERVAL.
+        fresh = self.wants_input()
+        if fresh:
+            self.add_local_input(sample())
+        self.poll()
+        bits = self.next_input()
+        if fresh or self.clock() - self._last_sent >= self.RESEND_INTERVAL:
+            self.send()
+        return bits
+
+    # ---------------------- Hashes ----------------------
+    def record_hash(self, tick: int, digest: str):
+        # ``digest`` is Simulation.state_hash() after stepping ``tick`` ticks
+        value = int(digest, 16)
+        i = tick % self.BUFFER_TICKS
+        self._hash_ticks[i] = tick
+        self._hashes[i] = value
+        self._last_hash = (tick, value)
+        if self._peer_hash_ticks[i] == tick:
+            self._compare(tick, value, self._peer_hashes[i])
+
+    def _compare(self, tick: int, local: int, peer: int):
+        if local != peer and self.desync is None:
+            self.desync = (tick, local, peer)
+
+    # ---------------------- Network ----------------------
+    @property
+    def peer_lost(self) -> bool:
+        return self.clock() - self._last_heard > self.PEER_TIMEOUT
+
+    def send(self):
+        size = self.BUFFER_TICKS
+        start = max(self._peer_ack + 1, self._local_next - size)
+        ring = self._inputs[self.local_index]
+        payload = bytes(ring[t % size] for t in range(start, self._local_next))
+        hash_tick, value = self._last_hash
+        body = _INPUTS.pack(self._remote_next - 1, hash_tick, value, start, len(payload))
+        self.transport.send(_packet(KIND_INPUTS, body + payload))
+        self._last_sent = self.clock()
+        self.packets_sent += 1
+
+    def poll(self):
+        for data in self.transport.receive():
+            self.handle(data)
+
+    def handle(self, data: bytes):
+        kind = _kind(data)
+        if kind:
+            # Any packet of ours shows the peer is there, HELLOs included:
+            # the host's session exists long before the guest joins
+            self._last_heard = self.clock()
+        if kind == KIND_HELLO and self._welcome is not None:
+            self.transport.send(self._welcome)
+        if kind != KIND_INPUTS or len(data) < _HEADER.size + _INPUTS.size:
+            return
+        self.packets_received += 1
+        ack, hash_tick, value, start, count = _INPUTS.unpack_from(data, _HEADER.size)
+        self._peer_ack = max(self._peer_ack, ack)
+
+        remote = self.remote_index
+        payload = data[_HEADER.size + _INPUTS.size:_HEADER.size + _INPUTS.size + count]
+        lo = self._remote_next
+        hi = self.tick + self.BUFFER_TICKS  # never overwrite entries not yet stepped
+        for offset, bits in enumerate(payload):
+            t = start + offset
+            if lo <= t < hi:
+                self._store(remote, t, bits)
+        ticks, size = self._input_ticks[remote], self.BUFFER_TICKS
+        while ticks[self._remote_next % size] == self._remote_next:
+            self._remote_next += 1
+
+        if hash_tick >= 0:
+            i = hash_tick % size
+            self._peer_hash_ticks[i] = hash_tick
+            self._peer_hashes[i] = value
+            if self._hash_ticks[i] == hash_tick:
+                self._compare(hash_tick, self._hashes[i], value)
+
+    def report_lines(self) -> List[str]:
+        lines = [
+            f"netplay: P{self.local_index + 1}  tick {self.tick}  delay {self.input_delay}",
+            f"  stalls {self.stalls}  sent {self.packets_sent}  received {self.packets_received}",
+        ]
+        if self.desync:
+            lines.append(f"  DESYNC at tick {self.desync[0]}")
+        return lines
+
+    def close(self):
+        self.transport.close()
+
+
+# ---------------------- Handshake ----------------------
+HELLO_INTERVAL = 0.1  # seconds between a guest's HELLOs
+
+
+def host(transport, seed: int, input_delay: Optional[int] = None, timeout: float = 60.0,
+         clock: Callable[[], float] = time.monotonic) -> LockstepSession:
+    """Wait for a guest's HELLO and welcome it; returns player 1's session."""
+    session = LockstepSession(transport, 0, seed, input_delay, clock=clock)
+    deadline = clock() + timeout
+    while clock() < deadline:
+        for data in transport.receive():
+            if _kind(data) == KIND_HELLO:
+                session.handle(data)  # welcomes the guest and starts the peer timeout
+                return session
+        time.sleep(0.01)
+    raise TimeoutError(f"No player joined within {timeout:.0f} s")
+
+
+def join(transport, timeout: float = 60.0, clock: Callable[[], float] = time.monotonic) -> LockstepSession:
+    """Say HELLO until the host welcomes us; returns player 2's session."""
+    deadline = clock() + timeout
+    next_hello = float("-inf")
+    while clock() < deadline:
+        if clock() >= next_hello:
+            transport.send(_packet(KIND_HELLO))
+            next_hello = clock() + HELLO_INTERVAL
+        packets = transport.receive()
+        for n, data in enumerate(packets):
+            if _kind(data) == KIND_WELCOME and len(data) >= _HEADER.size + _WELCOME.size:
+                seed, delay = _WELCOME.unpack_from(data, _HEADER.size)
+                session = LockstepSession(transport, 1, seed, delay, clock=clock)
+                for later in packets[n + 1:]:
+                    session.handle(later)
+                return session
+        time.sleep(0.01)
+    raise TimeoutError(f"No answer from the host within {timeout:.0f} s")
+
+
+# ---------------------- Loopback check ----------------------
+def _bot_input(sim: CoopSimulation, rng: random.Random, held: List[int], index: int) -> int:
+    # Random held buttons, changed now and then, plus the menu commands
+    if rng.random() < 0.05:
+        held[index] = rng.choice((0, IN_LEFT, IN_RIGHT)) | (IN_FIRE if rng.random() < 0.7 else 0)
+    bits = held[index] | (IN_FIRE_TAP if rng.random() < 0.02 else 0)
+    if sim.state == "menu":
+        bits |= CMD_NORMAL << CMD_SHIFT
+    elif sim.state in ("gameover", "victory"):
+        bits |= CMD_RESTART << CMD_SHIFT
+    return bits
+
+
+def run_loopback(ticks: int, input_delay: int = LockstepSession.INPUT_DELAY, latency: float = 0.04,
+                 jitter: float = 0.015, loss: float = 0.05, seed: int = 1, desync_at: Optional[int] = None,
+                 ) -> Tuple[List[LockstepSession], List[CoopSimulation], float]:
+    """Play two bot peers for ``ticks`` ticks over a simulated network.
+
+    Runs on virtual time, as fast as the CPU allows, and stops early on a
+    desync or when the peers stop making progress. ``desync_at`` nudges
+    player 2's simulation at that tick. Returns both sessions, both
+    simulations and the virtual seconds taken.
+    """
+    now = [0.0]
+    clock = lambda: now[0]  # noqa: E731
+    ends = LoopbackTransport.pair()
+    sessions = [
+        LockstepSession(DelayedTransport(ends[i], latency, jitter, loss, seed=seed + i, clock=clock),
+                        i, seed, input_delay, clock=clock)
+        for i in (0, 1)
+    ]
+    sims = [CoopSimulation(seed=seed) for _ in (0, 1)]
+    rngs = [random.Random(seed * 2 + i) for i in (0, 1)]
+    held = [[0, 0], [0, 0]]
+    dt = sims[0].DT
+    due = [0.0, dt / 2]  # the peers' frame clocks are out of phase
+    while min(sim.tick for sim in sims) < ticks and not any(s.desync for s in sessions):
+        now[0] += dt / 8
+        for i, (session, sim) in enumerate(zip(sessions, sims)):
+            if now[0] < due[i]:
+                continue
+            if sim.tick >= ticks:
+                # Done, but keep answering so the other peer can finish
+                session.poll()
+                session.send()
+                due[i] += dt
+                continue
+            bits = session.advance(lambda: _bot_input(sim, rngs[i], held[i], i))
+            if bits is None:
+                continue  # stalled: retry on the next pass, like Game's frame loop
+            due[i] += dt
+            sim.apply_input(bits)
+            sim.step()
+            if sim.tick == desync_at and i == 1:
+                sim.player2.x += 0.5
+            session.record_hash(sim.tick, sim.state_hash())
+        if now[0] > ticks * dt * 20:
+            break  # gave up
+    return sessions, sims, now[0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Two lockstep peers over a simulated network, headless")
+    parser.add_argument("--ticks", type=int, default=3600, help="ticks each peer plays (default 3600)")
+    parser.add_argument("--delay", type=int, default=LockstepSession.INPUT_DELAY, help="input delay in ticks")
+    parser.add_argument("--latency", type=float, default=40.0, help="one-way latency in ms (default 40)")
+    parser.add_argument("--jitter", type=float, default=15.0, help="latency jitter in ms, +/- (default 15)")
+    parser.add_argument("--loss", type=float, default=0.05, help="fraction of datagrams dropped (default 0.05)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--desync-at", type=int, metavar="TICK",
+                        help="nudge player 2's simulation at TICK to check desync detection")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    sessions, sims, virtual = run_loopback(args.ticks, args.delay, args.latency / 1000, args.jitter / 1000,
+                                           args.loss, args.seed, args.desync_at)
+    elapsed = time.perf_counter() - started
+    desyncs = [s.desync for s in sessions if s.desync]
+    if not desyncs and min(sim.tick for sim in sims) < args.ticks:
+        print("gave up: the peers stopped making progress")
+        return 1
+
+    dt = sims[0].DT
+    print(f"{args.ticks} ticks per peer, delay {args.delay} ticks, latency {args.latency:.0f} "
+          f"+/- {args.jitter:.0f} ms, loss {args.loss:.0%}: {virtual:.1f} s virtual "
+          f"({virtual / (args.ticks * dt):.2f}x real time), {elapsed:.2f} s wall")
+    for i, (session, sim) in enumerate(zip(sessions, sims)):
+        print(f"  P{i + 1}: tick {sim.tick}, stalls {session.stalls}, packets {session.packets_sent} sent "
+              f"/ {session.packets_received} received, state {sim.state}, hash {sim.state_hash()}")
+    if desyncs:
+        tick, local, peer = desyncs[0]
+        print(f"DESYNC detected at tick {tick}: {local:016x} != {peer:016x}")
+        return 0 if args.desync_at is not None else 1
+    if args.desync_at is not None:
+        print("injected desync was NOT detected")
+        return 1
+    print("in sync" if sims[0].state_hash() == sims[1].state_hash() else "MISMATCH at the end")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,21 +1,38 @@
-import time
-import turtle
+import math
 from typing import Callable
 
 
 class Player:
-    def __init__(self, shape_name: str, start_x: float, start_y: float, speed: float = 6.0):
-        self.t = turtle.Turtle()
-        self.t.shape(shape_name)
-        self.t.color("cyan")
-        self.t.penup()
-        self.t.setheading(90)
-        self.t.goto(start_x, start_y)
-        self.speed = speed
+    """Player ship state: position, held inputs and fire cooldown.
+
+    Pure data; the renderer draws it from ``x``/``y``.
+    """
+
+    __slots__ = ("x", "y", "speed", "moving_left", "moving_right", "firing",
+                 "fire_requested", "last_fire_time", "fire_cooldown", "alive")
+
+    def __init__(self, start_x: float, start_y: float, speed: float = 360.0):
+        self.x = start_x
+        self.y = start_y
+        self.speed = speed  # px per second
         self.moving_left = False
         self.moving_right = False
-        self.last_fire_time = 0.0
+        self.firing = False
+        self.fire_requested = False  # latched press, consumed on the next tick
+        self.last_fire_time = float("-inf")
         self.fire_cooldown = 0.18  # seconds
+        self.alive = True  # only two-player modes knock a player out
+
+    def reset(self, x: float, y: float):
+        # Reuse the same player for every game
+        self.x = x
+        self.y = y
+        self.moving_left = False
+        self.moving_right = False
+        self.firing = False
+        self.fire_requested = False
+        self.last_fire_time = float("-inf")
+        self.alive = True
 
     def on_left_press(self):
         self.moving_left = True
@@ -29,19 +46,27 @@ class Player:
     def on_right_release(self):
         self.moving_right = False
 
-    def update(self, left_bound: float, right_bound: float):
+    def on_fire_press(self):
+        self.firing = True
+        self.fire_requested = True
+
+    def on_fire_release(self):
+        self.firing = False
+
+    def update(self, left_bound: float, right_bound: float, dt: float):
         dx = 0
         if self.moving_left and not self.moving_right:
-            dx = -self.speed
+            dx = -self.speed * dt
         elif self.moving_right and not self.moving_left:
-            dx = self.speed
+            dx = self.speed * dt
         if dx != 0:
-            nx = max(left_bound + 15, min(right_bound - 15, self.t.xcor() + dx))
-            self.t.setx(nx)
+            self.x = max(left_bound + 15, min(right_bound - 15, self.x + dx))
 
-    def try_fire(self, spawn_bullet_fn: Callable[[float, float], None]):
-        now = time.perf_counter()
+    def distance(self, x: float, y: float) -> float:
+        return math.hypot(self.x - x, self.y - y)
+
+    def try_fire(self, now: float, spawn_bullet_fn: Callable[[float, float], None]):
+        # ``now`` is simulation time in seconds, so firing is independent of wall clock
         if now - self.last_fire_time >= self.fire_cooldown:
             self.last_fire_time = now
-            spawn_bullet_fn(self.t.xcor(), self.t.ycor() + 12)
-
+            spawn_bullet_fn(self.x, self.y + 12)
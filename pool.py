@@ -0,0 +1,118 @@
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+
+class BulletPool:
+    """Fixed-capacity pool of bullets stored column-wise.
+
+    A bullet is an integer id, ``0 .. capacity - 1``. Its state lives in
+    typed arrays indexed by that id, the way ``Fleet`` keeps its enemies:
+    ``xs`` and ``ys`` (position), ``prev_ys`` (y before the last move;
+    bullets fly straight, so x doesn't change), ``speeds`` (px per
+    second), ``serials`` (firing order) and ``alive`` (in flight). Nothing
+    is allocated per bullet, so a pool costs tens of bytes per slot and
+    the systems that move, hit-test and draw bullets are plain loops over
+    these arrays.
+
+    Ids in flight live in a dense list; ``slots`` maps each id to its
+    index there (``-1`` while free), which makes both ``fire`` and
+    ``release`` O(1) (release swaps the last id in flight into the freed
+    slot).
+
+    When every bullet is in flight the ``policy`` decides what happens:
+      - "drop": the new shot is refused and ``fire`` returns None
+      - "recycle": the oldest bullet in flight is reclaimed and reused
+    """
+
+    POLICIES = ("drop", "recycle")
+
+    def __init__(self, capacity: int, speed: float, policy: str = "drop"):
+        if capacity <= 0:
+            raise ValueError("BulletPool capacity must be positive")
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown pool policy {policy!r}; expected one of {self.POLICIES}")
+        self.capacity = capacity
+        self.speed = speed  # default for ``fire``
+        self.policy = policy
+        self.xs = array("d", bytes(8 * capacity))
+        self.ys = array("d", bytes(8 * capacity))
+        self.prev_ys = array("d", bytes(8 * capacity))
+        self.speeds = array("d", [speed]) * capacity
+        self.serials = array("q", bytes(8 * capacity))
+        self.alive = bytearray(capacity)
+        self.slots = array("i", [-1]) * capacity
+        self._free: List[int] = list(range(capacity))
+        self._active: List[int] = []
+        self._serial = 0
+
+    def acquire(self) -> Optional[int]:
+        if self._free:
+            i = self._free.pop()
+        elif self.policy == "recycle":
+            # Exhaustion is rare, so an O(active) scan for the oldest is fine
+            i = min(self._active, key=self.serials.__getitem__)
+            self.release(i)
+            self._free.pop()
+        else:
+            return None
+        self._serial += 1
+        self.serials[i] = self._serial
+        self.slots[i] = len(self._active)
+        self._active.append(i)
+        return i
+
+    def fire(self, x: float, y: float, speed: Optional[float] = None) -> Optional[int]:
+        # Launch a bullet from (x, y); returns its id, or None if refused
+        i = self.acquire()
+        if i is None:
+            return None
+        self.xs[i] = x
+        self.ys[i] = self.prev_ys[i] = y
+        self.speeds[i] = self.speed if speed is None else speed
+        self.alive[i] = 1
+        return i
+
+    def release(self, i: int):
+        slot = self.slots[i]
+        if slot < 0:
+            return
+        last = self._active.pop()
+        if last != i:
+            self._active[slot] = last
+            self.slots[last] = slot
+        self.slots[i] = -1
+        self.alive[i] = 0
+        self._free.append(i)
+
+    @property
+    def active(self) -> List[int]:
+        # Ids in flight, densely packed by slot; don't release while
+        # iterating this list (use ``iter(pool)`` for that)
+        return self._active
+
+    def snapshot(self) -> Tuple[array, array, bytearray]:
+        # Positions and in-flight flags by id, for the renderer
+        return self.xs, self.ys, self.alive
+
+    def clear(self):
+        for i in self._active:
+            self.slots[i] = -1
+            self.alive[i] = 0
+            self._free.append(i)
+        self._active.clear()
+
+    def __iter__(self) -> Iterator[int]:
+        # Walk backwards so the current bullet may be released mid-iteration:
+        # the swap only moves an already-visited bullet into its slot.
+        active = self._active
+        i = len(active) - 1
+        while i >= 0:
+            if i < len(active):
+                yield active[i]
+            i -= 1
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __bool__(self) -> bool:
+        return bool(self._active)
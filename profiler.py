@@ -0,0 +1,151 @@
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class RingBuffer:
+    """Fixed-size buffer of the most recent float samples."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data: List[float] = []
+        self._next = 0
+
+    def append(self, value: float):
+        if len(self._data) < self.capacity:
+            self._data.append(value)
+        else:
+            self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+
+    def values(self) -> List[float]:
+        return list(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class FrameProfiler:
+    """Rolling per-stage frame timings plus entity/canvas counters.
+
+    Stages are timed with explicit timestamps so nested callers (the game
+    loop around ``Simulation.step``) don't interfere::
+
+        t = prof.now()
+        do_work()
+        t = prof.mark("work", t)
+
+    Callers guard every call with ``if prof:`` -- a disabled profiler is
+    falsy, so instrumentation costs one truth test per stage when off.
+    """
+
+    def __init__(self, capacity: int = 600, enabled: bool = False):
+        self.capacity = capacity
+        self.enabled = enabled
+        self.timings: Dict[str, RingBuffer] = {}
+        self.counts: Dict[str, int] = {}
+        self.frames = 0
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    @staticmethod
+    def now() -> float:
+        return time.perf_counter()
+
+    def mark(self, stage: str, since: float) -> float:
+        # Record the time since ``since`` under ``stage``; returns the new timestamp
+        now = time.perf_counter()
+        self.record(stage, now - since)
+        return now
+
+    def record(self, stage: str, seconds: float):
+        buf = self.timings.get(stage)
+        if buf is None:
+            buf = self.timings[stage] = RingBuffer(self.capacity)
+        buf.append(seconds)
+
+    def count(self, name: str, value: int):
+        self.counts[name] = value
+
+    def reset(self):
+        self.timings.clear()
+        self.counts.clear()
+        self.frames = 0
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        # Per-stage p50/p95/p99/mean in milliseconds
+        out: Dict[str, Dict[str, float]] = {}
+        for stage, buf in self.timings.items():
+            values = sorted(buf.values())
+            if not values:
+                continue
+            out[stage] = {
+                "p50": percentile(values, 50) * 1000,
+                "p95": percentile(values, 95) * 1000,
+                "p99": percentile(values, 99) * 1000,
+                "mean": sum(values) / len(values) * 1000,
+                "samples": len(values),
+            }
+        return out
+
+    def report_lines(self) -> List[str]:
+        lines = ["stage            p50    p95    p99 ms"]
+        for stage, s in self.stats().items():
+            lines.append(f"{stage:<14} {s['p50']:6.2f} {s['p95']:6.2f} {s['p99']:6.2f}")
+        for name, value in self.counts.items():
+            lines.append(f"{name}: {value}")
+        return lines
+
+    def dump(self, path: Optional[str]):
+        if not path:
+            return
+        with open(path, "w") as f:
+            json.dump({"frames": self.frames, "timings_ms": self.stats(), "counts": self.counts}, f, indent=2)
+
+
+class StartupReport:
+    """Wall-clock milestones from process start to a playable game.
+
+    ``t0`` is taken as early as possible (top of main.py) so the first
+    milestone includes module imports. ``finish`` prints the report when
+    ``echo`` is set and checks one milestone against a target.
+    """
+
+    def __init__(self, t0: Optional[float] = None, echo: bool = False):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.echo = echo
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        self.marks.append((phase, time.perf_counter() - self.t0))
+
+    def elapsed_ms(self, phase: str) -> Optional[float]:
+        for name, seconds in self.marks:
+            if name == phase:
+                return seconds * 1000
+        return None
+
+    def report_lines(self, target_phase: Optional[str] = None, target_ms: Optional[float] = None) -> List[str]:
+        lines = ["startup          phase ms  total ms"]
+        last = 0.0
+        for phase, seconds in self.marks:
+            lines.append(f"{phase:<14} {(seconds - last) * 1000:9.1f} {seconds * 1000:9.1f}")
+            last = seconds
+        reached = self.elapsed_ms(target_phase) if target_phase else None
+        if reached is not None and target_ms is not None:
+            verdict = "ok" if reached <= target_ms else "OVER TARGET"
+            lines.append(f"{target_phase}: {reached:.1f} ms (target {target_ms:.0f} ms) {verdict}")
+        return lines
+
+    def finish(self, target_phase: Optional[str] = None, target_ms: Optional[float] = None):
+        if self.echo:
+            print("\n".join(self.report_lines(target_phase, target_ms)))
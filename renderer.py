@@ -0,0 +1,361 @@
+import math
+import turtle
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+from sprites import SpriteLoader
+from sim import Simulation
+
+
+class Renderer(ABC):
+    """Shared renderer plumbing: lazy sprite loading and shape refresh.
+
+    Sprite groups are decoded the first time the simulation needs them
+    (``SpriteLoader.ensure``); when that changes the loader's shapes,
+    ``apply_shapes`` re-skins the existing entity slots.
+    """
+
+    PLAYER_COLORS = ("cyan", "orange")  # by index in Simulation.players
+
+    def __init__(self, sim: Simulation, sprites: SpriteLoader):
+        self.sim = sim
+        self.sprites = sprites
+        self._sprite_generation = sprites.generation
+
+    def ensure_sprites(self):
+        sprites = self.sprites
+        state = self.sim.state
+        if state in ("playing", "boss"):
+            sprites.ensure("level")
+            if state == "boss":
+                sprites.ensure("boss")
+        if sprites.generation != self._sprite_generation:
+            self._sprite_generation = sprites.generation
+            self.apply_shapes()
+
+    def enemy_frame_shape(self) -> str:
+        # Shape for the fleet's current animation frame
+        return self.sprites.enemy_frames[self.sim.fleet.frame_index]
+
+    def boss_shape(self, boss) -> str:
+        # Image sprites ignore shapesize, so use the pre-scaled variant
+        return self.sprites.scaled("boss", boss.size) or "turtle"
+
+    @abstractmethod
+    def apply_shapes(self):
+        """Re-skin every entity slot after the loader's shapes changed."""
+
+    @abstractmethod
+    def sync(self):
+        """Draw the simulation's current state."""
+
+
+class TurtleRenderer(Renderer):
+    """Draws a Simulation with one turtle per entity slot.
+
+    Turtles are created once and index-aligned with the simulation's pools
+    (player, bullet pools, fleet, boss pair). ``sync`` copies positions and
+    visibility across once per frame and only touches a turtle when its
+    state actually changed.
+    """
+
+    def __init__(self, sim: Simulation, sprites: SpriteLoader):
+        super().__init__(sim, sprites)
+
+        self.player_ts = [
+            self._make_turtle(sprites.player, color, heading=90)
+            for _, color in zip(sim.players, self.PLAYER_COLORS)
+        ]
+        self.bullet_ts = [
+            self._make_turtle(sprites.bullet, "yellow", heading=90)
+            for _ in range(sim.bullets.capacity)
+        ]
+        self.enemy_bullet_ts = [
+            self._make_turtle(sprites.bullet, "#ff6666", heading=270)
+            for _ in range(sim.enemy_bullets.capacity)
+        ]
+        # The whole fleet shows one animation frame; _enemy_shape is the one drawn
+        self._enemy_shape = self.enemy_frame_shape()
+        self.enemy_ts = [
+            self._make_turtle(self._enemy_shape, "#66ff66", heading=270)
+            for _ in sim.fleet.enemies
+        ]
+        self.boss_ts = [
+            self._make_turtle(self.boss_shape(boss), "#ff5555", heading=270, size=boss.size)
+            for boss in sim.boss_pair
+        ]
+
+    def _make_turtle(self, shape_name: str, color: str, heading: float, size: float = 1.0) -> turtle.Turtle:
+        t = turtle.Turtle(visible=False)
+        t.shape(shape_name)
+        t.penup()
+        try:
+            t.color(color)
+        except Exception:
+            pass
+        try:
+            t.setheading(heading)
+        except Exception:
+            pass
+        if size != 1.0:
+            try:
+                t.shapesize(size, size)
+            except Exception:
+                pass
+        return t
+
+    def apply_shapes(self):
+        sprites = self.sprites
+        for t in self.player_ts:
+            t.shape(sprites.player)
+        for t in self.bullet_ts + self.enemy_bullet_ts:
+            t.shape(sprites.bullet)
+        self.set_enemy_shape(self.enemy_frame_shape())
+        for t, boss in zip(self.boss_ts, self.sim.boss_pair):
+            t.shape(self.boss_shape(boss))
+
+    def set_enemy_shape(self, shape_name: str):
+        for t in self.enemy_ts:
+            t.shape(shape_name)
+        self._enemy_shape = shape_name
+
+    @staticmethod
+    def _place(t: turtle.Turtle, visible: bool, x: float, y: float):
+        if visible:
+            if t.xcor() != x or t.ycor() != y:
+                t.goto(x, y)
+            if not t.isvisible():
+                t.showturtle()
+        elif t.isvisible():
+            t.hideturtle()
+
+    def sync(self):
+        self.ensure_sprites()
+        sim = self.sim
+        place = self._place
+        in_play = sim.state in ("playing", "boss")
+
+        for t, player in zip(self.player_ts, sim.players):
+            place(t, in_play and player.alive, player.x, player.y)
+
+        for ts, pool in ((self.bullet_ts, sim.bullets), (self.enemy_bullet_ts, sim.enemy_bullets)):
+            for t, x, y, alive in zip(ts, *pool.snapshot()):
+                place(t, alive, x, y)
+
+        shape = self.enemy_frame_shape()
+        if shape != self._enemy_shape:
+            self.set_enemy_shape(shape)
+        xs, ys, alive = sim.fleet.snapshot()
+        for i, t in enumerate(self.enemy_ts):
+            place(t, alive[i], xs[i], ys[i])
+
+        for t, boss in zip(self.boss_ts, sim.boss_pair):
+            place(t, boss.alive, boss.x, boss.y)
+
+
+class CanvasSprite:
+    """One raw canvas item drawn with a registered turtle shape.
+
+    Polygons get the same transform turtle applies (heading, shapesize,
+    1px outline in the turtle's color) and images are centred, so a sprite
+    looks like the turtle it replaces. ``x``/``y`` are the world position
+    the item was last drawn at; ``place`` only talks to Tk on a change.
+    """
+
+    __slots__ = ("renderer", "shape", "color", "heading", "size", "tags", "item", "x", "y", "visible")
+
+    def __init__(self, renderer: "CanvasRenderer", shape_name: str, color: str, heading: float,
+                 tags: Tuple[str, ...], size: float = 1.0):
+        self.renderer = renderer
+        self.color = color
+        self.heading = heading
+        self.size = size
+        self.tags = tags
+        self.x = 0.0
+        self.y = 0.0
+        self.visible = False
+        self.item = None
+        self.set_shape(shape_name)
+
+    def set_shape(self, shape_name: str):
+        # Recreates the item in place; canvas items can't change type
+        r = self.renderer
+        canvas = r.canvas
+        if self.item is not None:
+            canvas.delete(self.item)
+        self.shape = shape_name
+        shape = r.screen._shapes[shape_name]  # turtle's registry of Shape objects
+        state = "normal" if self.visible else "hidden"
+        cx, cy = self.x * r.xscale, -self.y * r.yscale
+        if shape._type == "image":
+            self.item = canvas.create_image(cx, cy, image=shape._data, tags=self.tags, state=state)
+        elif shape._type == "polygon":
+            coords = r.polygon_coords(shape._data, self.heading, self.size)
+            coords = [v + (cy if i % 2 else cx) for i, v in enumerate(coords)]
+            self.item = canvas.create_polygon(*coords, fill=self.color, outline=self.color,
+                                              width=1, tags=self.tags, state=state)
+        else:
+            raise ValueError(f"Canvas renderer can't draw {shape._type} shape {shape_name!r}")
+
+    def place(self, visible: bool, x: float, y: float):
+        canvas = self.renderer.canvas
+        if visible:
+            if x != self.x or y != self.y:
+                canvas.move(self.item, (x - self.x) * self.renderer.xscale, (self.y - y) * self.renderer.yscale)
+                self.x = x
+                self.y = y
+            if not self.visible:
+                self.visible = True
+                canvas.itemconfigure(self.item, state="normal")
+        elif self.visible:
+            self.visible = False
+            canvas.itemconfigure(self.item, state="hidden")
+
+
+class CanvasRenderer(Renderer):
+    """Draws a Simulation as raw Tk canvas items grouped under tags.
+
+    Same slots and visuals as ``TurtleRenderer``, but nothing is a turtle,
+    so ``screen.update()`` has no turtles to redraw. The fleet moves
+    rigidly: one ``canvas.move("enemy", dx, dy)`` per frame shifts every
+    enemy item, and individual enemies are only touched when they die or
+    the fleet is redeployed. Animation frames between two images swap with
+    one ``itemconfigure("enemy", image=...)``.
+    """
+
+    def __init__(self, sim: Simulation, sprites: SpriteLoader):
+        super().__init__(sim, sprites)
+        self.screen = turtle.Screen()
+        self.canvas = self.screen.getcanvas()
+        self.xscale = self.screen.xscale
+        self.yscale = self.screen.yscale
+
+        self.player_ss = [
+            CanvasSprite(self, sprites.player, color, 90, ("sprite", "player"))
+            for _, color in zip(sim.players, self.PLAYER_COLORS)
+        ]
+        self.bullet_ss = [
+            CanvasSprite(self, sprites.bullet, "yellow", 90, ("sprite", "bullet"))
+            for _ in range(sim.bullets.capacity)
+        ]
+        self.enemy_bullet_ss = [
+            CanvasSprite(self, sprites.bullet, "#ff6666", 270, ("sprite", "enemy_bullet"))
+            for _ in range(sim.enemy_bullets.capacity)
+        ]
+        self.enemy_ss = [
+            CanvasSprite(self, self.enemy_frame_shape(), "#66ff66", 270, ("sprite", "enemy"))
+            for _ in sim.fleet.enemies
+        ]
+        self.boss_ss = [
+            CanvasSprite(self, self.boss_shape(boss), "#ff5555", 270, ("sprite", "boss"), size=boss.size)
+            for boss in sim.boss_pair
+        ]
+
+        # Enemy sprites' x/y are stored relative to the fleet translation
+        # drawn since the last full sync; slot 0 (alive or not) tracks it
+        self._fleet_generation = -1
+        self._fleet_alive = 0
+        self._fleet_ref = (0.0, 0.0)
+        self._fleet_dx = 0.0
+        self._fleet_dy = 0.0
+
+    def polygon_coords(self, poly, heading: float, size: float) -> List[float]:
+        # Flat canvas coords of a shape polygon around the origin, as turtle's
+        # _getshapepoly/_polytrafo/_drawpoly would compute them
+        e0, e1 = math.cos(math.radians(heading)), math.sin(math.radians(heading))
+        e1 *= self.yscale / self.xscale
+        norm = math.hypot(e0, e1)
+        e0, e1 = e0 / norm, e1 / norm
+        coords: List[float] = []
+        for x, y in poly:
+            x, y = x * size, y * size
+            coords.append(e1 * x + e0 * y)
+            coords.append(-(-e0 * x + e1 * y))
+        return coords
+
+    def apply_shapes(self):
+        sprites = self.sprites
+        for s in self.player_ss:
+            s.set_shape(sprites.player)
+        for s in self.bullet_ss + self.enemy_bullet_ss:
+            s.set_shape(sprites.bullet)
+        self.set_enemy_shape(self.enemy_frame_shape())
+        for s, boss in zip(self.boss_ss, self.sim.boss_pair):
+            s.set_shape(self.boss_shape(boss))
+
+    def set_enemy_shape(self, shape_name: str):
+        sprites = self.enemy_ss
+        if not sprites or sprites[0].shape == shape_name:
+            return
+        shapes = self.screen._shapes
+        old, new = shapes[sprites[0].shape], shapes[shape_name]
+        if old._type == new._type == "image":
+            # Frame swap between images: one call re-skins every enemy item
+            self.canvas.itemconfigure("enemy", image=new._data)
+            for s in sprites:
+                s.shape = shape_name
+            return
+        # Different item types: recreate each at its drawn position, which
+        # includes the fleet offset
+        dx, dy = self._fleet_dx, self._fleet_dy
+        for s in sprites:
+            s.x += dx
+            s.y += dy
+            s.set_shape(shape_name)
+            s.x -= dx
+            s.y -= dy
+
+    def sync(self):
+        self.ensure_sprites()
+        sim = self.sim
+        in_play = sim.state in ("playing", "boss")
+
+        for s, player in zip(self.player_ss, sim.players):
+            s.place(in_play and player.alive, player.x, player.y)
+
+        for ss, pool in ((self.bullet_ss, sim.bullets), (self.enemy_bullet_ss, sim.enemy_bullets)):
+            for s, x, y, alive in zip(ss, *pool.snapshot()):
+                if alive or s.visible:
+                    s.place(alive, x, y)
+
+        self.sync_fleet()
+
+        for s, boss in zip(self.boss_ss, sim.boss_pair):
+            s.place(boss.alive, boss.x, boss.y)
+
+    def sync_fleet(self):
+        fleet = self.sim.fleet
+        xs, ys, alive = fleet.xs, fleet.ys, fleet.alive
+        sprites = self.enemy_ss
+        if fleet.generation != self._fleet_generation:
+            # Redeployed or cleared: place every slot individually
+            dx, dy = self._fleet_dx, self._fleet_dy
+            for i, s in enumerate(sprites):
+                s.x += dx
+                s.y += dy
+                s.place(bool(alive[i]), float(xs[i]), float(ys[i]))
+            self._fleet_generation = fleet.generation
+            self._fleet_alive = fleet.alive_count
+            self._fleet_ref = (float(xs[0]), float(ys[0]))
+            self._fleet_dx = self._fleet_dy = 0.0
+        else:
+            ref_x, ref_y = float(xs[0]), float(ys[0])
+            dx, dy = ref_x - self._fleet_ref[0], ref_y - self._fleet_ref[1]
+            if dx or dy:
+                self.canvas.move("enemy", dx * self.xscale, -dy * self.yscale)
+                self._fleet_ref = (ref_x, ref_y)
+                self._fleet_dx += dx
+                self._fleet_dy += dy
+            if fleet.alive_count != self._fleet_alive:
+                # Kills only: hide the newly dead without moving anything
+                for i, s in enumerate(sprites):
+                    if s.visible and not alive[i]:
+                        s.place(False, 0.0, 0.0)
+                self._fleet_alive = fleet.alive_count
+
+        # Animation: all enemies share a frame, so this is a no-op except on
+        # the ticks the fleet flips (set_enemy_shape returns early otherwise)
+        self.set_enemy_shape(self.enemy_frame_shape())
+
+
+RENDERERS = {"turtle": TurtleRenderer, "canvas": CanvasRenderer}
@@ -0,0 +1,177 @@
+"""Deterministic input recording and replay.
+
+A replay log is a text file:
+  - a JSON header line (format, version, seed, tick_rate, and the game
+    mode when it isn't classic)
+  - run-length encoded per-tick input bytes, ``<hex bits>:<ticks>`` pairs
+    separated by spaces/newlines
+  - a JSON trailer line with the tick count and final ``state_hash``
+
+Because the simulation is seeded and consumes input only at tick
+boundaries, re-running the inputs reproduces the session exactly.
+
+Usage:
+  python replay.py session.replay --headless   # max speed, verify checksum
+  python replay.py session.replay --speed 4    # rendered at 4x
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from endless import simulation_class
+from sim import Simulation
+
+REPLAY_FORMAT = "turtle-invaders-replay"
+# 2: enemies fire from the bottom of their column; 3: swept bullet collisions;
+# 4: sweeps include the fleet's and bosses' motion; 5: bullets are plain
+# floats in the checksum (they copied NumPy scalars from a NumPy fleet)
+REPLAY_VERSION = 5
+PAIRS_PER_LINE = 32
+
+
+class InputRecorder:
+    """Streams per-tick input bytes to a replay log, run-length encoded."""
+
+    def __init__(self, path: str, seed: int, tick_rate: int, mode_info: Optional[dict] = None):
+        self.path = path
+        self.ticks = 0
+        self._file = open(path, "w")
+        header = {"format": REPLAY_FORMAT, "version": REPLAY_VERSION, "seed": seed, "tick_rate": tick_rate}
+        if mode_info and mode_info.get("mode", "classic") != "classic":
+            header.update(mode_info)
+        self._file.write(json.dumps(header) + "\n")
+        self._bits: Optional[int] = None
+        self._run = 0
+        self._line: List[str] = []
+
+    def record(self, bits: int):
+        self.ticks += 1
+        if bits == self._bits:
+            self._run += 1
+            return
+        self._flush_run()
+        self._bits = bits
+        self._run = 1
+
+    def _flush_run(self):
+        if not self._run:
+            return
+        self._line.append(f"{self._bits:x}:{self._run}")
+        self._run = 0
+        if len(self._line) >= PAIRS_PER_LINE:
+            self._file.write(" ".join(self._line) + "\n")
+            self._line = []
+
+    def close(self, sim: Simulation):
+        if self._file is None:
+            return
+        self._flush_run()
+        if self._line:
+            self._file.write(" ".join(self._line) + "\n")
+        self._file.write(json.dumps({"ticks": self.ticks, "checksum": sim.state_hash()}) + "\n")
+        self._file.close()
+        self._file = None
+
+
+class Replay:
+    """A loaded replay log."""
+
+    def __init__(self, header: dict, runs: List[Tuple[int, int]], trailer: Optional[dict]):
+        self.header = header
+        self.runs = runs
+        self.trailer = trailer or {}
+
+    @property
+    def seed(self) -> int:
+        return self.header["seed"]
+
+    @property
+    def tick_rate(self) -> int:
+        return self.header["tick_rate"]
+
+    def simulation_class(self) -> type:
+        return simulation_class(self.header.get("mode", "classic"), self.header.get("max_fleet"))
+
+    @property
+    def expected_checksum(self) -> Optional[str]:
+        return self.trailer.get("checksum")
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        with open(path) as f:
+            lines = f.read().splitlines()
+        if not lines:
+            raise ValueError(f"{path}: empty replay file")
+        header = json.loads(lines[0])
+        if header.get("format") != REPLAY_FORMAT:
+            raise ValueError(f"{path}: not a replay log")
+        if header.get("version") != REPLAY_VERSION:
+            raise ValueError(f"{path}: unsupported replay version {header.get('version')}")
+        trailer = None
+        runs: List[Tuple[int, int]] = []
+        for line in lines[1:]:
+            if line.startswith("{"):
+                trailer = json.loads(line)
+                continue
+            for pair in line.split():
+                bits, count = pair.split(":")
+                runs.append((int(bits, 16), int(count)))
+        return cls(header, runs, trailer)
+
+    def inputs(self) -> Iterator[int]:
+        for bits, count in self.runs:
+            for _ in range(count):
+                yield bits
+
+    def __len__(self) -> int:
+        return sum(count for _, count in self.runs)
+
+
+def run_headless(replay: Replay) -> Simulation:
+    """Re-run a replay as fast as possible and return the final simulation."""
+    sim = replay.simulation_class()(seed=replay.seed)
+    dt = 1.0 / replay.tick_rate
+    apply_input = sim.apply_input
+    step = sim.step
+    for bits in replay.inputs():
+        apply_input(bits)
+        step(dt)
+    return sim
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded Space Invaders session")
+    parser.add_argument("path", help="replay log written by main.py --record")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window at maximum speed and verify the checksum")
+    parser.add_argument("--speed", type=int, default=1, choices=(1, 4, 16),
+                        help="playback speed when rendering")
+    args = parser.parse_args(argv)
+
+    replay = Replay.load(args.path)
+    if args.headless:
+        start = time.perf_counter()
+        sim = run_headless(replay)
+        elapsed = time.perf_counter() - start
+        checksum = sim.state_hash()
+        expected = replay.expected_checksum
+        print(f"ticks: {sim.tick}  mode: {sim.MODE}  state: {sim.state}  level: {sim.level}")
+        print(f"time: {elapsed:.3f}s ({sim.tick / max(elapsed, 1e-9):.0f} ticks/s)")
+        print(f"checksum: {checksum}  recorded: {expected or 'n/a'}")
+        if expected and checksum != expected:
+            print("MISMATCH: replay diverged from the recording", file=sys.stderr)
+            return 1
+        return 0
+
+    # Imported here so headless replays never load turtle/tkinter
+    from game import Game
+
+    game = Game(replay=replay, time_scale=args.speed)
+    game.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Zero-copy observation sharing with bot worker processes.
+
+The game (or an environment) process writes each frame's observation
+straight into a ``multiprocessing.shared_memory`` ring buffer. Workers
+attach by name and read the slots as NumPy views, so no per-frame state is
+pickled or copied across the process boundary::
+
+    # producer
+    pub = ObservationPublisher(sim, mode="grid")
+    ...
+    pub.publish()              # once per tick or frame
+
+    # consumer, in another process
+    ring = ObservationRing.attach(name)
+    seq, obs = ring.latest()   # view into shared memory
+    act(obs)
+    if not ring.valid(seq):    # overwritten while we were reading it
+        ...
+
+Two encodings:
+  - ``"flat"``: ``env.ObservationLayout``, a fixed float32 vector of the
+    player, fleet slots, bullets and bosses
+  - ``"grid"``: ``OccupancyGrid``, a downsampled uint8 (channel, row, col)
+    occupancy map of the playfield
+
+Requires numpy. Single producer, any number of consumers.
+"""
+import secrets
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Tuple
+
+from env import ObservationLayout
+from sim import Simulation
+
+np = None
+
+
+def _import_numpy():
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+
+
+def _open_block(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    # Untracked: the resource tracker would otherwise unlink the block when
+    # any process that opened it exits; the ring's owner unlinks it instead
+    try:
+        return shared_memory.SharedMemory(name, create, size, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name, create, size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class OccupancyGrid:
+    """Downsampled occupancy map of ``BORDER_LEFT..BORDER_RIGHT`` x ``BORDER_BOTTOM..BORDER_TOP``.
+
+    One ``rows`` x ``cols`` uint8 plane per entry of ``CHANNELS``; a cell
+    is 1 when an entity of that kind is inside it. Row 0 is the top of
+    the playfield. Bosses fill every cell their hit radius touches.
+    """
+
+    CHANNELS = ("player", "enemies", "bullets", "enemy_bullets", "bosses")  # plane order in write()
+    BOSS_RADIUS = 48  # matches Simulation's boss hit test
+    dtype = "uint8"
+
+    def __init__(self, sim: Simulation, cols: int = 40, rows: int = 30):
+        _import_numpy()
+        self.cols = cols
+        self.rows = rows
+        self.shape = (len(self.CHANNELS), rows, cols)
+        self.left = sim.BORDER_LEFT
+        self.top = sim.BORDER_TOP
+        self.sx = cols / (sim.BORDER_RIGHT - sim.BORDER_LEFT)
+        self.sy = rows / (sim.BORDER_TOP - sim.BORDER_BOTTOM)
+
+    def cells(self, xs, ys) -> Tuple["np.ndarray", "np.ndarray"]:
+        # Row and column indices of world positions, clamped to the grid
+        c = ((np.asarray(xs, dtype=np.float64) - self.left) * self.sx).astype(np.intp)
+        r = ((self.top - np.asarray(ys, dtype=np.float64)) * self.sy).astype(np.intp)
+        return np.clip(r, 0, self.rows - 1), np.clip(c, 0, self.cols - 1)
+
+    def write(self, sim: Simulation, out):
+        """Encode ``sim`` into ``out``, a uint8 array of ``shape``."""
+        out[...] = 0
+        # Point entities of every channel go through one vectorized scatter
+        fleet = sim.fleet
+        xs: list = []
+        ys: list = []
+        channels: list = []
+        if sim.state in ("playing", "boss"):
+            xs.append(sim.player.x)
+            ys.append(sim.player.y)
+            channels.append(0)
+        for channel, pool in ((2, sim.bullets), (3, sim.enemy_bullets)):
+            pool_xs, pool_ys = pool.xs, pool.ys
+            for b in pool.active:
+                xs.append(pool_xs[b])
+                ys.append(pool_ys[b])
+            channels += [channel] * len(pool)
+        if fleet.alive_count:
+            alive = np.asarray(fleet.alive, dtype=bool)
+            xs = np.concatenate((xs, np.asarray(fleet.xs)[alive]))
+            ys = np.concatenate((ys, np.asarray(fleet.ys)[alive]))
+            channels += [1] * fleet.alive_count
+        if channels:
+            rows, cols = self.cells(xs, ys)
+            out[channels, rows, cols] = 1
+        radius = self.BOSS_RADIUS
+        for boss in sim.bosses:
+            (r0, r1), (c0, c1) = self.cells((boss.x - radius, boss.x + radius),
+                                            (boss.y + radius, boss.y - radius))
+            out[4, r0:r1 + 1, c0:c1 + 1] = 1
+
+
+ENCODERS = {"flat": ObservationLayout, "grid": OccupancyGrid}
+
+
+class ObservationRing:
+    """Fixed-size ring of observations in one shared memory block.
+
+    Layout: an int64 header (``HEADER_FIELDS``), one int64 sequence stamp
+    per slot, then ``slots`` observations of ``shape``/``dtype``. Writes
+    go to slot ``seq % slots``; the slot's stamp is set to ``seq`` once
+    the data is in place, and the header's ``seq`` then points at the
+    newest frame. A reader checks ``valid(seq)`` after using a view: if
+    the stamp moved on, the producer lapped the reader mid-read. The
+    stamp is cleared before a slot is rewritten.
+    """
+
+    MAGIC = 0x4F4253524E47  # "OBSRNG"
+    VERSION = 1
+    HEADER_FIELDS = ("magic", "version", "slots", "ndim", "dtype", "seq", "dim0", "dim1", "dim2")
+    DTYPES = ("float32", "uint8")
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        _import_numpy()
+        self.shm = shm
+        self.owner = owner
+        fields = len(self.HEADER_FIELDS)
+        self.header = np.ndarray((fields,), dtype=np.int64, buffer=shm.buf)
+        h = dict(zip(self.HEADER_FIELDS, self.header.tolist()))
+        if h["magic"] != self.MAGIC or h["version"] != self.VERSION:
+            raise ValueError(f"Shared memory {shm.name!r} is not an observation ring")
+        self.slots = h["slots"]
+        self.shape = tuple(h[f"dim{i}"] for i in range(h["ndim"]))
+        self.dtype = np.dtype(self.DTYPES[h["dtype"]])
+        self._seq = self.HEADER_FIELDS.index("seq")
+        self.stamps = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=fields * 8)
+        self.data = np.ndarray((self.slots,) + self.shape, dtype=self.dtype, buffer=shm.buf,
+                               offset=(fields + self.slots) * 8)
+
+    @classmethod
+    def create(cls, shape: Tuple[int, ...], dtype: str, slots: int = 64,
+               name: Optional[str] = None) -> "ObservationRing":
+        _import_numpy()
+        if len(shape) > 3:
+            raise ValueError("Observations have at most 3 dimensions")
+        fields = len(cls.HEADER_FIELDS)
+        item = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        size = (fields + slots) * 8 + slots * item
+        shm = _open_block(name or "obs_" + secrets.token_hex(4), create=True, size=size)
+        header = np.ndarray((fields,), dtype=np.int64, buffer=shm.buf)
+        dims = tuple(shape) + (0,) * (3 - len(shape))
+        header[:] = (cls.MAGIC, cls.VERSION, slots, len(shape), cls.DTYPES.index(dtype), -1) + dims
+        stamps = np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=fields * 8)
+        stamps[:] = -1
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ObservationRing":
+        return cls(_open_block(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def seq(self) -> int:
+        # Sequence number of the newest complete frame, -1 before the first
+        return int(self.header[self._seq])
+
+    # ---------------------- Producer ----------------------
+    def next_slot(self):
+        # View of the slot the next frame goes into; fill it, then commit().
+        # Clearing its stamp first lets readers of the old frame notice.
+        slot = (self.seq + 1) % self.slots
+        self.stamps[slot] = -1
+        return self.data[slot]
+
+    def commit(self) -> int:
+        seq = self.seq + 1
+        self.stamps[seq % self.slots] = seq
+        self.header[self._seq] = seq
+        return seq
+
+    def push(self, obs) -> int:
+        self.next_slot()[...] = obs
+        return self.commit()
+
+    # ---------------------- Consumer ----------------------
+    def read(self, seq: int):
+        # View of frame ``seq``, or None if not written yet or already overwritten
+        if seq < 0 or self.stamps[seq % self.slots] != seq:
+            return None
+        return self.data[seq % self.slots]
+
+    def latest(self) -> Tuple[int, Optional["np.ndarray"]]:
+        seq = self.seq
+        return seq, self.read(seq)
+
+    def valid(self, seq: int) -> bool:
+        return self.stamps[seq % self.slots] == seq
+
+    def close(self):
+        # Views must be dropped before the mapping can close
+        self.header = self.stamps = self.data = None
+        self.shm.close()
+        if self.owner:
+            if not hasattr(self.shm, "_track"):
+                # Pre-3.13 unlink() unregisters, so register it back first
+                resource_tracker.register(self.shm._name, "shared_memory")
+            self.shm.unlink()
+
+
+class ObservationPublisher:
+    """Encodes a Simulation into an ``ObservationRing`` once per ``publish``."""
+
+    def __init__(self, sim: Simulation, mode: str = "flat", slots: int = 64, name: Optional[str] = None, **options):
+        try:
+            encoder_class = ENCODERS[mode]
+        except KeyError:
+            raise ValueError(f"Unknown observation mode {mode!r}; expected one of {tuple(ENCODERS)}") from None
+        self.sim = sim
+        self.mode = mode
+        self.encoder = encoder_class(sim, **options)
+        self.ring = ObservationRing.create(self.encoder.shape, self.encoder.dtype, slots, name)
+
+    @property
+    def name(self) -> str:
+        return self.ring.name
+
+    def publish(self) -> int:
+        self.encoder.write(self.sim, self.ring.next_slot())
+        return self.ring.commit()
+
+    def close(self):
+        self.ring.close()
@@ -0,0 +1,515 @@
+import hashlib
+import random
+from typing import List, Optional, Tuple
+
+from player import Player
+from bullet import sweep_circle
+from pool import BulletPool
+from enemy import Enemy
+from fleet import make_fleet
+from boss import Boss
+from spatial import SpatialHash
+from profiler import FrameProfiler
+
+# Per-tick input, one byte: held buttons in the low bits, plus at most one
+# menu command in bits 4-6. See Simulation.apply_input.
+IN_LEFT = 0x01
+IN_RIGHT = 0x02
+IN_FIRE = 0x04  # fire held
+IN_FIRE_TAP = 0x08  # fire pressed since the last tick (fires even if already released)
+CMD_SHIFT = 4
+CMD_EASY = 1
+CMD_NORMAL = 2
+CMD_HARD = 3
+CMD_RESTART = 4
+
+COMMAND_DIFFICULTY = {CMD_EASY: "Easy", CMD_NORMAL: "Normal", CMD_HARD: "Hard"}
+
+
+class Simulation:
+    """Display-free game rules: fleet, bullets, collisions, levels, bosses.
+
+    All entity state is plain Python data, so the simulation can be stepped
+    as fast as the CPU allows with no turtle or Tk involved. ``Game`` renders
+    it by syncing turtles from this state once per frame.
+    """
+
+    BORDER_LEFT = -380
+    BORDER_RIGHT = 380
+    BORDER_TOP = 280
+    BORDER_BOTTOM = -280
+
+    MODE = "classic"  # see endless.py for the other modes
+
+    LEVEL_CONFIG = {
+        1: {"rows": 3, "cols": 7},
+        2: {"rows": 4, "cols": 8},
+        3: {"rows": 5, "cols": 9},
+    }
+
+    DIFFICULTY_SPEED = {
+        "Easy": 1.0,
+        "Normal": 1.3,
+        "Hard": 1.7,
+    }
+
+    # Bullet pools are allocated once; see BulletPool for the policies
+    MAX_PLAYER_BULLETS = 16
+    MAX_ENEMY_BULLETS = 48
+    PLAYER_BULLET_POLICY = "drop"
+    ENEMY_BULLET_POLICY = "recycle"
+
+    # "python", "numpy" or "auto" (NumPy for large fleets when installed)
+    FLEET_BACKEND = "auto"
+
+    # Broad-phase cell size for the player and bosses (boss hit radius is 48)
+    ACTOR_CELL = 96
+
+    # Fixed simulation step. Speeds below are per second and periods are
+    # in seconds, so gameplay speed does not depend on the step rate.
+    TICK_RATE = 60
+    DT = 1.0 / TICK_RATE
+
+    PLAYER_BULLET_SPEED = 720.0
+    PLAYER_FIRE_COOLDOWN = 0.18  # seconds between player shots
+    ENEMY_BULLET_SPEED = 360.0
+    BOSS_BULLET_SPEED = 480.0
+    BOSS_SPEED = 180.0
+    BOSS_FIRE_PERIOD = 0.4  # seconds; slower boss fire cadence
+    ENEMY_FIRE_PERIOD = 28 / 60  # seconds between fleet volleys
+    # Who fires each volley: "bottom" (a random column's lowest enemy),
+    # "aimed" (the columns nearest the player) or "random" (any alive
+    # enemy, even mid-formation; O(fleet) per volley)
+    ENEMY_FIRE_RULE = "bottom"
+    ENEMY_SHOOTERS = 1  # enemies firing per volley
+    ENEMY_ANIM_PERIOD = 16 / 60  # seconds per animation frame
+    # Fleet speed for level N, px per second before the difficulty multiplier
+    LEVEL_SPEED_BASE = 108.0
+    LEVEL_SPEED_STEP = 36.0
+
+    def __init__(self, seed: Optional[int] = None, rng: Optional[random.Random] = None):
+        # All randomness goes through self.rng so a seed reproduces a session
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+
+        # Entities
+        self.player = Player(0, self.BORDER_BOTTOM + 40)
+        self.player.fire_cooldown = self.PLAYER_FIRE_COOLDOWN
+        self.players: List[Player] = [self.player]  # every ship the renderer draws
+        self.bullets = BulletPool(
+            self.MAX_PLAYER_BULLETS,
+            self.PLAYER_BULLET_SPEED,
+            self.PLAYER_BULLET_POLICY,
+        )
+        self.fleet = make_fleet(self.fleet_capacity(), self.FLEET_BACKEND)
+        self.enemies: List[Enemy] = []
+        self.enemy_dx = 132.0  # px per second
+        self.enemy_drop = 30
+        self.boss_pair: List[Boss] = [Boss(size=3.5), Boss(size=3.5)]
+        self.bosses: List[Boss] = []
+        # Player and live bosses; enemies are indexed by fleet.grid
+        self.actors = SpatialHash(self.ACTOR_CELL, self.ACTOR_CELL)
+        self.enemy_bullets = BulletPool(
+            self.MAX_ENEMY_BULLETS,
+            self.ENEMY_BULLET_SPEED,
+            self.ENEMY_BULLET_POLICY,
+        )
+
+        # Game state
+        self.state = "menu"  # menu, playing, boss, victory, gameover
+        self.end_reason = ""
+        self.level = 1
+        self.difficulty: Optional[str] = None
+        self.diff_mult = 1.0
+        self.tick = 0
+        self.time = 0.0
+        # Hits this game, for scoring (bots, balance runs)
+        self.kills = 0
+        self.boss_hits = 0
+        self.boss_fire_period = self.BOSS_FIRE_PERIOD
+        # Runtime knobs for Game's quality governor
+        self.enemy_anim_period = self.ENEMY_ANIM_PERIOD
+        self.enemy_bullet_limit: Optional[int] = None  # None: the pool's capacity
+        self._enemy_fire_clock = 0.0
+        self._enemy_anim_clock = 0.0
+        self._boss_fire_clock = 0.0
+
+        # Optional per-stage timing; see FrameProfiler
+        self.profiler: Optional[FrameProfiler] = None
+
+    # ---------------------- Game Flow ----------------------
+    def start_game(self, difficulty: str):
+        if self.state != "menu":
+            return
+        self.difficulty = difficulty
+        self.diff_mult = self.DIFFICULTY_SPEED[difficulty]
+        self.level = 1
+        self.end_reason = ""
+        self.kills = 0
+        self.boss_hits = 0
+        self.setup_player()
+        self.spawn_level_enemies(self.level)
+        self.state = "playing"
+
+    def setup_player(self):
+        self.bullets.clear()
+        self.player.reset(0, self.BORDER_BOTTOM + 40)
+        self.actors.clear()
+        self.actors.insert(self.player, self.player.x, self.player.y)
+
+    def restart_to_menu(self):
+        if self.state in ("gameover", "victory"):
+            self.cleanup_all()
+            self.state = "menu"
+
+    def reset(self, seed: Optional[int] = None):
+        # Back to a fresh menu with a reseeded rng, reusing every entity
+        self.cleanup_all()
+        self.state = "menu"
+        self.seed = seed
+        self.rng.seed(seed)
+        self.tick = 0
+        self.time = 0.0
+
+    def cleanup_all(self):
+        self.fleet.hide_all()
+        self.enemies.clear()
+        self.bullets.clear()
+        self.enemy_bullets.clear()
+        for boss in self.boss_pair:
+            boss.alive = False
+        self.bosses.clear()
+        self.actors.clear()
+
+    def game_over(self, reason: str):
+        self.state = "gameover"
+        self.end_reason = reason
+
+    # ---------------------- Spawning ----------------------
+    def mode_info(self) -> dict:
+        # What a replay header needs to rebuild this kind of simulation
+        return {"mode": self.MODE}
+
+    def fleet_capacity(self) -> int:
+        # Largest formation any level deploys; the fleet is sized once for it
+        return max(cfg["rows"] * cfg["cols"] for cfg in self.LEVEL_CONFIG.values())
+
+    def level_layout(self, level: int) -> Tuple[int, int, float, float]:
+        # rows, cols, spacing_x, spacing_y
+        cfg = self.LEVEL_CONFIG.get(level, self.LEVEL_CONFIG[3])
+        return cfg["rows"], cfg["cols"], 60, 45
+
+    def level_speed(self, level: int) -> float:
+        return self.LEVEL_SPEED_BASE + (level - 1) * self.LEVEL_SPEED_STEP
+
+    def spawn_level_enemies(self, level: int):
+        # do not reset the player here; just enemies and bullets
+        self.bullets.clear()
+        self.enemy_bullets.clear()
+
+        rows, cols, spacing_x, spacing_y = self.level_layout(level)
+        total_width = (cols - 1) * spacing_x
+        start_x = -total_width / 2
+        start_y = self.BORDER_TOP - 100
+        self.enemies = self.fleet.deploy(rows, cols, start_x, start_y, spacing_x, spacing_y)
+
+        self.enemy_dx = self.level_speed(level) * self.diff_mult
+        self._enemy_fire_clock = 0.0
+        self._enemy_anim_clock = 0.0
+
+    def spawn_boss(self):
+        # Clear remaining enemies and bullets
+        self.fleet.hide_all()
+        self.enemies.clear()
+        self.bullets.clear()
+        self.enemy_bullets.clear()
+
+        # Two giant turtles moving in opposite directions
+        left, right = self.boss_pair
+        left.reset(-140, self.BORDER_TOP - 120, dx=-self.BOSS_SPEED, hp=15)
+        right.reset(140, self.BORDER_TOP - 120, dx=self.BOSS_SPEED, hp=15)
+        self._boss_fire_clock = 0.0
+        self.bosses = [left, right]
+        for boss in self.bosses:
+            self.actors.insert(boss, boss.x, boss.y)
+
+    def spawn_bullet(self, x: float, y: float):
+        self.bullets.fire(x, y)
+
+    def spawn_enemy_bullet(self, x: float, y: float, speed: Optional[float] = None):
+        limit = self.enemy_bullet_limit
+        if limit is not None and len(self.enemy_bullets) >= limit:
+            return
+        self.enemy_bullets.fire(x, y, speed)
+
+    # ---------------------- Input ----------------------
+    def apply_input(self, bits: int):
+        # Apply one tick of input (see IN_* / CMD_*) before the next step
+        self.apply_player_bits(self.player, bits)
+        self.apply_command(bits >> CMD_SHIFT)
+
+    @staticmethod
+    def apply_player_bits(player: Player, bits: int):
+        player.moving_left = bool(bits & IN_LEFT)
+        player.moving_right = bool(bits & IN_RIGHT)
+        player.firing = bool(bits & IN_FIRE)
+        if bits & IN_FIRE_TAP:
+            player.fire_requested = True
+
+    def apply_command(self, command: int):
+        if command in COMMAND_DIFFICULTY:
+            self.start_game(COMMAND_DIFFICULTY[command])
+        elif command == CMD_RESTART:
+            self.restart_to_menu()
+
+    def state_hash(self) -> str:
+        # Checksum of the gameplay state; floats go through repr() so any
+        # bit-level divergence between two runs changes the hash
+        xs, ys, alive = self.fleet.snapshot()
+        fleet = [(xs[i], ys[i]) for i in range(len(alive)) if alive[i]]
+        pool = self.bullets
+        bullets = [(pool.xs[i], pool.ys[i]) for i in range(pool.capacity) if pool.alive[i]]
+        pool = self.enemy_bullets
+        enemy_bullets = [(pool.xs[i], pool.ys[i], pool.speeds[i]) for i in range(pool.capacity) if pool.alive[i]]
+        bosses = [(b.x, b.y, b.dx, b.hp) for b in self.bosses]
+        player = self.player
+        data = (
+            self.tick, self.state, self.level, self.difficulty, self.enemy_dx,
+            self._enemy_fire_clock, self._boss_fire_clock,
+            player.x, player.last_fire_time, fleet, bullets, enemy_bullets, bosses,
+        )
+        return hashlib.blake2b(repr(data).encode(), digest_size=8).hexdigest()
+
+    # ---------------------- Step ----------------------
+    def step(self, dt: Optional[float] = None):
+        # Advance the game by one fixed step of ``dt`` seconds (default DT)
+        if dt is None:
+            dt = self.DT
+        self.tick += 1
+        self.time += dt
+        prof = self.profiler
+        t = prof.now() if prof else 0.0
+        if self.state == "playing":
+            self.update_player(dt)
+            if prof:
+                t = prof.mark("update_player", t)
+            self.update_bullets(dt)
+            if prof:
+                t = prof.mark("update_bullets", t)
+            self.update_enemy_bullets(dt)
+            if prof:
+                t = prof.mark("update_enemy_bullets", t)
+            self.update_enemies(dt)
+            if prof:
+                t = prof.mark("update_enemies", t)
+            self.check_level_progression()
+            if prof:
+                prof.mark("check_level_progression", t)
+        elif self.state == "boss":
+            self.update_player(dt)
+            if prof:
+                t = prof.mark("update_player", t)
+            self.update_bullets(dt)
+            if prof:
+                t = prof.mark("update_bullets", t)
+            self.update_enemy_bullets(dt)
+            if prof:
+                t = prof.mark("update_enemy_bullets", t)
+            self.update_bosses(dt)
+            if prof:
+                prof.mark("update_bosses", t)
+
+    @staticmethod
+    def _clock_due(clock: float, period: float) -> bool:
+        # Tolerate float drift from summing dt so periods land on exact ticks
+        return clock >= period - 1e-9
+
+    # ---------------------- Updates ----------------------
+    def update_player(self, dt: float):
+        self.move_player(self.player, dt)
+
+    def move_player(self, player: Player, dt: float):
+        player.update(self.BORDER_LEFT, self.BORDER_RIGHT, dt)
+        self.actors.move(player, player.x, player.y)
+        if player.firing or player.fire_requested:
+            player.fire_requested = False
+            player.try_fire(self.time, self.spawn_bullet)
+
+    def update_bullets(self, dt: float):
+        if not self.bullets:
+            return
+        top = self.BORDER_TOP
+        # Collisions are swept along the bullet's whole move, in the frame
+        # of a target that moves later this step (fleet shift, boss step),
+        # so neither motion can step over a hit. The earliest hit wins.
+        if self.state == "playing":
+            fleet_dx, fleet_dy = self.fleet_motion(dt)
+        elif self.state == "boss":
+            left, right = self.BORDER_LEFT, self.BORDER_RIGHT
+            boss_motion = [(boss,) + boss.step_delta(left, right, dt) for boss in self.bosses]
+        pool = self.bullets
+        xs, ys, prev_ys, speeds = pool.xs, pool.ys, pool.prev_ys, pool.speeds
+        for i in pool:
+            x = xs[i]
+            y0 = ys[i]
+            prev_ys[i] = y0
+            y = ys[i] = y0 + speeds[i] * dt
+            if self.state == "playing":
+                hit_enemy = None
+                first = 2.0
+                x1, y1 = x - fleet_dx, y - fleet_dy
+                for e in self.fleet.grid.query_segment(x, y0, x1, y1, 20):
+                    t = sweep_circle(x, y0, x1, y1, e.x, e.y, 20)
+                    if t is not None and t < first:
+                        hit_enemy, first = e, t
+                if hit_enemy:
+                    self.fleet.kill(hit_enemy)
+                    self.kills += 1
+                    pool.release(i)
+                    continue
+            elif self.state == "boss" and self.bosses:
+                hit_boss = None
+                first = 2.0
+                for boss, dx, dy in boss_motion:
+                    if boss.alive:
+                        t = sweep_circle(x, y0, x - dx, y - dy, boss.x, boss.y, 48)
+                        if t is not None and t < first:
+                            hit_boss, first = boss, t
+                if hit_boss:
+                    hit_boss.hp -= 1
+                    self.boss_hits += 1
+                    if hit_boss.hp <= 0:
+                        hit_boss.alive = False
+                        self.bosses.remove(hit_boss)
+                        self.actors.remove(hit_boss)
+                    pool.release(i)
+                if not self.bosses:
+                    self.state = "victory"
+                if hit_boss:
+                    continue
+            if y > top:
+                pool.release(i)
+
+    def update_enemy_bullets(self, dt: float):
+        if not self.enemy_bullets:
+            return
+        bottom = self.BORDER_BOTTOM
+        player = self.player
+        pool = self.enemy_bullets
+        xs, ys, prev_ys, speeds = pool.xs, pool.ys, pool.prev_ys, pool.speeds
+        for i in pool:
+            x = xs[i]
+            y0 = ys[i]
+            prev_ys[i] = y0
+            y = ys[i] = y0 - speeds[i] * dt
+            # Swept like player bullets; the player moved earlier this step
+            hit = False
+            for actor in self.actors.query_segment(x, y0, x, y, 18):
+                if actor is player and sweep_circle(x, y0, x, y, player.x, player.y, 18) is not None:
+                    hit = True
+                    break
+            if hit:
+                # Subclasses may not end the game (stress mode only counts
+                # hits), so the rest of the volley keeps moving
+                pool.release(i)
+                self.game_over("Hit by enemy fire")
+                if self.state == "gameover":
+                    return
+            elif y < bottom:
+                pool.release(i)
+
+    def fleet_motion(self, dt: float) -> Tuple[float, float]:
+        # The shift update_enemies will apply this step: sideways, or a drop
+        # with the direction reversed at a border
+        dx = self.enemy_dx * dt
+        if self.fleet.will_hit_border(dx, self.BORDER_LEFT, self.BORDER_RIGHT):
+            return -dx, -self.enemy_drop
+        return dx, 0.0
+
+    def update_enemies(self, dt: float):
+        if not self.fleet.alive_count:
+            return
+        # Animate: one frame flip for the whole fleet per period
+        fleet = self.fleet
+        self._enemy_anim_clock += dt
+        if self._clock_due(self._enemy_anim_clock, self.enemy_anim_period):
+            self._enemy_anim_clock -= self.enemy_anim_period
+            fleet.frame_index ^= 1
+
+        # Move as a fleet
+        if fleet.will_hit_border(self.enemy_dx * dt, self.BORDER_LEFT, self.BORDER_RIGHT):
+            self.enemy_dx *= -1
+            fleet.shift(0, -self.enemy_drop)
+            if fleet.lowest_y() < self.BORDER_BOTTOM + 60:
+                self.game_over("Enemies reached the bottom")
+                return
+
+        fleet.shift(self.enemy_dx * dt, 0)
+
+        # Fire: periodically, a volley from ENEMY_SHOOTERS enemies
+        self._enemy_fire_clock += dt
+        if self._clock_due(self._enemy_fire_clock, self.ENEMY_FIRE_PERIOD):
+            self._enemy_fire_clock -= self.ENEMY_FIRE_PERIOD
+            for shooter in self.pick_shooters():
+                self.spawn_enemy_bullet(shooter.x, shooter.y - 12)
+
+    def pick_shooters(self) -> List[Enemy]:
+        # Shooters for one volley under ENEMY_FIRE_RULE; O(columns) except "random"
+        fleet = self.fleet
+        count = self.ENEMY_SHOOTERS
+        rule = self.ENEMY_FIRE_RULE
+        if rule == "random":
+            alive = fleet.alive_enemies()
+            return self.rng.sample(alive, min(count, len(alive)))
+        columns = fleet.firing_columns()
+        if not columns:
+            return []
+        if rule == "aimed":
+            # Columns closest to the player; row-0 slots carry each column's x
+            px, xs = self.player.x, fleet.xs
+            columns.sort(key=lambda c: abs(xs[c] - px))
+            columns = columns[:count]
+        elif rule == "bottom":
+            columns = self.rng.sample(columns, min(count, len(columns)))
+        else:
+            raise ValueError(f"Unknown ENEMY_FIRE_RULE {rule!r}")
+        return [fleet.bottom_enemy(c) for c in columns]
+
+    def check_level_progression(self):
+        if not self.fleet.alive_count and self.state == "playing":
+            if self.level < 3:
+                self.level += 1
+                self.spawn_level_enemies(self.level)
+            else:
+                self.state = "boss"
+                self.spawn_boss()
+
+    def check_boss_contact(self) -> bool:
+        # True when a boss touching the player ended the game
+        player = self.player
+        for actor in self.actors.query(player.x, player.y, 35):
+            if actor is not player and player.distance(actor.x, actor.y) < 35:
+                self.game_over("Boss collided with player")
+                return True
+        return False
+
+    def update_bosses(self, dt: float):
+        if not self.bosses:
+            return
+        # Move and check
+        for boss in self.bosses:
+            if boss.update(self.BORDER_LEFT, self.BORDER_RIGHT, self.BORDER_BOTTOM, dt):
+                self.game_over("Boss reached the player line")
+                return
+            self.actors.move(boss, boss.x, boss.y)
+        if self.check_boss_contact():
+            return
+        # Boss firing: slower cadence, fires in pairs
+        self._boss_fire_clock += dt
+        if self._clock_due(self._boss_fire_clock, self.boss_fire_period):
+            self._boss_fire_clock -= self.boss_fire_period
+            for boss in self.bosses:
+                y = boss.y - 28
+                x = boss.x
+                self.spawn_enemy_bullet(x - 14, y, speed=self.BOSS_BULLET_SPEED)
+                self.spawn_enemy_bullet(x + 14, y, speed=self.BOSS_BULLET_SPEED)
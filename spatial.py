@@ -0,0 +1,96 @@
+from typing import Dict, Hashable, List, Tuple
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """Uniform-grid broad phase for circle-radius collision queries.
+
+    Items are bucketed by the cell containing their position. ``query``
+    returns every item in the cells overlapping a query circle's bounding
+    box, and ``query_segment`` the same for a circle swept along a
+    segment; callers still do the exact test on those candidates.
+
+    The grid has a movable origin: when every item moves by the same
+    amount (a fleet in formation), call ``translate`` instead of
+    re-bucketing each item.
+    """
+
+    def __init__(self, cell_w: float, cell_h: float):
+        self.cell_w = cell_w
+        self.cell_h = cell_h
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+        self._cells: Dict[Cell, List[Hashable]] = {}
+        self._where: Dict[Hashable, Cell] = {}
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return int((x - self.origin_x) // self.cell_w), int((y - self.origin_y) // self.cell_h)
+
+    def clear(self):
+        self._cells.clear()
+        self._where.clear()
+        self.origin_x = 0.0
+        self.origin_y = 0.0
+
+    def insert(self, item: Hashable, x: float, y: float):
+        cell = self._cell(x, y)
+        self._where[item] = cell
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            self._cells[cell] = [item]
+        else:
+            bucket.append(item)
+
+    def remove(self, item: Hashable):
+        cell = self._where.pop(item, None)
+        if cell is None:
+            return
+        bucket = self._cells[cell]
+        bucket.remove(item)
+        if not bucket:
+            del self._cells[cell]
+
+    def move(self, item: Hashable, x: float, y: float):
+        # Re-bucket only when the item crosses into another cell
+        cell = self._cell(x, y)
+        if self._where.get(item) == cell:
+            return
+        self.remove(item)
+        self.insert(item, x, y)
+
+    def translate(self, dx: float, dy: float):
+        self.origin_x += dx
+        self.origin_y += dy
+
+    def query(self, x: float, y: float, radius: float) -> List[Hashable]:
+        return self.query_box(x - radius, y - radius, x + radius, y + radius)
+
+    def query_segment(self, x0: float, y0: float, x1: float, y1: float, radius: float) -> List[Hashable]:
+        # Candidates for a circle of ``radius`` swept from (x0, y0) to (x1, y1)
+        if x0 > x1:
+            x0, x1 = x1, x0
+        if y0 > y1:
+            y0, y1 = y1, y0
+        return self.query_box(x0 - radius, y0 - radius, x1 + radius, y1 + radius)
+
+    def query_box(self, left: float, bottom: float, right: float, top: float) -> List[Hashable]:
+        cw, ch = self.cell_w, self.cell_h
+        ox, oy = self.origin_x, self.origin_y
+        x0 = int((left - ox) // cw)
+        x1 = int((right - ox) // cw)
+        y0 = int((bottom - oy) // ch)
+        y1 = int((top - oy) // ch)
+        cells = self._cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), [])
+        found: List[Hashable] = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.extend(bucket)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._where)
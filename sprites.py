@@ -1,5 +1,85 @@
+import json
 import os
 import turtle
+import weakref
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+Rect = Tuple[int, int, int, int]
+ShapeKey = Tuple[str, Optional[Rect], float]
+
+# Registered image shapes by (path, rect, scale), or None for a file that is
+# missing or won't load, shared by every loader on the same screen so a new
+# Game never decodes, registers or stats the same frame twice. Turtle keeps
+# its shape registry per screen (and images belong to its Tk root), so after
+# turtle.bye() a new screen starts with an empty cache.
+_SHAPE_CACHE: "weakref.WeakKeyDictionary[turtle.TurtleScreen, Dict[ShapeKey, Optional[str]]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _shape_cache() -> Dict[ShapeKey, Optional[str]]:
+    return _SHAPE_CACHE.setdefault(turtle.Screen(), {})
+
+
+def _photo_image(path: str):
+    # Decoded by Tk against turtle's root window
+    import tkinter
+
+    return tkinter.PhotoImage(file=path, master=turtle.Screen().getcanvas())
+
+
+def slice_image(image, rect: Rect):
+    """Copy one frame out of a sprite sheet into its own PhotoImage."""
+    import tkinter
+
+    x, y, w, h = rect
+    frame = tkinter.PhotoImage(master=image.tk, width=w, height=h)
+    frame.tk.call(frame, "copy", image, "-from", x, y, x + w, y + h, "-to", 0, 0)
+    return frame
+
+
+def scale_image(image, scale: float):
+    """Scale a PhotoImage by a rational factor (e.g. 3.5 = zoom 7, subsample 2).
+
+    Tk photos only zoom and subsample by integers, so the factor is
+    approximated as a fraction with a small denominator.
+    """
+    ratio = Fraction(scale).limit_denominator(8)
+    if ratio.numerator != 1:
+        image = image.zoom(ratio.numerator, ratio.numerator)
+    if ratio.denominator != 1:
+        image = image.subsample(ratio.denominator, ratio.denominator)
+    return image
+
+
+class SpriteSheet:
+    """A sheet image decoded once per screen; frames are sliced and scaled on request and cached."""
+
+    _sheets: "weakref.WeakKeyDictionary[turtle.TurtleScreen, Dict[str, SpriteSheet]]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, path: str):
+        self.path = path
+        self.image = _photo_image(path)
+        self._frames: Dict[Tuple[Rect, float], object] = {}
+
+    @classmethod
+    def open(cls, path: str) -> "SpriteSheet":
+        sheets = cls._sheets.setdefault(turtle.Screen(), {})
+        sheet = sheets.get(path)
+        if sheet is None:
+            sheet = sheets[path] = cls(path)
+        return sheet
+
+    def frame(self, rect: Rect, scale: float = 1.0):
+        key = (rect, scale)
+        image = self._frames.get(key)
+        if image is None:
+            if scale == 1.0:
+                image = slice_image(self.image, rect)
+            else:
+                image = scale_image(self.frame(rect), scale)
+            self._frames[key] = image
+        return image
 
 
 class SpriteLoader:
@@ -11,12 +91,34 @@ class SpriteLoader:
       - enemy_a.gif, enemy_b.gif (2-frame animation)
       - boss.gif
 
-    Fallbacks use simple registered polygons so the game runs without assets.
+    or for a sprite sheet described by ``assets/sprites.json``::
+
+      {"sheet": "sheet.gif", "frames": {"player": [x, y, w, h], "enemy_a": [...], ...}}
+
+    Sheet frames take precedence over single files. Fallbacks use simple
+    registered polygons so the game runs without assets.
+
+    Nothing is decoded up front: ``ensure(group)`` loads a group ("level"
+    or "boss") the first time it is needed and ``preload()`` loads the rest
+    once the menu is up. Until then the attributes name the fallbacks.
+    ``generation`` increases whenever shapes change so renderers can
+    re-apply them. Image shapes ignore ``shapesize``, so scaled variants
+    (``SCALED_VARIANTS``) are precomputed when their group loads.
     """
 
+    GROUPS = {
+        "level": ("player", "bullet", "enemy_a", "enemy_b"),
+        "boss": ("boss",),
+    }
+    # Matches Simulation's Boss(size=3.5)
+    SCALED_VARIANTS = {"boss": (3.5,)}
+    MANIFEST = "sprites.json"
+
     def __init__(self, assets_dir: str = "assets"):
         self.assets_dir = assets_dir
-        self._shapes_registered = set()
+        self.generation = 0
+        self._loaded = set()
+        self._images: Dict[Tuple[str, float], str] = {}
 
         # Pre-register fallback polygonal shapes
         self.fallback_player = self._register_polygon(
@@ -41,25 +143,113 @@ class SpriteLoader:
             fill="#ff5555",
         )
 
-        # Try to register GIFs if present
-        self.player = self._register_gif("player.gif") or self.fallback_player
-        self.bullet = self._register_gif("bullet.gif") or self.fallback_bullet
-        self.enemy_frames = [
-            self._register_gif("enemy_a.gif") or self.fallback_enemy_a,
-            self._register_gif("enemy_b.gif") or self.fallback_enemy_b,
+        self._sheet_path, self._rects = self._read_manifest()
+
+    @property
+    def player(self) -> str:
+        return self._images.get(("player", 1.0), self.fallback_player)
+
+    @property
+    def bullet(self) -> str:
+        return self._images.get(("bullet", 1.0), self.fallback_bullet)
+
+    @property
+    def enemy_frames(self) -> List[str]:
+        return [
+            self._images.get(("enemy_a", 1.0), self.fallback_enemy_a),
+            self._images.get(("enemy_b", 1.0), self.fallback_enemy_b),
         ]
-        self.boss = self._register_gif("boss.gif") or self.fallback_boss
 
-    def _register_gif(self, filename: str):
+    @property
+    def boss(self) -> str:
+        return self._images.get(("boss", 1.0), self.fallback_boss)
+
+    def scaled(self, key: str, scale: float) -> Optional[str]:
+        # Image shape for ``key`` pre-scaled by ``scale``; None when ``key``
+        # has no image (polygon fallbacks scale with shapesize instead)
+        if (key, 1.0) not in self._images:
+            return None
+        name = self._images.get((key, scale))
+        if name is None:
+            name = self._load(key, scale)
+        return name
+
+    # ---------------------- Loading ----------------------
+    def ensure(self, group: str) -> bool:
+        # Load a group on first use; returns True if anything was loaded
+        if group in self._loaded:
+            return False
+        self._loaded.add(group)
+        changed = False
+        for key in self.GROUPS[group]:
+            for scale in (1.0,) + tuple(self.SCALED_VARIANTS.get(key, ())):
+                changed |= self._load(key, scale) is not None
+        if changed:
+            self.generation += 1
+        return changed
+
+    def preload(self):
+        for group in self.GROUPS:
+            self.ensure(group)
+
+    def _read_manifest(self) -> Tuple[Optional[str], Dict[str, Rect]]:
+        path = os.path.join(self.assets_dir, self.MANIFEST)
+        if not os.path.exists(path):
+            return None, {}
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+            sheet = os.path.join(self.assets_dir, manifest["sheet"])
+            rects = {key: tuple(rect) for key, rect in manifest.get("frames", {}).items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None, {}
+        return (sheet if os.path.exists(sheet) else None), rects
+
+    def _load(self, key: str, scale: float) -> Optional[str]:
+        rect = self._rects.get(key) if self._sheet_path else None
+        if rect is not None:
+            name = self._register_frame(self._sheet_path, rect, scale)
+        else:
+            name = self._register_gif(f"{key}.gif", scale)
+        if name is not None:
+            self._images[(key, scale)] = name
+        return name
+
+    def _register_frame(self, sheet_path: str, rect: Rect, scale: float) -> Optional[str]:
+        cache = _shape_cache()
+        cache_key = (sheet_path, rect, scale)
+        if cache_key in cache:
+            return cache[cache_key]
+        try:
+            image = SpriteSheet.open(sheet_path).frame(rect, scale)
+            name = "%s#%d,%d,%d,%d@%g" % ((sheet_path,) + rect + (scale,))
+            turtle.register_shape(name, turtle.Shape("image", image))
+        except Exception:
+            name = None
+        cache[cache_key] = name
+        return name
+
+    def _register_gif(self, filename: str, scale: float = 1.0) -> Optional[str]:
         path = os.path.join(self.assets_dir, filename)
+        cache = _shape_cache()
+        cache_key = (path, None, scale)
+        if cache_key in cache:
+            return cache[cache_key]
+        name = None
         if os.path.exists(path):
             try:
-                turtle.register_shape(path)
-                self._shapes_registered.add(path)
-                return path
+                if scale == 1.0:
+                    # Plain files keep their path as the shape name, like before
+                    turtle.register_shape(path)
+                    name = path
+                else:
+                    image = scale_image(_photo_image(path), scale)
+                    name = "%s@%g" % (path, scale)
+                    turtle.register_shape(name, turtle.Shape("image", image))
             except Exception:
-                return None
-        return None
+                pass
+        cache[cache_key] = name
+        return name
 
     def _register_polygon(self, name: str, points, outline: str, fill: str):
         shape = turtle.Shape("polygon", points)
@@ -0,0 +1,95 @@
+"""Swept bullet collisions give the same hits at any tick rate.
+
+Run with ``python -m unittest discover tests`` (or pytest).
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sim import Simulation  # noqa: E402
+
+
+class QuietSimulation(Simulation):
+    # A steadily moving fleet that never fires and never reaches a border
+    # while the shot is in flight
+    ENEMY_FIRE_PERIOD = 1e9
+    FLEET_BACKEND = "python"
+
+
+SHOT_XS = range(-290, 290, 10)
+REFERENCE_RATE = 240
+
+
+def first_hit(rate: int, x: float, fleet_speed: float):
+    """Index of the enemy a single shot from ``x`` kills, or None."""
+    sim = QuietSimulation(seed=0)
+    sim.start_game("Easy")
+    sim.enemy_dx = fleet_speed
+    sim.spawn_bullet(x, sim.player.y + 12)
+    dt = 1.0 / rate
+    alive = [e.alive for e in sim.fleet.enemies]
+    for _ in range(2 * rate):
+        sim.update_bullets(dt)
+        sim.update_enemies(dt)
+        if not sim.bullets:
+            break
+    dead = [i for i, e in enumerate(sim.fleet.enemies) if alive[i] and not e.alive]
+    return dead[0] if dead else None
+
+
+def hits(rate: int, fleet_speed: float):
+    return [first_hit(rate, x, fleet_speed) for x in SHOT_XS]
+
+
+def boss_hits(rate: int):
+    # Which boss each shot hits, or None; the bosses move 180 px/s in
+    # opposite directions and stay clear of the borders
+    results = []
+    dt = 1.0 / rate
+    for x in SHOT_XS:
+        sim = QuietSimulation(seed=0)
+        sim.start_game("Easy")
+        sim.state = "boss"
+        sim.spawn_boss()
+        sim.spawn_bullet(x, sim.player.y + 12)
+        hit = None
+        for _ in range(2 * rate):
+            sim.update_bullets(dt)
+            for boss in sim.bosses:
+                boss.update(sim.BORDER_LEFT, sim.BORDER_RIGHT, sim.BORDER_BOTTOM, dt)
+            if not sim.bullets:
+                break
+        for i, boss in enumerate(sim.boss_pair):
+            if boss.hp < boss.hp_max:
+                hit = i
+        results.append(hit)
+    return results
+
+
+class SweptCollisionTest(unittest.TestCase):
+    def assert_rate_independent(self, fleet_speed: float):
+        reference = hits(REFERENCE_RATE, fleet_speed)
+        self.assertTrue(any(h is not None for h in reference))
+        for rate in (60, 30, 10, 4):
+            with self.subTest(rate=rate):
+                self.assertEqual(hits(rate, fleet_speed), reference)
+
+    def test_still_fleet(self):
+        self.assert_rate_independent(0.0)
+
+    def test_moving_fleet(self):
+        self.assert_rate_independent(120.0)
+        self.assert_rate_independent(-120.0)
+
+    def test_moving_bosses(self):
+        reference = boss_hits(REFERENCE_RATE)
+        self.assertTrue(any(h is not None for h in reference))
+        for rate in (60, 30, 10, 4):
+            with self.subTest(rate=rate):
+                self.assertEqual(boss_hits(rate), reference)
+
+
+if __name__ == "__main__":
+    unittest.main()
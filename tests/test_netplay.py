@@ -0,0 +1,141 @@
+"""Lockstep netplay sessions over the in-process loopback transport.
+
+Run with ``python -m unittest discover tests`` (or pytest).
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from coop import P2_SHIFT  # noqa: E402
+from netplay import (  # noqa: E402
+    _INPUTS, KIND_HELLO, KIND_INPUTS, DelayedTransport, LockstepSession, LoopbackTransport, _packet, host,
+    join, run_loopback,
+)
+
+MAX_DELAY = LockstepSession.BUFFER_TICKS // 2 - 2
+
+
+def inputs_packet(start: int, payload: bytes) -> bytes:
+    # What the peer sends: no ack, no hash yet, inputs from ``start``
+    return _packet(KIND_INPUTS, _INPUTS.pack(-1, -1, 0, start, len(payload)) + payload)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class PollingHostEnd:
+    """The host's end of a loopback pair; each poll lets ``step`` seconds pass.
+
+    Datagrams the guest's DelayedTransport holds are delivered once due, as
+    the network would while the host sits in ``host()``.
+    """
+
+    def __init__(self, inner, guest: DelayedTransport, clock: FakeClock, step: float):
+        self.inner = inner
+        self.guest = guest
+        self.clock = clock
+        self.step = step
+
+    def send(self, data: bytes):
+        self.inner.send(data)
+
+    def receive(self):
+        self.clock.now += self.step
+        self.guest.flush()
+        return self.inner.receive()
+
+    def close(self):
+        pass
+
+
+class SyncTest(unittest.TestCase):
+    def assert_in_sync(self, ticks: int, **network):
+        sessions, sims, _ = run_loopback(ticks, **network)
+        self.assertEqual([s.desync for s in sessions], [None, None])
+        self.assertEqual([sim.tick for sim in sims], [ticks, ticks])
+        self.assertEqual(sims[0].state_hash(), sims[1].state_hash())
+
+    def test_in_sync_on_a_clean_network(self):
+        self.assert_in_sync(600, latency=0.0, jitter=0.0, loss=0.0)
+
+    def test_in_sync_with_latency_jitter_and_loss(self):
+        self.assert_in_sync(1800, latency=0.06, jitter=0.03, loss=0.2, seed=3)
+
+    def test_in_sync_at_the_largest_delay(self):
+        self.assert_in_sync(600, input_delay=MAX_DELAY, latency=0.2, jitter=0.05, loss=0.1)
+
+    def test_desync_is_detected(self):
+        sessions, sims, _ = run_loopback(900, desync_at=300)
+        desyncs = [s.desync for s in sessions if s.desync]
+        self.assertTrue(desyncs)
+        tick, local, peer = desyncs[0]
+        self.assertEqual(tick, 300)
+        self.assertNotEqual(local, peer)
+        self.assertLess(max(sim.tick for sim in sims), 300 + LockstepSession.BUFFER_TICKS)
+
+
+class SessionTest(unittest.TestCase):
+    def test_input_delay_is_clamped_to_the_ring(self):
+        transport = LoopbackTransport()
+        self.assertEqual(LockstepSession(transport, 0, 1, MAX_DELAY).input_delay, MAX_DELAY)
+        for delay in (-1, MAX_DELAY + 1):
+            with self.subTest(delay=delay), self.assertRaises(ValueError):
+                LockstepSession(transport, 0, 1, delay)
+
+    def test_early_inputs_stay_inside_the_ring(self):
+        size = LockstepSession.BUFFER_TICKS
+        session = LockstepSession(LoopbackTransport.pair()[0], 0, 1, 0)
+        # Twice the ring's worth: entries past it would overwrite ticks not yet stepped
+        session.handle(inputs_packet(0, bytes(range(2 * size))))
+        self.assertEqual(session._remote_next, size)
+        for t in range(size):
+            session.add_local_input(0)
+            self.assertEqual(session.next_input() >> P2_SHIFT, t)
+        self.assertIsNone(session.next_input())
+        # Dropped inputs arrive again in a later packet, as the peer resends them
+        session.handle(inputs_packet(size, bytes(range(size, 2 * size))))
+        session.add_local_input(0)
+        self.assertEqual(session.next_input() >> P2_SHIFT, size)
+
+    def test_peer_timeout(self):
+        clock = FakeClock()
+        session = LockstepSession(LoopbackTransport.pair()[0], 0, 1, clock=clock)
+        clock.now = LockstepSession.PEER_TIMEOUT
+        self.assertFalse(session.peer_lost)
+        session.handle(inputs_packet(session.input_delay, b"\0"))
+        clock.now += LockstepSession.PEER_TIMEOUT + 0.1
+        self.assertTrue(session.peer_lost)
+        session.handle(b"not a netplay packet")
+        self.assertTrue(session.peer_lost)
+        session.handle(inputs_packet(session.input_delay + 1, b"\0"))
+        self.assertFalse(session.peer_lost)
+
+
+class HandshakeTest(unittest.TestCase):
+    def test_late_guest_is_not_timed_out(self):
+        clock = FakeClock()
+        host_end, guest_end = LoopbackTransport.pair()
+        # The guest's first HELLO reaches the host well after PEER_TIMEOUT
+        late = 2 * LockstepSession.PEER_TIMEOUT
+        guest = DelayedTransport(guest_end, latency=late, clock=clock)
+        guest.send(_packet(KIND_HELLO))
+
+        session = host(PollingHostEnd(host_end, guest, clock, 0.5), seed=1, clock=clock)
+        self.assertGreaterEqual(clock.now, late)
+        self.assertFalse(session.peer_lost)
+
+        guest.latency = 0.0
+        peer = join(guest, clock=clock)
+        self.assertEqual(peer.seed, 1)
+        self.assertFalse(peer.peer_lost)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""BulletPool keeps its id bookkeeping straight.
+
+Run with ``python -m unittest discover tests`` (or pytest).
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pool import BulletPool  # noqa: E402
+
+
+class BulletPoolTest(unittest.TestCase):
+    def test_release_while_iterating(self):
+        pool = BulletPool(8, 100.0)
+        for i in range(8):
+            pool.fire(i, 0.0)
+        seen = []
+        for b in pool:
+            seen.append(b)
+            if pool.xs[b] % 2:
+                pool.release(b)
+        self.assertEqual(sorted(seen), list(range(8)))
+        self.assertEqual(sorted(pool.xs[b] for b in pool.active), [0, 2, 4, 6])
+        self.assertEqual([i for i in range(8) if pool.alive[i]], sorted(pool.active))
+        self.assertEqual([pool.slots[b] for b in pool.active], [0, 1, 2, 3])
+
+    def test_policies(self):
+        pool = BulletPool(2, 100.0)
+        self.assertIsNotNone(pool.fire(0.0, 0.0))
+        self.assertIsNotNone(pool.fire(1.0, 0.0, speed=50.0))
+        self.assertIsNone(pool.fire(2.0, 0.0))
+
+        pool = BulletPool(2, 100.0, "recycle")
+        first = pool.fire(0.0, 0.0)
+        pool.fire(1.0, 0.0)
+        self.assertEqual(pool.fire(2.0, 0.0, speed=50.0), first)
+        self.assertEqual((pool.xs[first], pool.speeds[first]), (2.0, 50.0))
+        self.assertEqual(len(pool), 2)
+
+    def test_clear(self):
+        pool = BulletPool(4, 100.0)
+        for i in range(3):
+            pool.fire(i, 0.0)
+        pool.clear()
+        self.assertFalse(pool)
+        self.assertFalse(any(pool.alive))
+        self.assertEqual(len([pool.fire(0.0, 0.0) for _ in range(4)]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
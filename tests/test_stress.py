@@ -0,0 +1,36 @@
+"""Stress mode keeps running when enemy fire hits the player.
+
+Run with ``python -m unittest discover tests`` (or pytest).
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from endless import StressSimulation  # noqa: E402
+
+
+class StressHitTest(unittest.TestCase):
+    def test_hit_does_not_freeze_other_bullets(self):
+        sim = StressSimulation(seed=0)
+        sim.start_game("Easy")
+        sim.enemy_bullets.clear()
+        player = sim.player
+        # The pool iterates newest first, so the far bullet is updated after
+        # the one hitting the player
+        sim.spawn_enemy_bullet(player.x + 200, 100)
+        sim.spawn_enemy_bullet(player.x, player.y + 5)
+        pool = sim.enemy_bullets
+        far = next(eb for eb in pool if pool.xs[eb] != player.x)
+        y = pool.ys[far]
+        for _ in range(3):
+            sim.update_enemy_bullets(1 / 60)
+        self.assertEqual(sim.state, "playing")
+        self.assertEqual(sim.hits_taken, 1)
+        self.assertEqual(len(pool), 1)
+        self.assertLess(pool.ys[far], y - 3 * sim.ENEMY_BULLET_SPEED / 60 + 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()